@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shared fixtures for the benchmark suite. Each emitter flavour knows how to
+construct an emitter, run a benchmark body inside whatever context that
+emitter needs (an event loop, a trio nursery, an executor) and drain any
+work the benchmark scheduled once it's done.
+"""
+
+from asyncio import new_event_loop
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import pytest
+
+from pyee import EventEmitter
+from pyee.asyncio import AsyncIOEventEmitter
+from pyee.executor import ExecutorEventEmitter
+
+Body = Callable[[EventEmitter], None]
+
+LISTENER_COUNTS = [0, 1, 10, 1000]
+
+# Roughly how many handler calls a benchmark of a flavour which schedules
+# work, rather than running it inline, may queue up before it's drained
+SCHEDULED_CALLS = 20_000
+
+
+def noop() -> Callable:
+    # Handlers are keyed by function, so every listener needs its own
+    def handler(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    return handler
+
+
+def async_noop() -> Callable:
+    async def handler(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    return handler
+
+
+@dataclass
+class Flavour:
+    name: str
+    run: Callable[[Body], None]
+    handler: Callable[[], Callable]
+    # When true, emitting queues up work which is only drained when the
+    # benchmark is finished, so the number of rounds has to be bounded
+    schedules: bool = False
+
+
+def run_sync(cls: Callable[[], EventEmitter]) -> Callable[[Body], None]:
+    def run(body: Body) -> None:
+        body(cls())
+
+    return run
+
+
+def run_asyncio(**kwargs: Any) -> Callable[[Body], None]:
+    def run(body: Body) -> None:
+        # The body runs inside the loop, since that's where eager tasks start
+        # eagerly
+        async def main() -> None:
+            ee = AsyncIOEventEmitter(loop=loop, **kwargs)
+            body(ee)
+            await ee.wait_for_complete()
+
+        loop = new_event_loop()
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+
+    return run
+
+
+def run_executor(**kwargs: Any) -> Callable[[Body], None]:
+    def run(body: Body) -> None:
+        with ExecutorEventEmitter(**kwargs) as ee:
+            body(ee)
+
+    return run
+
+
+def run_trio(body: Body) -> None:
+    trio = pytest.importorskip("trio")
+    from pyee.trio import TrioEventEmitter
+
+    async def main() -> None:
+        async with TrioEventEmitter() as ee:
+            body(ee)
+
+    trio.run(main)
+
+
+def run_twisted(body: Body) -> None:
+    pytest.importorskip("twisted")
+    from pyee.twisted import TwistedEventEmitter
+
+    body(TwistedEventEmitter())
+
+
+FLAVOURS = [
+    Flavour("sync", run_sync(EventEmitter), noop),
+    Flavour("sync-compiled", run_sync(lambda: EventEmitter(compiled=True)), noop),
+    Flavour("asyncio", run_asyncio(), noop),
+    Flavour("asyncio-coroutine", run_asyncio(), async_noop, schedules=True),
+    # Coroutines which complete without suspending never get scheduled
+    Flavour("asyncio-eager", run_asyncio(eager=True), async_noop),
+    Flavour("executor", run_executor(), noop, schedules=True),
+    Flavour("executor-batch", run_executor(batch=True), noop, schedules=True),
+    Flavour("trio", run_trio, async_noop, schedules=True),
+    Flavour("twisted", run_twisted, noop),
+]
+
+
+@pytest.fixture(params=FLAVOURS, ids=[f.name for f in FLAVOURS])
+def flavour(request: Any) -> Flavour:
+    return request.param
+
+
+@pytest.fixture(params=LISTENER_COUNTS, ids=[f"{n}" for n in LISTENER_COUNTS])
+def listeners(request: Any) -> int:
+    return request.param
+
+
+@pytest.fixture
+def measure(benchmark: Any, flavour: Flavour) -> Callable[[int, Callable], None]:
+    """Returns a function which benchmarks `fn`, which triggers `calls`
+    handler calls per invocation.
+
+    Flavours which schedule their handlers get a fixed number of rounds so
+    that the amount of queued work stays bounded; everything else is
+    calibrated by pytest-benchmark as usual.
+    """
+
+    def measure(calls: int, fn: Callable[[], Any]) -> None:
+        if flavour.schedules and calls:
+            rounds = max(10, SCHEDULED_CALLS // max(calls, 1))
+            benchmark.pedantic(fn, rounds=rounds, iterations=1, warmup_rounds=1)
+        else:
+            benchmark(fn)
+
+    return measure
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+from itertools import count
+from typing import Any, Callable
+
+import pytest
+
+from pyee import EventEmitter
+
+
+def test_once(benchmark: Any, measure: Callable, flavour: Any) -> None:
+    """Register a `once` handler on a fresh event and fire it, as with
+    request/response correlation.
+    """
+
+    benchmark.group = "once"
+
+    def body(ee: EventEmitter) -> None:
+        # A fresh event per registration, since the async flavours only
+        # remove `once` handlers when they run, rather than when they're
+        # scheduled
+        events = (f"reply:{i}" for i in count())
+
+        def once() -> None:
+            event = next(events)
+            ee.once(event, flavour.handler())
+            ee.emit(event)
+
+        measure(1, once)
+
+    flavour.run(body)
+
+
+@pytest.mark.parametrize("priority", [0, 1], ids=["default", "priority"])
+def test_remove_listener(
+    benchmark: Any, measure: Callable, flavour: Any, listeners: int, priority: int
+) -> None:
+    """Add and then remove a handler on an event which has `listeners` other
+    handlers, either with the default priority or ahead of all of them.
+    """
+
+    benchmark.group = f"remove_listener-{listeners}"
+
+    def body(ee: EventEmitter) -> None:
+        for _ in range(listeners):
+            ee.on("event", flavour.handler())
+
+        handler = flavour.handler()
+
+        def add_remove() -> None:
+            ee.add_listener("event", handler, priority=priority)
+            ee.remove_listener("event", handler)
+
+        measure(0, add_remove)
+
+    flavour.run(body)
+
+
+def test_remove_all_listeners(
+    benchmark: Any, measure: Callable, flavour: Any, listeners: int
+) -> None:
+    """Add `listeners` handlers to an event and then remove all of them."""
+
+    benchmark.group = f"remove_all_listeners-{listeners}"
+
+    def body(ee: EventEmitter) -> None:
+        handlers = [flavour.handler() for _ in range(listeners)]
+
+        def add_remove_all() -> None:
+            for handler in handlers:
+                ee.add_listener("event", handler)
+            ee.remove_all_listeners("event")
+
+        measure(0, add_remove_all)
+
+    flavour.run(body)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable
+
+import pytest
+
+from pyee import EventEmitter
+
+PAYLOADS = dict(
+    none=((), {}),
+    args=(("row", 1, 2.0, None), {}),
+    kwargs=((), dict(name="row", id=1, value=2.0, extra=None)),
+)
+
+
+@pytest.mark.parametrize("payload", list(PAYLOADS))
+def test_emit(
+    benchmark: Any, measure: Callable, flavour: Any, listeners: int, payload: str
+) -> None:
+    """Emit an event with `listeners` handlers attached."""
+
+    args, kwargs = PAYLOADS[payload]
+    benchmark.group = f"emit-{payload}-{listeners}"
+
+    def body(ee: EventEmitter) -> None:
+        for _ in range(listeners):
+            ee.on("event", flavour.handler())
+
+        measure(listeners, lambda: ee.emit("event", *args, **kwargs))
+
+    flavour.run(body)
+
+
+# A batch with 1000 listeners would schedule a million handler calls per
+# round for the async flavours
+@pytest.mark.parametrize("listeners", [1, 10])
+def test_emit_many(
+    benchmark: Any, measure: Callable, flavour: Any, listeners: int
+) -> None:
+    """Emit a batch of 1000 events with `listeners` handlers attached."""
+
+    benchmark.group = f"emit_many-{listeners}"
+    batch = [("row", i) for i in range(1000)]
+
+    def body(ee: EventEmitter) -> None:
+        for _ in range(listeners):
+            ee.on("event", flavour.handler())
+
+        measure(len(batch) * listeners, lambda: ee.emit_many("event", batch))
+
+    flavour.run(body)
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+@pytest.mark.parametrize("patterns", [1, 100, 10000])
+def test_emit_wildcard(benchmark: Any, patterns: int, cached: bool) -> None:
+    """Emit an event matching one of `patterns` wildcard patterns, with and
+    without the matched handlers cached.
+    """
+
+    benchmark.group = f"emit_wildcard-{'cached' if cached else 'uncached'}"
+    ee = EventEmitter(wildcard=True)
+
+    for i in range(patterns):
+        ee.on(f"order.{i}.*", lambda order: None)
+    ee.on("order.**", lambda order: None)
+
+    def emit() -> None:
+        if not cached:
+            ee._snapshots.clear()
+        ee.emit("order.0.created", "order")
+
+    benchmark(emit)
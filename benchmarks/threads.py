@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measure `EventEmitter.emit` throughput when several threads emit on one
+shared emitter. On a free-threaded (no-GIL) build of CPython, total
+throughput should grow with the number of threads; with the GIL it stays
+roughly flat.
+
+```bash
+python -X gil=0 benchmarks/threads.py --threads 1,2,4,8 --json threads.json
+```
+"""
+
+from argparse import ArgumentParser
+import json
+import os
+import sys
+from threading import Barrier, Thread
+from time import perf_counter
+from typing import Any, Dict, List
+
+from pyee import EventEmitter
+
+
+def gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled else True
+
+
+def run(threads: int, emits: int, listeners: int) -> Dict[str, Any]:
+    ee = EventEmitter()
+
+    for _ in range(listeners):
+        ee.on("event", lambda data: None)
+
+    barrier = Barrier(threads + 1)
+
+    def worker() -> None:
+        emit = ee.emit
+        barrier.wait()
+        for i in range(emits):
+            emit("event", i)
+        barrier.wait()
+
+    workers: List[Thread] = [Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+
+    barrier.wait()
+    start = perf_counter()
+    barrier.wait()
+    elapsed = perf_counter() - start
+
+    for t in workers:
+        t.join()
+
+    return dict(
+        threads=threads,
+        emits=threads * emits,
+        listeners=listeners,
+        seconds=elapsed,
+        emits_per_second=threads * emits / elapsed,
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--threads",
+        default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)),
+        help="comma-separated thread counts to run (default: 1,2,4,8 up to "
+        "the number of cores)",
+    )
+    parser.add_argument("--emits", type=int, default=200_000, help="emits per thread")
+    parser.add_argument(
+        "--listeners", type=int, default=1, help="listeners on the event"
+    )
+    parser.add_argument("--json", help="write results to this file as JSON")
+    opts = parser.parse_args()
+
+    results = [run(int(n), opts.emits, opts.listeners) for n in opts.threads.split(",")]
+
+    baseline = results[0]["emits_per_second"]
+    print(f"python {sys.version.split()[0]}, GIL enabled: {gil_enabled()}")
+    for r in results:
+        print(
+            f"{r['threads']:>3} threads: {r['emits_per_second']:>14,.0f} emits/s "
+            f"({r['emits_per_second'] / baseline:.2f}x)"
+        )
+
+    if opts.json:
+        with open(opts.json, "w") as f:
+            json.dump(
+                dict(
+                    python=sys.version,
+                    gil_enabled=gil_enabled(),
+                    results=results,
+                ),
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,18 @@ In [5]:
 
 """
 
-from pyee.base import EventEmitter, Handler, PyeeError, PyeeException
-
-__all__ = ["EventEmitter", "Handler", "PyeeError", "PyeeException"]
+from pyee.base import (
+    EventEmitter,
+    Handler,
+    MaxListenersExceededWarning,
+    PyeeError,
+    PyeeException,
+)
+
+__all__ = [
+    "EventEmitter",
+    "Handler",
+    "MaxListenersExceededWarning",
+    "PyeeError",
+    "PyeeException",
+]
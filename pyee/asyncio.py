@@ -1,13 +1,73 @@
 # -*- coding: utf-8 -*-
 
-from asyncio import AbstractEventLoop, ensure_future, Future, iscoroutine, wait
-from typing import Any, Callable, cast, Dict, Optional, Set, Tuple
-
-from pyee.base import EventEmitter
+from asyncio import (
+    AbstractEventLoop,
+    CancelledError,
+    current_task,
+    eager_task_factory,
+    ensure_future,
+    Event,
+    Future,
+    get_event_loop,
+    iscoroutine,
+    sleep,
+    wait,
+    wait_for,
+)
+from collections import deque
+from contextvars import Context, copy_context
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Coroutine,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from pyee.base import (
+    _chunks,
+    _event_value,
+    _EventStream,
+    EventEmitter,
+    Overflow,
+    PyeeError,
+    QueueFullError,
+)
 
 Self = Any
 
-__all__ = ["AsyncIOEventEmitter"]
+__all__ = [
+    "AsyncIOEventEmitter",
+    "AsyncIOEventStream",
+    "Correlator",
+    "Overflow",
+    "QueueFullError",
+]
+
+
+class _Limiter:
+    """Tracks how many coroutines are running against a concurrency limit,
+    and the coroutines waiting for a slot to free up. Each waiting coroutine
+    is stored with the limiter for its event, if any, which it holds a slot
+    on while it waits for an emitter-wide slot, and with the context it was
+    emitted in, which it runs in once it gets a slot.
+    """
+
+    __slots__ = ("limit", "running", "pending")
+
+    def __init__(self, limit: int) -> None:
+        self.limit: int = limit
+        self.running: int = 0
+        self.pending: Deque[Tuple[Coroutine, Optional["_Limiter"], Context]] = deque()
 
 
 class AsyncIOEventEmitter(EventEmitter):
@@ -33,15 +93,74 @@ class AsyncIOEventEmitter(EventEmitter):
     scheduling work with `ensure_future`. Otherwise, the default asyncio
     event loop is used.
 
+    The number of coroutine handlers running at once may be limited, both
+    across the emitter with `max_concurrency` and for individual events with
+    `max_concurrency_per_event`. A coroutine waiting on a limit isn't
+    scheduled as a task until a slot frees up. When a limit is reached,
+    `overflow` decides what happens to new coroutines:
+
+    - 'queue': Coroutines wait in a queue, however long it gets. This is the
+      default.
+    - 'drop_oldest': Up to `max_pending` coroutines wait in a queue. Past
+      that, the coroutine which has been waiting longest is dropped to make
+      room.
+    - 'drop_newest': Up to `max_pending` coroutines wait in a queue. Past
+      that, new coroutines are dropped.
+    - 'raise': Up to `max_pending` coroutines wait in a queue. Past that,
+      `emit` raises a `QueueFullError`.
+
+    Dropped coroutines are closed without being run. The number of waiting
+    coroutines is available from `queue_depth`:
+
+    ```py
+    ee = AsyncIOEventEmitter(
+        max_concurrency=100,
+        max_concurrency_per_event=dict(upload=4),
+        overflow='drop_oldest',
+        max_pending=1000,
+    )
+    ```
+
+    When `eager` is true, coroutines are started with eager task semantics
+    (see `asyncio.eager_task_factory`): they run synchronously inside `emit`
+    until they first suspend, and coroutines which complete without
+    suspending never get scheduled on the event loop or tracked as waiting.
+
+    Any other keyword arguments, such as `compiled`, are passed along to
+    `EventEmitter`.
+
     For asyncio coroutine event handlers, calling emit is non-blocking.
     In other words, you do not have to await any results from emit, and the
     coroutine is scheduled in a fire-and-forget fashion.
     """
 
-    def __init__(self: Self, loop: Optional[AbstractEventLoop] = None) -> None:
-        super(AsyncIOEventEmitter, self).__init__()
+    _can_pace: bool = True
+
+    def __init__(
+        self: Self,
+        loop: Optional[AbstractEventLoop] = None,
+        max_concurrency: Optional[int] = None,
+        max_concurrency_per_event: Optional[Mapping[str, int]] = None,
+        overflow: Overflow = "queue",
+        max_pending: int = 0,
+        eager: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super(AsyncIOEventEmitter, self).__init__(**kwargs)
         self._loop: Optional[AbstractEventLoop] = loop
         self._waiting: Set[Future] = set()
+        self._eager: bool = eager
+
+        self._limiter: Optional[_Limiter] = (
+            _Limiter(max_concurrency) if max_concurrency is not None else None
+        )
+        self._event_limiters: Dict[str, _Limiter] = {
+            event: _Limiter(limit)
+            for event, limit in (max_concurrency_per_event or dict()).items()
+        }
+        self._limited: bool = bool(self._limiter or self._event_limiters)
+        self._overflow: Overflow = overflow
+        self._max_pending: int = max_pending
 
     def emit(
         self: Self,
@@ -69,11 +188,39 @@ class AsyncIOEventEmitter(EventEmitter):
         """
         return super().emit(event, *args, **kwargs)
 
-    def _emit_run(
+    def _call_handlers(
+        self: Self,
+        event: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> bool:
+        if not self._limited:
+            return super()._call_handlers(event, args, kwargs)
+
+        return self._dispatch(event, self._handlers(event), args, kwargs)
+
+    def _dispatch(
+        self: Self,
+        event: str,
+        funcs: Tuple[Callable, ...],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> bool:
+        if not self._limited:
+            return super()._dispatch(event, funcs, args, kwargs)
+
+        limiter = self._event_limiters.get(event)
+        for f in funcs:
+            self._emit_run_limited(f, args, kwargs, limiter)
+
+        return bool(funcs)
+
+    def _emit_run_limited(
         self: Self,
         f: Callable,
         args: Tuple[Any, ...],
         kwargs: Dict[str, Any],
+        event_limiter: Optional[_Limiter],
     ) -> None:
         try:
             coro: Any = f(*args, **kwargs)
@@ -81,32 +228,439 @@ class AsyncIOEventEmitter(EventEmitter):
             self.emit("error", exc)
         else:
             if iscoroutine(coro):
-                if self._loop:
-                    # ensure_future is *extremely* cranky about the types here,
-                    # but this is relatively well-tested and I think the types
-                    # are more strict than they should be
-                    fut: Any = ensure_future(cast(Any, coro), loop=self._loop)
-                else:
-                    fut = ensure_future(cast(Any, coro))
+                self._submit(coro, event_limiter)
+            elif isinstance(coro, Future):
+                self._track(coro)
 
+    def _submit(self: Self, coro: Coroutine, event_limiter: Optional[_Limiter]) -> None:
+        # Take a slot for the event, and then a slot on the emitter, so that
+        # a coroutine waiting for an emitter-wide slot holds its event's slot
+        if event_limiter is not None:
+            if not self._acquire(event_limiter, coro, None):
+                return
+        if self._limiter is not None:
+            if not self._acquire(self._limiter, coro, event_limiter):
+                return
+        self._start(coro, event_limiter)
+
+    def _acquire(
+        self: Self,
+        limiter: _Limiter,
+        coro: Coroutine,
+        event_limiter: Optional[_Limiter],
+        overflow: bool = True,
+        context: Optional[Context] = None,
+    ) -> bool:
+        """Take a slot on `limiter` for `coro`, returning `True` if it may
+        run now. Otherwise, `coro` is queued or dropped according to the
+        overflow policy.
+        """
+        if limiter.running < limiter.limit:
+            limiter.running += 1
+            return True
+
+        if context is None:
+            context = copy_context()
+        if (
+            not overflow
+            or self._overflow == "queue"
+            or len(limiter.pending) < self._max_pending
+        ):
+            limiter.pending.append((coro, event_limiter, context))
+        elif self._overflow == "drop_oldest" and limiter.pending:
+            oldest, oldest_limiter, _ = limiter.pending.popleft()
+            self._drop(oldest, oldest_limiter)
+            limiter.pending.append((coro, event_limiter, context))
+        else:
+            self._drop(coro, event_limiter)
+            if self._overflow == "raise":
+                raise QueueFullError(
+                    f"Too many coroutines are waiting to run ({len(limiter.pending)})"
+                )
+        return False
+
+    def _drop(self: Self, coro: Coroutine, event_limiter: Optional[_Limiter]) -> None:
+        coro.close()
+        # Coroutines waiting on an emitter-wide slot hold their event's slot
+        if event_limiter is not None:
+            self._release(event_limiter)
+
+    def _release(self: Self, limiter: _Limiter) -> None:
+        """Give up a slot on `limiter`, handing it to the next waiting
+        coroutine, if any.
+        """
+        if not limiter.pending:
+            limiter.running -= 1
+            return
+
+        coro, event_limiter, context = limiter.pending.popleft()
+        if limiter is self._limiter:
+            self._start(coro, event_limiter, context)
+        # This coroutine now holds its event's slot and was already accepted,
+        # so it waits for an emitter-wide slot regardless of overflow policy
+        elif self._limiter is None or self._acquire(
+            self._limiter, coro, limiter, overflow=False, context=context
+        ):
+            self._start(coro, limiter, context)
+
+    def _start(
+        self: Self,
+        coro: Coroutine,
+        event_limiter: Optional[_Limiter],
+        context: Optional[Context] = None,
+    ) -> None:
+        fut = self._schedule(coro, context)
+
+        # An eager task may already be done, in which case this callback is
+        # still deferred to the event loop, so that handing its slots on to
+        # waiting coroutines can't recurse
+        def callback(f: Future) -> None:
+            if self._limiter is not None:
+                self._release(self._limiter)
+            if event_limiter is not None:
+                self._release(event_limiter)
+
+        fut.add_done_callback(callback)
+        self._track(fut)
+
+    def queue_depth(self: Self, event: Optional[str] = None) -> int:
+        """Returns the number of coroutines waiting for a free slot before
+        they can run, either for `event` or, if `event` is `None`, across the
+        whole emitter.
+        """
+        if event is not None:
+            limiter = self._event_limiters.get(event)
+            return len(limiter.pending) if limiter else 0
+
+        limiters = list(self._event_limiters.values())
+        if self._limiter is not None:
+            limiters.append(self._limiter)
+        return sum(len(limiter.pending) for limiter in limiters)
+
+    def _emit_run(
+        self: Self,
+        f: Callable,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        try:
+            coro: Any = f(*args, **kwargs)
+        except Exception as exc:
+            self.emit("error", exc)
+        else:
+            if iscoroutine(coro):
+                fut: Any = self._schedule(coro)
             elif isinstance(coro, Future):
                 fut = cast(Any, coro)
             else:
                 return
 
-            def callback(f: Future) -> None:
-                self._waiting.discard(f)
+            self._track(fut)
+
+    def _schedule(
+        self: Self, coro: Coroutine, context: Optional[Context] = None
+    ) -> Future:
+        if self._eager:
+            loop = self._loop or get_event_loop()
+            return eager_task_factory(loop, coro, context=context)
+        elif context is not None:
+            # Coroutines which were queued run in the context they were
+            # emitted in, rather than that of whichever task freed their slot
+            return (self._loop or get_event_loop()).create_task(coro, context=context)
+        elif self._loop:
+            # ensure_future is *extremely* cranky about the types here,
+            # but this is relatively well-tested and I think the types
+            # are more strict than they should be
+            return ensure_future(cast(Any, coro), loop=self._loop)
+        else:
+            return ensure_future(cast(Any, coro))
+
+    def _track(self: Self, fut: Future) -> None:
+        def callback(f: Future) -> None:
+            self._waiting.discard(f)
+
+            if f.cancelled():
+                return
 
-                if f.cancelled():
-                    return
+            exc: Optional[BaseException] = f.exception()
+            if exc:
+                self.emit("error", exc)
 
-                exc: Optional[BaseException] = f.exception()
-                if exc:
+        # Eager tasks which complete without suspending never need to wait
+        if fut.done():
+            callback(fut)
+            return
+
+        fut.add_done_callback(callback)
+        self._waiting.add(fut)
+
+    def emit_many(
+        self: Self,
+        event: str,
+        args: Iterable[Tuple[Any, ...]],
+        chunksize: int = 1000,
+    ) -> bool:
+        """Emit `event` once for every tuple of positional arguments in
+        `args`. Returns `True` if any functions are attached to `event`;
+        otherwise returns `False`.
+
+        Rather than calling each function and scheduling each coroutine
+        separately, `args` is split into chunks of up to `chunksize` items
+        and a single task is scheduled for every chunk. That task calls the
+        attached functions for each item in turn, awaiting any coroutines
+        they return before moving on to the next one. As with `emit`,
+        exceptions are emitted on the `error` event, and the tasks may be
+        waited on or canceled with `wait_for_complete` and `cancel`.
+
+        Note that this means that, unlike with `emit`, synchronous functions
+        aren't called until the event loop runs the chunk's task (unless the
+        emitter is `eager`, in which case they're called until the chunk
+        first suspends), and the handlers for a chunk run one at a time
+        rather than concurrently.
+
+        Since a chunk's task runs one coroutine at a time, it takes a single
+        slot against any concurrency limits, and is queued or dropped as a
+        whole according to `overflow`.
+        """
+        funcs = self._handlers(event)
+
+        if not funcs:
+            return super().emit_many(event, args)
+
+        if self._instrumented:
+            args = list(args)
+            funcs = self._instrument(event, funcs, len(args))
+
+        limiter = self._event_limiters.get(event)
+        for chunk in _chunks(args, chunksize):
+            if self._limited:
+                self._submit(self._run_many(funcs, chunk), limiter)
+            else:
+                self._track(self._schedule(self._run_many(funcs, chunk)))
+
+        return True
+
+    async def _run_many(
+        self: Self,
+        funcs: Tuple[Callable, ...],
+        chunk: List[Tuple[Any, ...]],
+    ) -> None:
+        for a in chunk:
+            for f in funcs:
+                try:
+                    result: Any = f(*a)
+                    if iscoroutine(result) or isinstance(result, Future):
+                        await result
+                except CancelledError:
+                    # A handler's future being canceled is ignored, as with
+                    # emit, but this task being canceled is not
+                    task = current_task()
+                    if task is not None and task.cancelling():
+                        raise
+                except Exception as exc:
                     self.emit("error", exc)
 
-            fut.add_done_callback(callback)
+    async def emit_async(
+        self: Self,
+        event: str,
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> List[Any]:
+        """Emit `event`, passing `*args` and `**kwargs` to each attached
+        function or coroutine, and wait for just those handlers to complete.
+        For example:
+
+        ```py
+        @ee.on('event')
+        async def async_handler(data):
+            return await lookup(data)
+
+        results = await ee.emit_async('event', '00101001')
+        ```
+
+        Returns a list with an entry for each handler, in the order they were
+        called: the value it returned (for coroutines, their result) or, if
+        it failed, the exception it raised. Exceptions are returned rather
+        than emitted on the `error` event. If no handlers are attached to
+        `event`, returns an empty list.
+
+        If `timeout` (in seconds) is given, `emit_async` waits at most that
+        long, and handlers which haven't completed by then get a
+        `TimeoutError` in their entry. `timeout` isn't passed to handlers.
+        Handlers which time out aren't canceled, and may still be waited on
+        or canceled with `wait_for_complete` and `cancel`, as with `emit`.
+        Exceptions they raise later are emitted on the `error` event.
+        Other handlers scheduled by the emitter aren't waited on.
+
+        Since the caller waits on them, coroutines run immediately,
+        regardless of any concurrency limits.
+        """
+        funcs = self._handlers(event)
+
+        if self._instrumented:
+            funcs = self._instrument(event, funcs)
+
+        if not funcs:
+            self._emit_handle_potential_error(event, args[0] if args else None)
+            return []
+
+        results: List[Any] = []
+        futures: Dict[int, Future] = dict()
+
+        for i, f in enumerate(funcs):
+            try:
+                result: Any = f(*args, **kwargs)
+            except Exception as exc:
+                result = exc
+            else:
+                if iscoroutine(result):
+                    futures[i] = self._schedule(result)
+                elif isinstance(result, Future):
+                    futures[i] = result
+            results.append(result)
+
+        # Futures may already be done, such as eager tasks which completed
+        # without suspending
+        pending = [fut for fut in futures.values() if not fut.done()]
+        for fut in pending:
+            fut.add_done_callback(self._waiting.discard)
             self._waiting.add(fut)
 
+        if pending:
+            await wait(pending, timeout=timeout)
+
+        for i, fut in futures.items():
+            if not fut.done():
+                results[i] = TimeoutError(
+                    f"Handler for {event!r} did not complete within {timeout}s"
+                )
+                # Nobody is waiting on its result any more, so it's handled
+                # like a handler scheduled by emit
+                self._track(fut)
+            elif fut.cancelled():
+                results[i] = CancelledError()
+            else:
+                error: Optional[BaseException] = fut.exception()
+                results[i] = error if error is not None else fut.result()
+
+        return results
+
+    def events(
+        self: Self, event: str, *, maxsize: int = 1000, overflow: Overflow = "raise"
+    ) -> "AsyncIOEventStream":
+        """Returns an `AsyncIOEventStream`, an async iterator over the emits of
+        `event` from now on:
+
+        ```py
+        async with ee.events('data') as stream:
+            async for data in stream:
+                print(data)
+        ```
+
+        Each item is the argument `event` was emitted with or, if it was
+        emitted with any other number of arguments, a tuple of them. Keyword
+        arguments aren't supported.
+
+        Up to `maxsize` events which haven't been read yet are buffered. When
+        the buffer is full, `overflow` decides what happens to new events:
+
+        - 'raise': The stream stops listening, and raises a `QueueFullError`
+          once the buffered events have been read. This is the default.
+        - 'drop_oldest': The event which has been waiting longest is dropped
+          to make room.
+        - 'drop_newest': New events are dropped.
+        - 'queue': Events are buffered however many are waiting, as they are
+          when `maxsize` is 0.
+
+        The stream stops listening when it's closed, either explicitly, by
+        exiting it as a context manager, or by being garbage collected.
+        """
+        return AsyncIOEventStream(self, event, maxsize, overflow)
+
+    async def wait_for(
+        self: Self,
+        event: str,
+        timeout: Optional[float] = None,
+        predicate: Optional[Callable[..., bool]] = None,
+    ) -> Any:
+        """Waits for the next emit of `event` and returns its value, the same
+        as an item from `events`:
+
+        ```py
+        data = await ee.wait_for('data', timeout=5)
+        ```
+
+        If `predicate` is given, emits are only waited for if it returns
+        true when called with the event's arguments, and any exception it
+        raises is raised here instead. If `timeout` seconds pass first, a
+        `TimeoutError` is raised.
+
+        Any number of callers may wait for the same event, for the cost of a
+        single listener, and each stops waiting when it's cancelled or times
+        out.
+        """
+        future: Future[Any] = (self._loop or get_event_loop()).create_future()
+
+        def resolve(value: Any) -> None:
+            if not future.done():
+                future.set_result(value)
+
+        def reject(exc: BaseException) -> None:
+            if not future.done():
+                future.set_exception(exc)
+
+        cancel = self._add_waiter(event, resolve, reject, predicate)
+        try:
+            return await wait_for(future, timeout)
+        finally:
+            cancel()
+
+    def correlate(
+        self: Self,
+        event: str,
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> "Correlator":
+        """Returns a `Correlator`, which matches the emits of a single reply
+        `event` to the requests waiting on them by ID, for RPC-style events:
+
+        ```py
+        replies = ee.correlate('reply')
+
+        @ee.on('reply_to_me')
+        async def handler(request_id, data):
+            ...
+            ee.emit('reply', request_id, result)
+
+        future = replies.expect(request_id, timeout=5)
+        ee.emit('request', request_id, data)
+        result = await future
+        ```
+
+        By default, the first argument of each reply is the ID, and the
+        rest are its value, the same as an item from `events`. Otherwise,
+        `key` is called with the reply's arguments to get the ID, and the
+        value is made from all of them.
+
+        Waiting requests don't add listeners of their own, and their
+        timeouts share the emitter's timer wheel, which fires to within
+        `timer_resolution` seconds.
+        """
+        return Correlator(self, event, key)
+
+    def _timer_hooks(
+        self: Self,
+    ) -> Tuple[
+        Callable[[], float],
+        Callable[[float, Callable[[], None]], Callable[[], None]],
+    ]:
+        loop = self._loop or get_event_loop()
+
+        def call_at(when: float, f: Callable[[], None]) -> Callable[[], None]:
+            return loop.call_at(when, f).cancel
+
+        return loop.time, call_at
+
     async def wait_for_complete(self: Self) -> None:
         """Waits for all pending tasks to complete. For example:
 
@@ -125,10 +679,19 @@ class AsyncIOEventEmitter(EventEmitter):
 
         This is useful if you're attempting a graceful shutdown of your
         application and want to ensure all coroutines have completed execution
-        beforehand.
+        beforehand. Calls which paced handlers have waiting, such as batches
+        buffered by `coalesce` handlers, are made straight away first.
         """
-        if self._waiting:
-            await wait(self._waiting)
+        self._flush_paced()
+        # Coroutines waiting on a concurrency limit are only scheduled once
+        # running ones finish. Eager tasks which finished without suspending
+        # aren't waiting, but hand their slots on from a callback on the
+        # event loop.
+        while self._waiting or self.queue_depth():
+            if self._waiting:
+                await wait(list(self._waiting))
+            else:
+                await sleep(0)
 
     def cancel(self: Self) -> None:
         """Cancel all pending tasks. For example:
@@ -149,6 +712,17 @@ class AsyncIOEventEmitter(EventEmitter):
         This is useful if you're attempting to shut down your application and
         attempts at a graceful shutdown via `wait_for_complete` have failed.
         """
+        # Drop coroutines waiting on their event first, since those waiting
+        # on the emitter would otherwise hand their event's slot on to them
+        for limiter in self._event_limiters.values():
+            while limiter.pending:
+                coro, _, _ = limiter.pending.popleft()
+                coro.close()
+        if self._limiter is not None:
+            while self._limiter.pending:
+                coro, event_limiter, _ = self._limiter.pending.popleft()
+                self._drop(coro, event_limiter)
+
         for fut in self._waiting:
             if not fut.done() and not fut.cancelled():
                 fut.cancel()
@@ -176,4 +750,161 @@ class AsyncIOEventEmitter(EventEmitter):
         print(ee.complete)
         ```
         """
-        return not self._waiting
+        return not self._waiting and not self.queue_depth()
+
+
+class AsyncIOEventStream(_EventStream):
+    """An async iterator over the emits of an event, as returned by
+    `AsyncIOEventEmitter#events`. As well as reading events one at a time,
+    events may be read in batches, so that a consumer which falls behind
+    catches up without waiting on every event:
+
+    ```py
+    async with ee.events('data', maxsize=10000) as stream:
+        async for batch in stream.batches(100):
+            await store.insert_many(batch)
+    ```
+    """
+
+    def __init__(
+        self: Self,
+        emitter: EventEmitter,
+        event: str,
+        maxsize: int = 1000,
+        overflow: Overflow = "raise",
+    ) -> None:
+        super(AsyncIOEventStream, self).__init__(emitter, event, maxsize, overflow)
+        self._buffer: Deque[Any] = deque()
+        self._ready: Event = Event()
+        self._attach()
+
+    def _put(self: Self, *args: Any) -> None:
+        if self._closed:
+            return
+        buffer = self._buffer
+        if self._maxsize and self._overflow != "queue" and len(buffer) >= self._maxsize:
+            if self._overflow == "drop_newest":
+                return
+            elif self._overflow == "drop_oldest":
+                buffer.popleft()
+            else:
+                self._full(len(buffer))
+                return
+        buffer.append(_event_value(args))
+        self._ready.set()
+
+    def _detach(self: Self) -> None:
+        super(AsyncIOEventStream, self)._detach()
+        # Wake up readers, so that they see the stream is closed
+        self._ready.set()
+
+    async def _wait(self: Self) -> None:
+        while not self._buffer:
+            if self._error is not None:
+                raise self._error
+            if self._closed:
+                raise StopAsyncIteration()
+            self._ready.clear()
+            await self._ready.wait()
+
+    async def get(self: Self) -> Any:
+        await self._wait()
+        return self._buffer.popleft()
+
+    async def get_batch(self: Self, max_items: int) -> List[Any]:
+        await self._wait()
+        buffer = self._buffer
+        return [buffer.popleft() for _ in range(min(max_items, len(buffer)))]
+
+    def close(self: Self) -> None:
+        self._buffer.clear()
+        self._error = None
+        if not self._closed:
+            self._detach()
+
+
+class Correlator:
+    """Matches the emits of a reply event to the requests waiting on them,
+    as returned by `AsyncIOEventEmitter#correlate`.
+
+    Each request waits on a future from `expect`, which is kept by its ID,
+    so that a reply resolves it with a single dict lookup. Timeouts are set
+    on the emitter's timer wheel, the same as for paced handlers.
+    """
+
+    def __init__(
+        self: Self,
+        emitter: AsyncIOEventEmitter,
+        event: str,
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        self._emitter: AsyncIOEventEmitter = emitter
+        self._event: str = event
+        self._key: Optional[Callable[..., Hashable]] = key
+        self._loop: AbstractEventLoop = emitter._loop or get_event_loop()
+        self._pending: Dict[Hashable, Future] = dict()
+        emitter.add_listener(event, self._reply)
+
+    def __len__(self: Self) -> int:
+        return len(self._pending)
+
+    def expect(self: Self, id: Hashable, timeout: Optional[float] = None) -> Future:
+        """Returns a future for the reply to the request `id`, which fails
+        with a `TimeoutError` if there isn't one within `timeout` seconds.
+        """
+        if id in self._pending and not self._pending[id].done():
+            raise PyeeError(f"Already waiting for a reply to {id!r}")
+        future = self._loop.create_future()
+        self._pending[id] = future
+        timer: Optional[Tuple[int, int]] = None
+        if timeout is not None:
+            wheel = self._emitter._timer_wheel()
+            timer = wheel.add(wheel.tick(timeout), partial(self._expire, id, future))
+        future.add_done_callback(partial(self._done, id, timer))
+        return future
+
+    def cancel(self: Self, id: Hashable) -> None:
+        """Stops waiting for a reply to the request `id`, cancelling its
+        future.
+        """
+        future = self._pending.pop(id, None)
+        if future is not None:
+            future.cancel()
+
+    def _reply(self: Self, *args: Any, **kwargs: Any) -> None:
+        if self._key is None:
+            id = args[0]
+            value = _event_value(args[1:])
+        else:
+            id = self._key(*args, **kwargs)
+            value = _event_value(args)
+        future = self._pending.pop(id, None)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    def _done(
+        self: Self, id: Hashable, timer: Optional[Tuple[int, int]], future: Future
+    ) -> None:
+        # Futures canceled by their caller are forgotten, and the timers of
+        # ones which were settled are removed
+        if self._pending.get(id) is future:
+            del self._pending[id]
+        if timer is not None:
+            self._emitter._timer_wheel().remove(timer)
+
+    def _expire(self: Self, id: Hashable, future: Future) -> None:
+        if future.done():
+            return
+        if self._pending.get(id) is future:
+            del self._pending[id]
+        future.set_exception(TimeoutError())
+
+    def close(self: Self) -> None:
+        """Stops listening for replies, and cancels the futures of any
+        requests which are still waiting.
+        """
+        self._emitter.remove_listener(self._event, self._reply)
+        pending = self._pending
+        self._pending = dict()
+        for future in pending.values():
+            future.cancel()
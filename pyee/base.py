@@ -1,20 +1,45 @@
 # -*- coding: utf-8 -*-
 
+from abc import ABC, abstractmethod
+from bisect import bisect_left
 from collections import OrderedDict
-from threading import Lock
+from contextlib import nullcontext
+from functools import partial
+from heapq import heappop, heappush
+from inspect import iscoroutine, iscoroutinefunction, ismethod
+from itertools import count, islice
+from math import ceil, floor
+import sys
+from threading import get_ident, Lock, RLock
+from time import perf_counter
+from traceback import extract_stack, StackSummary
+from types import TracebackType
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
+    cast,
+    ContextManager,
     Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
     overload,
     Set,
     Tuple,
+    Type,
     TypeVar,
     Union,
 )
+import warnings
+from weakref import ref, WeakMethod, WeakSet
+
+from typing_extensions import Literal
+
+from pyee.instrument import Collector, handler_name, Tracer
 
 Self = Any
 
@@ -27,8 +52,650 @@ class PyeeError(PyeeException):
     """An error internal to pyee."""
 
 
+class QueueFullError(PyeeError):
+    """Raised when handlers or events can't be queued and the overflow policy
+    is `raise`: by `AsyncIOEventEmitter#emit` when a coroutine handler can't
+    be run or queued, and by event streams which have too many events waiting
+    to be read.
+    """
+
+
+Overflow = Literal["queue", "drop_oldest", "drop_newest", "raise"]
+
+
+class MaxListenersExceededWarning(UserWarning):
+    """Warns that more listeners have been added to an event than the
+    emitter's limit, which usually means that listeners are being leaked.
+    `stack` holds where the listener which crossed the limit was added, if
+    the emitter was created with `diagnostic=True`.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        event: str,
+        count: int,
+        stack: Optional[StackSummary] = None,
+    ) -> None:
+        super(MaxListenersExceededWarning, self).__init__(message)
+        self.event: str = event
+        self.count: int = count
+        self.stack: Optional[StackSummary] = stack
+
+
 Handler = TypeVar("Handler", bound=Callable)
 
+Dispatcher = Callable[[Tuple[Any, ...], Dict[str, Any]], bool]
+
+
+def _dispatch_none(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bool:
+    return False
+
+
+# The most resolved handler snapshots a wildcard emitter will cache before
+# starting over
+_RESOLVED_CACHE_SIZE = 4096
+
+
+class _TrieNode:
+    __slots__ = ("children", "pattern", "seq")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = dict()
+        self.pattern: Optional[str] = None
+        self.seq: int = 0
+
+
+class _PatternTrie:
+    """An index of wildcard event patterns, such as `order.*.created` and
+    `order.**`, by segment. Finding the patterns which match an event name
+    takes time proportional to the number of segments in the name, rather
+    than to the number of patterns.
+    """
+
+    def __init__(self, delimiter: str) -> None:
+        self.delimiter: str = delimiter
+        self.root: _TrieNode = _TrieNode()
+        self._seq: int = 0
+
+    def is_pattern(self, event: str) -> bool:
+        return any(s == "*" or s == "**" for s in event.split(self.delimiter))
+
+    def add(self, pattern: str) -> None:
+        node = self.root
+        for segment in pattern.split(self.delimiter):
+            node = node.children.setdefault(segment, _TrieNode())
+        if node.pattern is None:
+            node.pattern = pattern
+            node.seq = self._seq
+            self._seq += 1
+
+    def remove(self, pattern: str) -> None:
+        path: List[Tuple[_TrieNode, str]] = []
+        node = self.root
+        for segment in pattern.split(self.delimiter):
+            if segment not in node.children:
+                return
+            path.append((node, segment))
+            node = node.children[segment]
+        node.pattern = None
+
+        # Prune any branches which no longer lead to a pattern
+        for parent, segment in reversed(path):
+            child = parent.children[segment]
+            if child.pattern is not None or child.children:
+                break
+            del parent.children[segment]
+
+    def match(self, event: str) -> List[str]:
+        """Returns the patterns matching `event`, in the order they were
+        added.
+        """
+        segments = event.split(self.delimiter)
+        n = len(segments)
+        found: Dict[str, int] = dict()
+        seen: Set[Tuple[int, int]] = set()
+        stack: List[Tuple[_TrieNode, int]] = [(self.root, 0)]
+
+        while stack:
+            node, i = stack.pop()
+            if (id(node), i) in seen:
+                continue
+            seen.add((id(node), i))
+
+            # `**` matches zero or more segments
+            globstar = node.children.get("**")
+            if globstar is not None:
+                stack.extend((globstar, j) for j in range(i, n + 1))
+
+            if i == n:
+                if node.pattern is not None:
+                    found[node.pattern] = node.seq
+                continue
+
+            child = node.children.get(segments[i])
+            if child is not None:
+                stack.append((child, i + 1))
+            star = node.children.get("*")
+            if star is not None:
+                stack.append((star, i + 1))
+
+        return sorted(found, key=found.__getitem__)
+
+
+class _Ordering:
+    """The sort order of an event's handlers, for events with handlers added
+    with a priority or prepended. Handlers are sorted by descending priority
+    and then by `seq`, which counts up for appended handlers and down for
+    prepended ones, so that each insertion is a binary search.
+    """
+
+    __slots__ = ("keys", "entries", "lo", "hi")
+
+    def __init__(self, handlers: Iterable[Callable]) -> None:
+        self.entries: List[Tuple[int, int, Callable]] = [
+            (0, seq, k) for seq, k in enumerate(handlers)
+        ]
+        self.keys: Dict[Callable, Tuple[int, int, Callable]] = {
+            entry[2]: entry for entry in self.entries
+        }
+        self.lo: int = 0
+        self.hi: int = len(self.entries)
+
+    def add(self, k: Callable, priority: int, prepend: bool) -> int:
+        """Add or move `k`, returning its new position."""
+        self.remove(k)
+        if prepend:
+            self.lo -= 1
+            entry = (-priority, self.lo, k)
+        else:
+            self.hi += 1
+            entry = (-priority, self.hi, k)
+        # Sequence numbers are unique, so handlers are never compared
+        i = bisect_left(self.entries, entry)
+        self.entries.insert(i, entry)
+        self.keys[k] = entry
+        return i
+
+    def remove(self, k: Callable) -> None:
+        entry = self.keys.pop(k, None)
+        if entry is not None:
+            del self.entries[bisect_left(self.entries, entry)]
+
+    def without(self, drop: Callable[[Callable], bool]) -> "_Ordering":
+        """A copy of this ordering without the handlers `drop` is true for."""
+        ordering = _Ordering(())
+        ordering.entries = [entry for entry in self.entries if not drop(entry[2])]
+        ordering.keys = {entry[2]: entry for entry in ordering.entries}
+        ordering.lo, ordering.hi = self.lo, self.hi
+        return ordering
+
+
+class _WeakHandler:
+    """A handler which holds its function through a weak reference. It
+    compares equal to the function, so that it can be looked up and removed
+    as if it were the function itself. Once the function is collected,
+    calling the handler does nothing except try to `drop` it.
+    """
+
+    __slots__ = ("ref", "hash", "drop")
+
+    def __init__(self, f: Callable, drop: Callable[["_WeakHandler"], None]) -> None:
+        self.hash: int = hash(f)
+        self.drop: Callable[["_WeakHandler"], None] = drop
+
+        def collected(_: Any) -> None:
+            drop(self)
+
+        # Bound methods are created on every attribute access, so refer to
+        # the object and function separately
+        self.ref: Callable[[], Optional[Callable]] = (
+            WeakMethod(f, collected) if ismethod(f) else ref(f, collected)
+        )
+
+    @property
+    def __wrapped__(self) -> Callable:
+        f = self.ref()
+        return f if f is not None else self
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def __eq__(self, other: Any) -> bool:
+        if other is self:
+            return True
+        f = self.ref()
+        return f is not None and f == other
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        f = self.ref()
+        if f is None:
+            self.drop(self)
+            return None
+        return f(*args, **kwargs)
+
+
+class _Once:
+    """A handler added with `once`, which removes `f` from `event` before
+    calling it. If `f` was already removed, or was attached again since,
+    calling the handler does nothing.
+    """
+
+    __slots__ = ("emitter", "event", "__wrapped__", "__weakref__")
+
+    def __init__(self, emitter: "EventEmitter", event: str, f: Callable) -> None:
+        self.emitter: "EventEmitter" = emitter
+        self.event: str = event
+        self.__wrapped__: Callable = f
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        emitter = self.emitter
+        f = self.__wrapped__
+        with emitter._lock:
+            handlers = emitter._events.get(self.event)
+            if handlers is None or handlers.get(f) is not self:
+                return None
+            emitter._remove_listener(self.event, f)
+        if emitter._heard("remove_listener"):
+            emitter.emit("remove_listener", self.event, f)
+        # f may return a coroutine, so we need to return that result here so
+        # that emit can schedule it
+        return f(*args, **kwargs)
+
+
+class _TimerWheel:
+    """The timers for an emitter's paced handlers, rounded up to ticks of
+    `resolution` seconds and kept in a bucket per tick, so that adding one
+    is constant time however many there are, as is removing one. A single
+    underlying timer is set, with `call_at`, for the earliest tick with any
+    timers in it.
+
+    Emitters which run handlers on several threads set timers which fire
+    on other threads, so the wheel and its handlers' state are guarded by
+    `lock`.
+    """
+
+    def __init__(
+        self,
+        resolution: float,
+        now: Callable[[], float],
+        call_at: Callable[[float, Callable[[], None]], Callable[[], None]],
+    ) -> None:
+        self.resolution: float = resolution
+        self.now: Callable[[], float] = now
+        # Sets the underlying timer, returning a function which cancels it
+        self.call_at: Callable[[float, Callable[[], None]], Callable[[], None]] = (
+            call_at
+        )
+        # Each bucket's timers, keyed so that they can be removed, and
+        # whether `flush` fires them
+        self.buckets: Dict[int, Dict[int, Tuple[Callable[[], None], bool]]] = dict()
+        self.keys: Iterator[int] = count()
+        # The ticks which have had buckets, in a heap
+        self.ticks: List[int] = []
+        self.timer: Optional[Callable[[], None]] = None
+        self.timer_tick: Optional[int] = None
+        # The tick whose timers are being fired, or were last fired
+        self.current: int = 0
+        self.lock: RLock = RLock()
+
+    def tick(self, delay: float) -> int:
+        """The tick which is at least `delay` seconds from now."""
+        return ceil((self.now() + delay) / self.resolution)
+
+    def add(
+        self, tick: int, f: Callable[[], None], flush: bool = False
+    ) -> Tuple[int, int]:
+        """Calls `f` once `tick` comes around, or when the wheel is flushed
+        if `flush` is true. Returns a handle which `remove` takes.
+        """
+        with self.lock:
+            bucket = self.buckets.get(tick)
+            if bucket is None:
+                bucket = self.buckets[tick] = dict()
+                heappush(self.ticks, tick)
+                if self.timer_tick is None or tick < self.timer_tick:
+                    self._schedule(tick)
+            key = next(self.keys)
+            bucket[key] = (f, flush)
+            return tick, key
+
+    def remove(self, handle: Tuple[int, int]) -> None:
+        """Removes a timer, if it hasn't fired yet."""
+        tick, key = handle
+        with self.lock:
+            bucket = self.buckets.get(tick)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    # Its tick is skipped when it comes around
+                    del self.buckets[tick]
+
+    def flush(self) -> None:
+        """Fires the timers which were added with `flush` now, in order,
+        along with any such timers they add. Other timers, such as
+        timeouts, are left to fire when they're due.
+        """
+        with self.lock:
+            while True:
+                due = sorted(
+                    (tick, key)
+                    for tick, bucket in self.buckets.items()
+                    for key, (_, flush) in bucket.items()
+                    if flush
+                )
+                if not due:
+                    return
+                for tick, key in due:
+                    bucket = self.buckets.get(tick)
+                    if bucket is None or key not in bucket:
+                        # Removed by a timer which fired before it
+                        continue
+                    f, _ = bucket.pop(key)
+                    if not bucket:
+                        del self.buckets[tick]
+                    self.current = max(self.current, tick)
+                    f()
+
+    def _schedule(self, tick: int) -> None:
+        if self.timer is not None:
+            self.timer()
+        self.timer_tick = tick
+        self.timer = self.call_at(tick * self.resolution, partial(self._fire, tick))
+
+    def _fire(self, tick: int) -> None:
+        with self.lock:
+            if tick != self.timer_tick:
+                # Canceled, but had already gone off on another thread
+                return
+            # The tick the timer was set for is due, even if the clock reads
+            # a hair earlier
+            due = max(tick, floor(self.now() / self.resolution))
+            self.timer = self.timer_tick = None
+            while self.ticks and self.ticks[0] <= due:
+                self.current = heappop(self.ticks)
+                for f, _ in self.buckets.pop(self.current, {}).values():
+                    f()
+            if self.ticks and self.timer_tick != self.ticks[0]:
+                self._schedule(self.ticks[0])
+
+
+Pace = Literal["debounce", "throttle", "coalesce"]
+
+# The pacing arguments of a handler which isn't paced: `debounce`,
+# `throttle`, `coalesce` and `max_batch`
+_UNPACED = (None, None, None, None)
+
+
+class _Paced:
+    """A handler added with `debounce`, `throttle` or `coalesce`, which
+    paces calls to `f` with timers on its emitter's timer wheel. Emitting
+    only updates the handler's state, and sets a timer if one isn't set
+    already. Calls to `f` go through the emitter's `_emit_run`, so that
+    they're handled like any other handler's.
+    """
+
+    __slots__ = (
+        "emitter",
+        "event",
+        "__wrapped__",
+        "pace",
+        "seconds",
+        "max_batch",
+        "scheduled",
+        "timer",
+        "deadline",
+        "latest",
+        "values",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        emitter: "EventEmitter",
+        event: str,
+        f: Callable,
+        pace: Pace,
+        seconds: float,
+        max_batch: Optional[int] = None,
+    ) -> None:
+        self.emitter: "EventEmitter" = emitter
+        self.event: str = event
+        self.__wrapped__: Callable = f
+        self.pace: Pace = pace
+        self.seconds: float = seconds
+        # For coalescing, how many values to pass on without waiting
+        self.max_batch: Optional[int] = max_batch
+        # Whether a timer is set, and its handle on the timer wheel
+        self.scheduled: bool = False
+        self.timer: Optional[Tuple[int, int]] = None
+        # For debouncing, the tick the call is due on
+        self.deadline: int = 0
+        # The latest emit's arguments, if it hasn't been passed on yet
+        self.latest: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None
+        # For coalescing, the values of the emits so far
+        self.values: List[Any] = []
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        wheel = self.emitter._timer_wheel()
+        pace = self.pace
+        with wheel.lock:
+            if pace == "coalesce":
+                values = self.values
+                values.append(_event_value(args))
+                if self.max_batch is not None and len(values) >= self.max_batch:
+                    # Full, so passed on straight away. The next batch waits
+                    # from its own first value, rather than on this timer.
+                    if self.timer is not None:
+                        wheel.remove(self.timer)
+                    self.scheduled = False
+                    self.timer = None
+                    self.values = []
+                    self._batch(values)
+                    return
+            elif pace == "debounce":
+                self.latest = (args, kwargs)
+                self.deadline = wheel.tick(self.seconds)
+            elif self.scheduled:
+                self.latest = (args, kwargs)
+            else:
+                # Throttled calls start straight away, and start a period in
+                # which later emits wait
+                self.scheduled = True
+                self.timer = wheel.add(wheel.tick(self.seconds), self.fire, flush=True)
+                self.run(args, kwargs)
+                return
+
+            if not self.scheduled:
+                self.scheduled = True
+                tick = self.deadline if pace == "debounce" else wheel.tick(self.seconds)
+                self.timer = wheel.add(tick, self.fire, flush=True)
+
+    def fire(self) -> None:
+        wheel = self.emitter._timer_wheel()
+        if self.pace == "debounce" and self.deadline > wheel.current:
+            # Emitted again since the timer was set, so wait for the rest
+            self.timer = wheel.add(self.deadline, self.fire, flush=True)
+            return
+
+        self.scheduled = False
+        self.timer = None
+        handlers = self.emitter._events.get(self.event)
+        if handlers is None or handlers.get(self.__wrapped__) is not self:
+            # Removed since
+            self.latest = None
+            self.values = []
+            return
+
+        if self.pace == "coalesce":
+            values, self.values = self.values, []
+            if values:
+                self._batch(values)
+        elif self.latest is not None:
+            (args, kwargs), self.latest = self.latest, None
+            if self.pace == "throttle":
+                # The trailing call starts another period
+                self.scheduled = True
+                self.timer = wheel.add(wheel.tick(self.seconds), self.fire, flush=True)
+            self.run(args, kwargs)
+
+    def run(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        emitter = self.emitter
+        f = self.__wrapped__
+        # Timed here rather than when emitted, since the calls are the
+        # handler's work
+        if emitter._instrumented:
+            f = _Timed(emitter, self.event, f)
+        emitter._emit_run(f, args, kwargs)
+
+    def _batch(self, values: List[Any]) -> None:
+        emitter = self.emitter
+        if emitter._instrumented:
+            for collector in emitter._collectors:
+                collector.record_batch(
+                    emitter, self.event, self.__wrapped__, len(values)
+                )
+        self.run((values,), dict())
+
+
+class _Timed:
+    """A handler for a single emit, which tells the emitter's collectors how
+    long it waited to start and how long it took, following any coroutine,
+    future or deferred it returns until it completes.
+    """
+
+    __slots__ = (
+        "emitter",
+        "event",
+        "f",
+        "handler",
+        "collectors",
+        "tracer",
+        "scheduled",
+        "thread",
+    )
+
+    def __init__(self, emitter: "EventEmitter", event: str, f: Callable) -> None:
+        self.emitter: "EventEmitter" = emitter
+        self.event: str = event
+        self.f: Callable = f
+        # Report the function a `once` or weak handler wraps
+        self.handler: Callable = getattr(f, "__wrapped__", f)
+        self.collectors: Tuple[Collector, ...] = emitter._collectors
+        self.tracer: Optional[Tracer] = emitter._tracer
+        self.scheduled: float = perf_counter()
+        self.thread: int = get_ident()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        # Spans for coroutines are started when they're first scheduled
+        if self.tracer is None or iscoroutinefunction(self.handler):
+            return self.call(*args, **kwargs)
+        with self.span():
+            return self.call(*args, **kwargs)
+
+    def span(self) -> ContextManager[Any]:
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.start_as_current_span(
+            f"process {self.event}",
+            attributes=_span_attributes(
+                self.event, "process", **{"code.function": handler_name(self.handler)}
+            ),
+        )
+
+    def call(self, *args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        # Handlers run on an executor start on another thread
+        if get_ident() != self.thread:
+            self.waited(start)
+        try:
+            result = self.f(*args, **kwargs)
+        except BaseException as exc:
+            self.record(start, exc)
+            raise
+        if iscoroutine(result):
+            return self.follow(result)
+        if hasattr(result, "add_done_callback"):
+            result.add_done_callback(partial(self.settled, start))
+        elif hasattr(result, "addBoth"):
+            result.addBoth(partial(self.deferred, start))
+        else:
+            self.record(start, None)
+        return result
+
+    def waited(self, start: float) -> None:
+        for collector in self.collectors:
+            collector.record_wait(
+                self.emitter, self.event, self.handler, start - self.scheduled
+            )
+
+    def record(self, start: float, error: Optional[BaseException]) -> None:
+        seconds = perf_counter() - start
+        for collector in self.collectors:
+            collector.record_handler(
+                self.emitter, self.event, self.handler, seconds, error
+            )
+
+    async def follow(self, coro: Any) -> Any:
+        # Coroutines wait until they're first scheduled
+        start = perf_counter()
+        self.waited(start)
+        with self.span():
+            try:
+                result = await coro
+            except BaseException as exc:
+                self.record(start, exc)
+                raise
+        self.record(start, None)
+        return result
+
+    def settled(self, start: float, fut: Any) -> None:
+        self.record(start, None if fut.cancelled() else fut.exception())
+
+    def deferred(self, start: float, result: Any) -> Any:
+        # Twisted failures keep the exception on `value`
+        self.record(start, result.value if hasattr(result, "raiseException") else None)
+        return result
+
+
+def _span_attributes(event: str, operation: str, **extra: Any) -> Dict[str, Any]:
+    # Following OpenTelemetry's semantic conventions for messaging
+    return {
+        "messaging.system": "pyee",
+        "messaging.operation.type": operation,
+        "messaging.destination.name": event,
+        **extra,
+    }
+
+
+def _event_value(args: Tuple[Any, ...]) -> Any:
+    """The value of an emit with `args`, for APIs which deal in one value per
+    emit: the argument, if there was only one, or a tuple of them.
+    """
+    return args[0] if len(args) == 1 else args
+
+
+def _chunks(
+    iterable: Iterable[Tuple[Any, ...]], size: int
+) -> Iterator[List[Tuple[Any, ...]]]:
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _listener(k: Callable) -> Optional[Callable]:
+    """The function which was attached as the handler keyed by `k`, or
+    `None` if it's been garbage collected or `k` is internal to the emitter.
+    """
+    if isinstance(k, _WeakHandler):
+        return k.ref()
+    if isinstance(k, _Waiters):
+        return None
+    return k
+
 
 class EventEmitter:
     """The base event emitter class. All other event emitters inherit from
@@ -41,6 +708,12 @@ class EventEmitter:
     - `new_listener`: Fires whenever a new listener is created. Listeners for
       this event do not fire upon their own creation.
 
+    - `remove_listener`: Fires whenever a listener is removed, with the event
+      and the listener, after it's been removed. This includes `once`
+      listeners as they fire and listeners removed by
+      `remove_all_listeners`, but not weakly held listeners which are
+      dropped after being garbage collected.
+
     - `error`: When emitted raises an Exception by default, behavior can be
       overridden by attaching callback to the event.
 
@@ -57,31 +730,215 @@ class EventEmitter:
     All callbacks are handled in a synchronous, blocking manner. As in node.js,
     raised exceptions are not automatically handled for you---you must catch
     your own exceptions, and treat them accordingly.
+
+    Emitters may be shared between threads, including on free-threaded
+    (no-GIL) builds of CPython. Adding and removing listeners is serialized
+    on an internal lock, and each change atomically publishes a new,
+    immutable snapshot of the event's handlers. `emit` only ever reads the
+    current snapshot, so it never takes the lock and concurrent emits on
+    the same emitter don't contend with each other.
+
+    When `compiled` is `True`, the emitter builds a specialized dispatch
+    function for each event the first time it's emitted, and reuses it until
+    that event's listeners change. This cuts the per-emit overhead for events
+    which are emitted far more often than their listeners change, at the
+    cost of rebuilding the dispatch function after every change.
+
+    When `wildcard` is `True`, event names are treated as a series of
+    segments separated by `delimiter`, and listeners may be registered on
+    patterns where a `*` segment matches exactly one segment and a `**`
+    segment matches zero or more segments:
+
+    ```py
+    ee = EventEmitter(wildcard=True)
+
+    @ee.on('order.*.created')
+    def on_order_created(order):
+        print(order)
+
+    # Calls on_order_created
+    ee.emit('order.eu.created', order)
+    ```
+
+    Handlers registered on the exact event name are called first, followed
+    by the handlers for each matching pattern, in the order the patterns
+    were first listened to. Handler priorities order the handlers attached
+    to the exact event name, and to each pattern, separately. Special events,
+    such as `new_listener` and `error`, are never matched by patterns. The
+    handlers matching each event name are cached, so emit stays cheap however
+    many patterns are registered.
     """
 
-    def __init__(self: Self) -> None:
+    # Events with special meaning to the emitter
+    _special_events: FrozenSet[str] = frozenset(
+        ("new_listener", "remove_listener", "error")
+    )
+
+    # The most listeners emitters allow on an event before warning, unless
+    # set with `set_max_listeners`. 0 means there's no limit.
+    default_max_listeners: int = 0
+
+    # How precisely the timers for paced handlers fire, in seconds
+    timer_resolution: float = 0.01
+
+    # Whether handlers may be paced, on emitters which override
+    # `_timer_hooks`. Checked instead of calling it when handlers are added,
+    # so that adding one doesn't need an event loop.
+    _can_pace: bool = False
+
+    def __init__(
+        self: Self,
+        *,
+        compiled: bool = False,
+        wildcard: bool = False,
+        delimiter: str = ".",
+        diagnostic: bool = False,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
         self._events: Dict[
             str,
             "OrderedDict[Callable, Callable]",
         ] = dict()
+        # Immutable, per-event tuples of the handlers in `_events`. These are
+        # republished (copy-on-write) whenever an event's handlers change, so
+        # that emit can read them with a single dict lookup and no lock.
+        self._snapshots: Dict[str, Tuple[Callable, ...]] = dict()
+        # Compiled per-event dispatch functions, thrown away whenever the
+        # snapshot for their event is republished. `None` unless compiled
+        # dispatch is enabled.
+        self._dispatchers: Optional[Dict[str, Dispatcher]] = (
+            dict() if compiled else None
+        )
+        # Index of the wildcard patterns in `_events`. `None` unless wildcards
+        # are enabled, in which case `_snapshots` is a cache of the handlers
+        # for both the exact event name and any matching patterns, filled in
+        # as events are emitted.
+        self._patterns: Optional[_PatternTrie] = (
+            _PatternTrie(delimiter) if wildcard else None
+        )
+        # The order of the handlers for events with prioritized or prepended
+        # handlers, which `_events` is kept sorted by. Other events' handlers
+        # are simply in the order they were added.
+        self._orderings: Dict[str, _Ordering] = dict()
+        # Callers waiting on the next emit of each event, with `wait_for`
+        self._waiters: Dict[str, _Waiters] = dict()
+        # The streams listening to each event, with `events`, which are held
+        # weakly like their listeners
+        self._streams: Dict[str, "WeakSet[_EventStream]"] = dict()
+        self._max_listeners: Optional[int] = None
+        # Events which have been warned about having too many listeners
+        self._warned: Set[str] = set()
+        self._diagnostic: bool = diagnostic
+        # Replaced rather than mutated, like the snapshots, so that emit can
+        # check for collectors without taking the lock
+        self._collectors: Tuple[Collector, ...] = ()
+        self._tracer: Optional[Tracer] = tracer
+        # Whether there are any collectors or a tracer, so that emit only has
+        # one thing to check when there aren't
+        self._instrumented: bool = tracer is not None
+        # Set while `pyee.uplift` passes this emitter's events on to another
+        # emitter, which may be listening for `new_listener` and
+        # `remove_listener` when this one isn't
+        self._uplifted: bool = False
+        # Created the first time a paced handler needs a timer
+        self._timers: Optional[_TimerWheel] = None
         self._lock: Lock = Lock()
 
     def __getstate__(self: Self) -> Mapping[str, Any]:
         state = self.__dict__.copy()
         del state["_lock"]
+        state["_collectors"] = ()
+        state["_tracer"] = None
+        state["_instrumented"] = False
+        state["_timers"] = None
+        state["_streams"] = dict()
+        if state["_dispatchers"] is not None:
+            state["_dispatchers"] = dict()
+        with self._lock:
+            if any(
+                isinstance(k, _WeakHandler)
+                for handlers in self._events.values()
+                for k in handlers
+            ):
+                self._strong_state(state)
         return state
 
+    def _strong_state(self: Self, state: Dict[str, Any]) -> None:
+        """Naked unprotected removal of weakly held handlers from a copy of
+        this emitter's state. Weak references can't be pickled, and a copy
+        which held their functions would be holding them strongly.
+        """
+        events: Dict[str, "OrderedDict[Callable, Callable]"] = dict()
+        for event, handlers in self._events.items():
+            strong = OrderedDict(
+                (k, v) for k, v in handlers.items() if not isinstance(k, _WeakHandler)
+            )
+            if strong:
+                events[event] = strong
+        state["_events"] = events
+
+        orderings: Dict[str, _Ordering] = dict()
+        for event, ordering in self._orderings.items():
+            if event in events:
+                orderings[event] = ordering.without(
+                    lambda k: isinstance(k, _WeakHandler)
+                )
+        state["_orderings"] = orderings
+
+        if self._patterns is None:
+            state["_snapshots"] = {
+                event: tuple(handlers.values()) for event, handlers in events.items()
+            }
+        else:
+            patterns = _PatternTrie(self._patterns.delimiter)
+            for event in events:
+                if patterns.is_pattern(event):
+                    patterns.add(event)
+            state["_patterns"] = patterns
+            state["_snapshots"] = dict()
+
     def __setstate__(self: Self, state: Mapping[str, Any]) -> None:
         self.__dict__.update(state)
         self._lock = Lock()
 
     @overload
-    def on(self: Self, event: str) -> Callable[[Handler], Handler]: ...
+    def on(
+        self: Self,
+        event: str,
+        *,
+        priority: int = 0,
+        weak: bool = False,
+        debounce: Optional[float] = None,
+        throttle: Optional[float] = None,
+        coalesce: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ) -> Callable[[Handler], Handler]: ...
+
     @overload
-    def on(self: Self, event: str, f: Handler) -> Handler: ...
+    def on(
+        self: Self,
+        event: str,
+        f: Handler,
+        *,
+        priority: int = 0,
+        weak: bool = False,
+        debounce: Optional[float] = None,
+        throttle: Optional[float] = None,
+        coalesce: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ) -> Handler: ...
 
     def on(
-        self: Self, event: str, f: Optional[Handler] = None
+        self: Self,
+        event: str,
+        f: Optional[Handler] = None,
+        *,
+        priority: int = 0,
+        weak: bool = False,
+        debounce: Optional[float] = None,
+        throttle: Optional[float] = None,
+        coalesce: Optional[float] = None,
+        max_batch: Optional[int] = None,
     ) -> Union[Handler, Callable[[Handler], Handler]]:
         """Registers the function `f` to the event name `event`, if provided.
 
@@ -105,16 +962,90 @@ class EventEmitter:
         returned. The upshot of this is that you can call decorated handlers
         directly, as well as use them in remove_listener calls.
 
+        Handlers with a higher `priority` are called before handlers with a
+        lower one, and handlers with the same priority are called in the
+        order they were added. The default priority is 0, and priorities may
+        be negative. Adding a function which is already attached to `event`
+        with a different priority moves it.
+
+        When `weak` is `True`, the emitter only holds a weak reference to the
+        handler (for bound methods, to the object they're bound to), and the
+        handler is removed once it's garbage collected. This is useful when
+        short-lived objects listen to a long-lived emitter:
+
+        ```py
+        ee.on('data', self.on_data, weak=True)
+        ```
+
+        Note that a weakly held function which nothing else refers to, such
+        as a lambda, is collected straight away.
+
+        Emitters which can set timers, such as `AsyncIOEventEmitter`,
+        `ExecutorEventEmitter`, `TrioEventEmitter` and `TwistedEventEmitter`,
+        can pace calls to a handler, given a number of seconds with one of:
+
+        - `debounce`: The handler is called once emits have stopped for that
+          long, with the latest emit's arguments.
+        - `throttle`: The handler is called at most once in that long. The
+          first emit calls it straight away, and if there are more during
+          that time, it's called again at the end with the latest emit's
+          arguments.
+        - `coalesce`: The handler is called that long after the first emit,
+          with a list of the values of every emit since, the same as items
+          from `events`. If `max_batch` is given as well, it's called as soon
+          as that many have been emitted, without waiting.
+
+        ```py
+        @ee.on('resize', debounce=0.2)
+        def on_resize(width, height):
+            redraw(width, height)
+
+        @ee.on('row', coalesce=0.5, max_batch=500)
+        def store_rows(rows):
+            db.insert_many(rows)
+        ```
+
+        A burst of emits sets at most one timer per paced handler, and these
+        timers share a single timer wheel per emitter, which fires to within
+        `timer_resolution` seconds.
+
         Note that this method's return type is a union type. If you are using
         mypy or pyright, you will probably want to use either
         `EventEmitter#listens_to` or `EventEmitter#add_listener`.
         """
         if f is None:
-            return self.listens_to(event)
+            return self.listens_to(
+                event,
+                priority=priority,
+                weak=weak,
+                debounce=debounce,
+                throttle=throttle,
+                coalesce=coalesce,
+                max_batch=max_batch,
+            )
         else:
-            return self.add_listener(event, f)
+            return self.add_listener(
+                event,
+                f,
+                priority=priority,
+                weak=weak,
+                debounce=debounce,
+                throttle=throttle,
+                coalesce=coalesce,
+                max_batch=max_batch,
+            )
 
-    def listens_to(self: Self, event: str) -> Callable[[Handler], Handler]:
+    def listens_to(
+        self: Self,
+        event: str,
+        *,
+        priority: int = 0,
+        weak: bool = False,
+        debounce: Optional[float] = None,
+        throttle: Optional[float] = None,
+        coalesce: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ) -> Callable[[Handler], Handler]:
         """Returns a decorator which will register the decorated function to
         the event name `event`:
 
@@ -125,16 +1056,31 @@ class EventEmitter:
         ```
 
         By only supporting the decorator use case, this method has improved
-        type safety over `EventEmitter#on`.
+        type safety over `EventEmitter#on`. `priority`, `weak`, `debounce`,
+        `throttle`, `coalesce` and `max_batch` work as with
+        `EventEmitter#on`.
         """
 
         def on(f: Handler) -> Handler:
-            self._add_event_handler(event, f, f)
+            pace = (debounce, throttle, coalesce, max_batch)
+            v = f if pace == _UNPACED else self._paced(event, f, weak, *pace)
+            self._add_event_handler(event, f, v, priority, weak=weak)
             return f
 
         return on
 
-    def add_listener(self: Self, event: str, f: Handler) -> Handler:
+    def add_listener(
+        self: Self,
+        event: str,
+        f: Handler,
+        *,
+        priority: int = 0,
+        weak: bool = False,
+        debounce: Optional[float] = None,
+        throttle: Optional[float] = None,
+        coalesce: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ) -> Handler:
         """Register the function `f` to the event name `event`:
 
         ```
@@ -145,23 +1091,455 @@ class EventEmitter:
         ```
 
         By not supporting the decorator use case, this method has improved
-        type safety over `EventEmitter#on`.
+        type safety over `EventEmitter#on`. `priority`, `weak`, `debounce`,
+        `throttle`, `coalesce` and `max_batch` work as with
+        `EventEmitter#on`.
+        """
+        pace = (debounce, throttle, coalesce, max_batch)
+        v = f if pace == _UNPACED else self._paced(event, f, weak, *pace)
+        self._add_event_handler(event, f, v, priority, weak=weak)
+        return f
+
+    def prepend_listener(
+        self: Self,
+        event: str,
+        f: Handler,
+        *,
+        priority: int = 0,
+        weak: bool = False,
+        debounce: Optional[float] = None,
+        throttle: Optional[float] = None,
+        coalesce: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ) -> Handler:
+        """Register the function `f` to the event name `event`, ahead of
+        any other functions with the same `priority`:
+
+        ```
+        def audit_handler(data):
+            print(data)
+
+        ee.prepend_listener("event", audit_handler)
+        ```
+
+        `priority`, `weak`, `debounce`, `throttle`, `coalesce` and
+        `max_batch` work as with `EventEmitter#on`.
         """
-        self._add_event_handler(event, f, f)
+        pace = (debounce, throttle, coalesce, max_batch)
+        v = f if pace == _UNPACED else self._paced(event, f, weak, *pace)
+        self._add_event_handler(event, f, v, priority, prepend=True, weak=weak)
         return f
 
-    def _add_event_handler(self: Self, event: str, k: Callable, v: Callable):
-        # Fire 'new_listener' *before* adding the new listener!
-        self.emit("new_listener", event, k)
+    def _paced(
+        self: Self,
+        event: str,
+        f: Callable,
+        weak: bool,
+        debounce: Optional[float],
+        throttle: Optional[float],
+        coalesce: Optional[float],
+        max_batch: Optional[int],
+    ) -> Callable:
+        """Returns the handler to attach for `f`, which paces calls to it
+        as given by `debounce`, `throttle` or `coalesce`. Callers skip this
+        when none of them are given, so that adding a handler costs no more
+        than it did before pacing.
+        """
+        if max_batch is not None and coalesce is None:
+            raise PyeeError("max_batch may only be given with coalesce")
+        paces = [
+            (pace, seconds)
+            for pace, seconds in (
+                ("debounce", debounce),
+                ("throttle", throttle),
+                ("coalesce", coalesce),
+            )
+            if seconds is not None
+        ]
+        if not paces:
+            return f
+        if len(paces) > 1:
+            raise PyeeError("Only one of debounce, throttle or coalesce may be given")
+        if weak:
+            raise PyeeError("Paced handlers can't be held weakly")
+        if not self._can_pace:
+            # Fail early, with the emitter's reason it can't set timers
+            self._timer_hooks()
+        pace, seconds = paces[0]
+        return _Paced(self, event, f, cast(Pace, pace), seconds, max_batch)
+
+    def _timer_hooks(
+        self: Self,
+    ) -> Tuple[
+        Callable[[], float],
+        Callable[[float, Callable[[], None]], Callable[[], None]],
+    ]:
+        """Returns the functions the timer wheel uses to read the clock and
+        to set a timer, which returns a function that cancels it. Emitters
+        with an event loop override this, and set `_can_pace`. It's called
+        the first time a timer is needed, such as on a paced handler's first
+        emit.
+        """
+        raise PyeeError(f"{type(self).__name__} has no event loop to set timers on")
+
+    def _timer_wheel(self: Self) -> _TimerWheel:
+        if self._timers is None:
+            self._timers = _TimerWheel(self.timer_resolution, *self._timer_hooks())
+        return self._timers
+
+    def _flush_paced(self: Self) -> None:
+        """Makes the calls paced handlers have waiting now, rather than when
+        their timers fire, such as before shutting down.
+        """
+        if self._timers is not None:
+            self._timers.flush()
+
+    def buffered(self: Self, event: Optional[str] = None) -> int:
+        """Returns the number of emits buffered by `coalesce` handlers and
+        not yet passed on, either for `event` or, if `event` is `None`,
+        across the whole emitter.
+        """
+        with self._lock:
+            if event is not None:
+                handlers = list(self._events.get(event, OrderedDict()).values())
+            else:
+                handlers = [f for fs in self._events.values() for f in fs.values()]
+        return sum(len(f.values) for f in handlers if isinstance(f, _Paced))
+
+    def _add_event_handler(
+        self: Self,
+        event: str,
+        k: Callable,
+        v: Callable,
+        priority: int = 0,
+        prepend: bool = False,
+        weak: bool = False,
+    ):
+        # Fire 'new_listener' *before* adding the new listener! It's only
+        # emitted if anything could hear it, so adding listeners costs little
+        # more than a dict insert otherwise.
+        if self._heard("new_listener"):
+            self.emit("new_listener", event, k)
+
+        if weak:
+            k = v = _WeakHandler(k, partial(self._drop_weak, event))
 
         # Add the necessary function
         # Note that k and v are the same for `on` handlers, but
         # different for `once` handlers, where v is a wrapped version
         # of k which removes itself before calling k
         with self._lock:
-            if event not in self._events:
-                self._events[event] = OrderedDict()
-            self._events[event][k] = v
+            handlers = self._insert(event, k, v, priority, prepend)
+
+            limit = self.get_max_listeners()
+            count = len(handlers)
+            exceeded = bool(limit) and count > limit and event not in self._warned
+            if exceeded:
+                self._warned.add(event)
+
+        if exceeded:
+            self._warn_max_listeners(event, count, limit)
+
+    def _heard(self: Self, event: str) -> bool:
+        """Whether emitting the special `event` could call anything, or be
+        recorded by a collector or tracer. Special events aren't matched by
+        wildcard patterns, so this is a dict lookup.
+        """
+        return event in self._events or self._instrumented or self._uplifted
+
+    def _insert(
+        self: Self,
+        event: str,
+        k: Callable,
+        v: Callable,
+        priority: int = 0,
+        prepend: bool = False,
+    ) -> "OrderedDict[Callable, Callable]":
+        """Naked unprotected insertion of a handler, returning the event's
+        handlers.
+        """
+        if event not in self._events:
+            self._events[event] = OrderedDict()
+        handlers = self._events[event]
+        ordering = self._orderings.get(event)
+
+        if ordering is None and not priority:
+            handlers[k] = v
+            if prepend:
+                handlers.move_to_end(k, last=False)
+        elif (
+            ordering is not None
+            and not prepend
+            and ordering.keys.get(k, (None,))[0] == -priority
+        ):
+            # Already attached with this priority, so it stays put
+            handlers[k] = v
+        else:
+            if ordering is None:
+                ordering = self._orderings[event] = _Ordering(handlers)
+            i = ordering.add(k, priority, prepend)
+            handlers.pop(k, None)
+            handlers[k] = v
+            for _, _, after in ordering.entries[i + 1 :]:
+                handlers.move_to_end(after)
+
+        self._publish(event)
+        return handlers
+
+    def _add_waiter(
+        self: Self,
+        event: str,
+        resolve: Callable[[Any], Any],
+        reject: Callable[[BaseException], Any],
+        predicate: Optional[Callable[..., bool]] = None,
+    ) -> Callable[[], None]:
+        """Call `resolve` with the value of the next emit of `event` for
+        which `predicate`, if given, returns true, or `reject` with any
+        exception `predicate` raises. Returns a function which cancels the
+        waiter, if it hasn't been resolved already.
+
+        All of an event's waiters are kept together by a single listener,
+        which resolves them in one pass, and from which they're removed in
+        constant time.
+        """
+        with self._lock:
+            waiters = self._waiters.get(event)
+            if waiters is None:
+                waiters = self._waiters[event] = _Waiters(self, event)
+                self._insert(event, waiters, waiters)
+            key = waiters.add(resolve, reject, predicate)
+        return partial(waiters.cancel, key)
+
+    def set_max_listeners(self: Self, n: int) -> None:
+        """Set the most listeners which may be added to any one event before
+        the emitter warns about a possible leak. The default, 0, means
+        there's no limit:
+
+        ```py
+        ee.set_max_listeners(100)
+        ```
+
+        When a listener takes an event past the limit, a
+        `MaxListenersExceededWarning` is issued with Python's `warnings`
+        module, once per event. When the emitter is created with
+        `diagnostic=True`, the warning also includes where that listener was
+        added; otherwise, nothing extra is collected when adding listeners.
+        """
+        self._max_listeners = n
+
+    def get_max_listeners(self: Self) -> int:
+        """Returns the most listeners which may be added to any one event
+        before the emitter warns, as set with `set_max_listeners`. Defaults
+        to `EventEmitter.default_max_listeners`.
+        """
+        if self._max_listeners is None:
+            return self.default_max_listeners
+        return self._max_listeners
+
+    def add_collector(self: Self, collector: Collector) -> None:
+        """Attach a `pyee.instrument.Collector`, which is told about every
+        emit from then on, how long each handler took to run and how long
+        handlers which are scheduled rather than called straight away
+        waited to start:
+
+        ```py
+        from pyee.instrument import Stats
+
+        stats = Stats()
+        ee.add_collector(stats)
+        ```
+
+        While any collectors are attached, each handler is wrapped in a
+        function which times it for every emit, and compiled dispatch isn't
+        used. Emitters without collectors don't do any of this.
+        """
+        with self._lock:
+            self._collectors = self._collectors + (collector,)
+            self._instrumented = True
+
+    def remove_collector(self: Self, collector: Collector) -> None:
+        """Detach a collector attached with `add_collector`."""
+        with self._lock:
+            self._collectors = tuple(c for c in self._collectors if c is not collector)
+            self._instrumented = bool(self._collectors) or self._tracer is not None
+
+    def set_tracer(self: Self, tracer: Optional[Tracer]) -> None:
+        """Trace emits with `tracer`, or stop tracing if `tracer` is `None`.
+        The tracer may be an OpenTelemetry tracer, or anything else with a
+        compatible `start_as_current_span` method:
+
+        ```py
+        from opentelemetry import trace
+
+        ee.set_tracer(trace.get_tracer('pyee'))
+        ```
+
+        Each `emit` is traced with a `publish <event>` span, and each handler
+        it calls with a `process <event>` span. Handlers which are scheduled,
+        such as coroutines and executor jobs, run in the context `emit` was
+        called in, so their spans are children of the emit's span even once
+        it has ended. Spans for coroutines cover them until they complete.
+        `emit_many` and `emit_async` don't start spans of their own, so their
+        handlers' spans are children of whatever span is current.
+
+        The tracer may also be passed in as `EventEmitter(tracer=tracer)`.
+        Emitters without a tracer don't start any spans.
+        """
+        with self._lock:
+            self._tracer = tracer
+            self._instrumented = bool(self._collectors) or tracer is not None
+
+    def _warn_max_listeners(self: Self, event: str, count: int, limit: int) -> None:
+        # Point the warning at the first caller outside of pyee
+        frame = sys._getframe(1)
+        stacklevel = 2
+        while frame.f_back is not None and frame.f_globals.get(
+            "__name__", ""
+        ).startswith("pyee."):
+            frame = frame.f_back
+            stacklevel += 1
+
+        stack = extract_stack(frame) if self._diagnostic else None
+        message = (
+            f"{count} listeners added to {event!r}, more than the limit of "
+            f"{limit}. This may be a leak; use set_max_listeners to raise the "
+            "limit"
+        )
+        if stack is not None:
+            message += ". Listener added at:\n" + "".join(stack.format())
+
+        warnings.warn(
+            MaxListenersExceededWarning(message, event, count, stack),
+            stacklevel=stacklevel,
+        )
+
+    def _drop_weak(self: Self, event: str, handler: _WeakHandler) -> None:
+        """Remove `handler`, whose function has been collected. This may be
+        called by the garbage collector while the lock is held, including by
+        this thread, so it only tries to take the lock. If that fails, the
+        handler is removed the next time it's emitted instead.
+        """
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            # A collected handler is only equal to itself
+            if handler in self._events.get(event, ()):
+                self._remove_listener(event, handler)
+        finally:
+            self._lock.release()
+
+    def _publish(self: Self, event: str) -> None:
+        """Naked unprotected republishing of the handler snapshot for
+        `event`.
+        """
+        if self._patterns is not None:
+            if self._patterns.is_pattern(event):
+                if event in self._events:
+                    self._patterns.add(event)
+                else:
+                    self._patterns.remove(event)
+                # Any cached event may match the pattern
+                self._snapshots.clear()
+                if self._dispatchers is not None:
+                    self._dispatchers.clear()
+            else:
+                self._snapshots.pop(event, None)
+                if self._dispatchers is not None:
+                    self._dispatchers.pop(event, None)
+            return
+
+        handlers = self._events.get(event)
+        if handlers:
+            self._snapshots[event] = tuple(handlers.values())
+        else:
+            self._snapshots.pop(event, None)
+        if self._dispatchers is not None:
+            self._dispatchers.pop(event, None)
+
+    def _resolve(self: Self, event: str) -> Tuple[Callable, ...]:
+        """Naked unprotected lookup of the handlers for `event`, resolving and
+        caching the handlers for any matching wildcard patterns.
+        """
+        funcs = self._snapshots.get(event)
+        if funcs is not None or self._patterns is None:
+            return funcs or ()
+
+        handlers = self._events.get(event)
+        funcs = tuple(handlers.values()) if handlers else ()
+        if event in self._special_events:
+            return funcs
+        for pattern in self._patterns.match(event):
+            # Patterns are also events in their own right, whose handlers
+            # have already been included
+            if pattern != event:
+                funcs += tuple(self._events[pattern].values())
+
+        # Events without any handlers are cached too, so that emitting them
+        # doesn't walk the patterns every time
+        if len(self._snapshots) >= _RESOLVED_CACHE_SIZE:
+            self._snapshots.clear()
+        self._snapshots[event] = funcs
+        return funcs
+
+    def _handlers(self: Self, event: str) -> Tuple[Callable, ...]:
+        """Get the handlers which emitting `event` calls."""
+        funcs = self._snapshots.get(event)
+        if funcs is not None:
+            return funcs
+        if self._patterns is None:
+            return ()
+        with self._lock:
+            return self._resolve(event)
+
+    def _compile(self: Self, event: str) -> Dispatcher:
+        """Build, and cache, a function which calls the handlers currently
+        attached to `event`.
+        """
+        with self._lock:
+            funcs = self._resolve(event)
+
+            if not funcs:
+                return _dispatch_none
+
+            if type(self)._emit_run is EventEmitter._emit_run:
+                # There's nothing special about running handlers, so call
+                # them directly
+                if len(funcs) == 1:
+                    (f,) = funcs
+
+                    def dispatch(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bool:
+                        f(*args, **kwargs)
+                        return True
+
+                else:
+
+                    def dispatch(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bool:
+                        for f in funcs:
+                            f(*args, **kwargs)
+                        return True
+
+            else:
+                run = self._emit_run
+
+                if len(funcs) == 1:
+                    (f,) = funcs
+
+                    def dispatch(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bool:
+                        run(f, args, kwargs)
+                        return True
+
+                else:
+
+                    def dispatch(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bool:
+                        for f in funcs:
+                            run(f, args, kwargs)
+                        return True
+
+            dispatchers = cast(Dict[str, Dispatcher], self._dispatchers)
+            if len(dispatchers) >= _RESOLVED_CACHE_SIZE:
+                dispatchers.clear()
+            dispatchers[event] = dispatch
+            return dispatch
 
     def _emit_run(
         self: Self,
@@ -173,7 +1551,8 @@ class EventEmitter:
 
     def event_names(self: Self) -> Set[str]:
         """Get a set of events that this emitter is listening to."""
-        return set(self._events.keys())
+        with self._lock:
+            return set(self._events.keys())
 
     def _emit_handle_potential_error(self: Self, event: str, error: Any) -> None:
         if event == "error":
@@ -182,21 +1561,75 @@ class EventEmitter:
             else:
                 raise PyeeError(f"Uncaught, unspecified 'error' event: {error}")
 
+    def _instrument(
+        self: Self, event: str, funcs: Tuple[Callable, ...], n: int = 1
+    ) -> Tuple[Callable, ...]:
+        """Tell the collectors about emitting `event` `n` times, and wrap
+        `funcs` so that the collectors are told how long they take.
+        """
+        for collector in self._collectors:
+            collector.record_emit(self, event, n)
+        return tuple(
+            f if isinstance(f, _Paced) else _Timed(self, event, f) for f in funcs
+        )
+
+    def _emit_instrumented(
+        self: Self, event: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> bool:
+        tracer = self._tracer
+        if tracer is None:
+            return self._dispatch(
+                event, self._instrument(event, self._handlers(event)), args, kwargs
+            )
+        with tracer.start_as_current_span(
+            f"publish {event}", attributes=_span_attributes(event, "publish")
+        ):
+            return self._dispatch(
+                event, self._instrument(event, self._handlers(event)), args, kwargs
+            )
+
+    def _dispatch(
+        self: Self,
+        event: str,
+        funcs: Tuple[Callable, ...],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> bool:
+        """Run `funcs` for a single emit of `event`. Emitters which run
+        handlers differently from one at a time with `_emit_run` override
+        this, and `_call_handlers` to match.
+        """
+        for f in funcs:
+            self._emit_run(f, args, kwargs)
+
+        return bool(funcs)
+
     def _call_handlers(
         self: Self,
         event: str,
         args: Tuple[Any, ...],
         kwargs: Dict[str, Any],
     ) -> bool:
-        handled = False
+        if self._dispatchers is not None:
+            dispatch = self._dispatchers.get(event)
+            if dispatch is None:
+                if self._patterns is None and event not in self._snapshots:
+                    return False
+                dispatch = self._compile(event)
+            return dispatch(args, kwargs)
 
-        with self._lock:
-            funcs = list(self._events.get(event, OrderedDict()).values())
+        # The snapshot is replaced rather than mutated when handlers are
+        # added or removed, so handlers added during this emit won't be
+        # called and handlers removed during this emit still will be.
+        funcs = self._snapshots.get(event)
+        if funcs is None:
+            if self._patterns is None:
+                return False
+            funcs = self._handlers(event)
         for f in funcs:
             self._emit_run(f, args, kwargs)
-            handled = True
 
-        return handled
+        return bool(funcs)
 
     def emit(
         self: Self,
@@ -217,39 +1650,69 @@ class EventEmitter:
         Assuming `data` is an attached function, this will call
         `data('00101001')'`.
         """
-        handled = self._call_handlers(event, args, kwargs)
+        if self._instrumented:
+            handled = self._emit_instrumented(event, args, kwargs)
+        else:
+            handled = self._call_handlers(event, args, kwargs)
 
         if not handled:
             self._emit_handle_potential_error(event, args[0] if args else None)
 
         return handled
 
+    def emit_many(
+        self: Self,
+        event: str,
+        args: Iterable[Tuple[Any, ...]],
+    ) -> bool:
+        """Emit `event` once for every tuple of positional arguments in
+        `args`, which may be any iterable, including a generator. Returns
+        `True` if any functions are attached to `event`; otherwise returns
+        `False`.
+
+        Example:
+
+        ```py
+        ee.emit_many('row', ((row,) for row in rows))
+        ```
+
+        This is equivalent to calling `ee.emit('row', row)` for every row,
+        except that the attached functions are looked up once for the whole
+        batch. Functions attached or removed while the batch is running
+        won't be picked up until the next call to `emit` or `emit_many`,
+        but `once` handlers still only fire once.
+        """
+        funcs = self._handlers(event)
+
+        if self._instrumented:
+            args = list(args)
+            funcs = self._instrument(event, funcs, len(args))
+
+        if not funcs:
+            for a in args:
+                self._emit_handle_potential_error(event, a[0] if a else None)
+            return False
+
+        kwargs: Dict[str, Any] = dict()
+        for a in args:
+            for f in funcs:
+                self._emit_run(f, a, kwargs)
+
+        return True
+
     def once(
         self: Self,
         event: str,
         f: Optional[Callable] = None,
+        *,
+        priority: int = 0,
     ) -> Callable:
         """The same as `ee.on`, except that the listener is automatically
         removed after being called.
         """
 
         def _wrapper(f: Callable) -> Callable:
-            def g(
-                *args: Any,
-                **kwargs: Any,
-            ) -> Any:
-                with self._lock:
-                    # Check that the event wasn't removed already right
-                    # before the lock
-                    if event in self._events and f in self._events[event]:
-                        self._remove_listener(event, f)
-                    else:
-                        return None
-                # f may return a coroutine, so we need to return that
-                # result here so that emit can schedule it
-                return f(*args, **kwargs)
-
-            self._add_event_handler(event, f, g)
+            self._add_event_handler(event, f, _Once(self, event, f), priority)
             return f
 
         if f is None:
@@ -257,29 +1720,305 @@ class EventEmitter:
         else:
             return _wrapper(f)
 
-    def _remove_listener(self: Self, event: str, f: Callable) -> None:
-        """Naked unprotected removal."""
-        if event in self._events:
-            self._events[event].pop(f)
-            if not self._events[event]:
-                del self._events[event]
+    def _remove_listener(self: Self, event: str, f: Callable) -> bool:
+        """Naked unprotected removal. Returns whether `f` was attached to
+        `event`.
+        """
+        handlers = self._events.get(event)
+        if handlers is None or handlers.pop(f, None) is None:
+            return False
+        ordering = self._orderings.get(event)
+        if not handlers:
+            del self._events[event]
+            self._warned.discard(event)
+            if ordering is not None:
+                del self._orderings[event]
+        elif ordering is not None:
+            ordering.remove(f)
+        self._publish(event)
+        return True
 
     def remove_listener(self: Self, event: str, f: Callable) -> None:
-        """Removes the function `f` from `event`."""
+        """Removes the function `f` from `event`, if it's attached."""
         with self._lock:
-            self._remove_listener(event, f)
+            removed = self._remove_listener(event, f)
+        if removed and self._heard("remove_listener"):
+            self.emit("remove_listener", event, f)
 
     def remove_all_listeners(self: Self, event: Optional[str] = None) -> None:
         """Remove all listeners attached to `event`.
-        If `event` is `None`, remove all listeners on all events.
+        If `event` is `None`, remove all listeners on all events. Callers
+        waiting on the removed events with `wait_for` get a `PyeeError`, as
+        do readers of their streams once the buffered events have been read.
         """
+        if event is None and self._heard("remove_listener"):
+            # As in Node, the remove_listener listeners hear about every other
+            # listener being removed, before they're removed themselves
+            for e in self.event_names():
+                if e != "remove_listener":
+                    self.remove_all_listeners(e)
+
+        removed: List[Callable] = []
+        waiters: List[_Waiters] = []
+        streams: List[_EventStream] = []
         with self._lock:
             if event is not None:
                 if event in self._events:
+                    if self._heard("remove_listener"):
+                        removed = list(self._events[event])
                     del self._events[event]
+                    self._orderings.pop(event, None)
+                    if event in self._waiters:
+                        waiters.append(self._waiters.pop(event))
+                    if event in self._streams:
+                        streams.extend(self._streams.pop(event))
+                    self._warned.discard(event)
+                    self._publish(event)
             else:
+                waiters = list(self._waiters.values())
+                streams = [s for ss in self._streams.values() for s in ss]
+                self._streams = dict()
                 self._events = dict()
+                self._orderings = dict()
+                self._waiters = dict()
+                self._warned = set()
+                self._snapshots = dict()
+                if self._dispatchers is not None:
+                    self._dispatchers = dict()
+                if self._patterns is not None:
+                    self._patterns = _PatternTrie(self._patterns.delimiter)
+
+        # Callers waiting on the removed events would otherwise never hear
+        # back
+        for w in waiters:
+            w.reject_all(
+                PyeeError(f"Listeners for {w.event!r} were removed while waiting")
+            )
+        for stream in streams:
+            stream._reject(
+                PyeeError(f"Listeners for {stream._event!r} were removed while reading")
+            )
+
+        for k in removed:
+            f = _listener(k)
+            if f is not None:
+                self.emit("remove_listener", event, f)
+
+    def listener_count(self: Self, event: str) -> int:
+        """Returns the number of listeners registered to the `event`, without
+        copying them as `listeners` does. Weakly held listeners which have
+        been garbage collected, but not yet removed, are removed first.
+        """
+        with self._lock:
+            handlers = self._events.get(event)
+            if handlers is None:
+                return 0
+            dead = [
+                f for f in handlers if isinstance(f, _WeakHandler) and f.ref() is None
+            ]
+            for f in dead:
+                self._remove_listener(event, f)
+            # Callers waiting with `wait_for` share a listener, which isn't
+            # one of the event's listeners as far as callers are concerned
+            return len(handlers) - (event in self._waiters)
 
     def listeners(self: Self, event: str) -> List[Callable]:
         """Returns a list of all listeners registered to the `event`."""
-        return list(self._events.get(event, OrderedDict()).keys())
+        with self._lock:
+            handlers = list(self._events.get(event, OrderedDict()).keys())
+        return [f for f in map(_listener, handlers) if f is not None]
+
+
+class _Waiters:
+    """The callers waiting on the next emit of an event, which is attached
+    to the event as a single listener. Each waiter is keyed by a number, so
+    that it can be canceled without searching for it.
+    """
+
+    def __init__(self, emitter: EventEmitter, event: str) -> None:
+        self.emitter: EventEmitter = emitter
+        self.event: str = event
+        self.waiters: Dict[
+            int,
+            Tuple[
+                Callable[[Any], Any],
+                Callable[[BaseException], Any],
+                Optional[Callable[..., bool]],
+            ],
+        ] = dict()
+        self.keys: Iterator[int] = count()
+
+    def add(
+        self,
+        resolve: Callable[[Any], Any],
+        reject: Callable[[BaseException], Any],
+        predicate: Optional[Callable[..., bool]],
+    ) -> int:
+        """Naked unprotected addition of a waiter."""
+        key = next(self.keys)
+        self.waiters[key] = (resolve, reject, predicate)
+        return key
+
+    def _remove(self, key: int) -> bool:
+        """Naked unprotected removal of a waiter, detaching from the emitter
+        once there are none left. Returns whether the waiter was still
+        waiting.
+        """
+        if self.waiters.pop(key, None) is None:
+            return False
+        emitter = self.emitter
+        if not self.waiters and emitter._waiters.get(self.event) is self:
+            del emitter._waiters[self.event]
+            emitter._remove_listener(self.event, self)
+        return True
+
+    def cancel(self, key: int) -> None:
+        with self.emitter._lock:
+            self._remove(key)
+
+    def reject_all(self, exc: BaseException) -> None:
+        """Reject every waiter, once this has been detached from the
+        emitter.
+        """
+        with self.emitter._lock:
+            waiters = list(self.waiters.values())
+            self.waiters.clear()
+        for _, reject, _ in waiters:
+            reject(exc)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        with self.emitter._lock:
+            waiters = list(self.waiters.items())
+
+        # Predicates are called without holding the lock, since they may
+        # use the emitter
+        matched: List[Tuple[int, Callable[[Any], Any], Any]] = []
+        for key, (resolve, reject, predicate) in waiters:
+            if predicate is None:
+                matched.append((key, resolve, None))
+                continue
+            try:
+                if predicate(*args, **kwargs):
+                    matched.append((key, resolve, None))
+            except Exception as exc:
+                matched.append((key, reject, exc))
+
+        if not matched:
+            return
+
+        # Waiters which were canceled or resolved by another emit in the
+        # meantime are skipped
+        with self.emitter._lock:
+            matched = [m for m in matched if self._remove(m[0])]
+
+        value = _event_value(args)
+        for _, settle, error in matched:
+            settle(value if error is None else error)
+
+
+class _EventStream(ABC):
+    """The parts of an async iterator over an event's emits which don't
+    depend on the event loop. Subclasses buffer the events passed to `_put`
+    and implement `get`, `get_batch` and `close`.
+    """
+
+    def __init__(
+        self, emitter: EventEmitter, event: str, maxsize: int, overflow: Overflow
+    ) -> None:
+        self._emitter: EventEmitter = emitter
+        self._event: str = event
+        self._maxsize: int = maxsize
+        self._overflow: Overflow = overflow
+        self._error: Optional[PyeeError] = None
+        self._closed: bool = False
+
+    def _attach(self) -> None:
+        emitter = self._emitter
+        with emitter._lock:
+            streams = emitter._streams.get(self._event)
+            if streams is None:
+                streams = emitter._streams[self._event] = WeakSet()
+            streams.add(self)
+        # Held weakly, so that the listener goes away with a stream which is
+        # dropped without being closed
+        emitter.add_listener(self._event, self._put, weak=True)
+
+    def _detach(self) -> None:
+        self._closed = True
+        emitter = self._emitter
+        with emitter._lock:
+            streams = emitter._streams.get(self._event)
+            if streams is not None:
+                streams.discard(self)
+                if not streams:
+                    del emitter._streams[self._event]
+        # Does nothing if the listener was already removed, such as by
+        # `remove_all_listeners`
+        emitter.remove_listener(self._event, self._put)
+
+    def _reject(self, exc: PyeeError) -> None:
+        """Fail with `exc` once the events which were buffered have been
+        read, since the stream's listener was removed.
+        """
+        if not self._closed:
+            self._error = exc
+            self._detach()
+
+    @abstractmethod
+    def _put(self, *args: Any) -> None: ...
+
+    def _full(self, size: int) -> None:
+        # Stop listening, and fail once the events which were buffered have
+        # been read
+        self._error = QueueFullError(f"Too many events are waiting to be read ({size})")
+        self._detach()
+
+    @abstractmethod
+    async def get(self) -> Any:
+        """Wait for, and return, the next event. Raises `StopAsyncIteration`
+        once the stream is closed.
+        """
+
+    @abstractmethod
+    async def get_batch(self, max_items: int) -> List[Any]:
+        """Wait for at least one event, and return up to `max_items` of the
+        events which are waiting. Raises `StopAsyncIteration` once the stream
+        is closed.
+        """
+
+    async def batches(self, max_items: int) -> AsyncIterator[List[Any]]:
+        """Iterate over batches of up to `max_items` events, as returned by
+        `get_batch`, until the stream is closed.
+        """
+        while True:
+            try:
+                batch = await self.get_batch(max_items)
+            except StopAsyncIteration:
+                return
+            yield batch
+
+    @abstractmethod
+    def close(self) -> None:
+        """Stop listening for events, and throw away any which haven't been
+        read.
+        """
+
+    async def aclose(self) -> None:
+        self.close()
+
+    def __aiter__(self) -> "_EventStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self.get()
+
+    async def __aenter__(self) -> "_EventStream":
+        return self
+
+    async def __aexit__(
+        self,
+        type: Optional[Type[BaseException]],
+        value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
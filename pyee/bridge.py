@@ -0,0 +1,568 @@
+# -*- coding: utf-8 -*-
+
+"""
+A bridge between event emitters in different processes, over a
+`multiprocessing` connection. Events emitted on one side are emitted on the
+other, without a message broker:
+
+```py
+from multiprocessing import Pipe, Process
+
+from pyee import EventEmitter
+from pyee.bridge import Bridge
+
+def worker(conn):
+    ee = EventEmitter()
+    with Bridge(ee, conn, ['pong']):
+        ee.on('ping', lambda n: ee.emit('pong', n))
+        ...
+
+ee = EventEmitter()
+ours, theirs = Pipe()
+Process(target=worker, args=(theirs,)).start()
+
+with Bridge(ee, ours, ['ping']):
+    ee.on('pong', print)
+    ee.emit('ping', 1)
+```
+
+Processes which don't share a parent may connect over a Unix domain socket
+with `multiprocessing.connection.Listener` and `Client`, using the
+`AF_UNIX` family.
+
+For a high rate of events with fixed-size arguments, such as ticks or
+metrics samples, a `SharedRing` passes them through shared memory instead.
+"""
+
+from collections import deque
+from itertools import islice
+from multiprocessing import BufferTooShort, Pipe
+from multiprocessing.connection import Connection, wait
+from multiprocessing.shared_memory import SharedMemory
+import pickle
+from struct import Struct
+from threading import Condition, current_thread, local, Thread
+from time import monotonic, sleep
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from pyee.base import EventEmitter, PyeeError
+from pyee.executor import _attach
+
+Self = Any
+
+__all__ = ["Bridge", "SharedRing"]
+
+
+# Each batch sent over the connection is a run of frames, each of which is
+# the length of the event's name, the length of its pickled arguments, and
+# then the two of them
+_HEADER = Struct("!HI")
+
+
+class Bridge:
+    """Bridges an `emitter` to an emitter in another process, over `conn`,
+    either end of a `multiprocessing.Pipe` or a connection from a
+    `multiprocessing.connection.Listener` or `Client`.
+
+    Emits of `events` are sent to the other side, and events received from
+    the other side are emitted on `emitter`. Arguments are pickled by the
+    thread emitting them, so emitting unpicklable arguments raises straight
+    away. Events received from the other side aren't sent back, including
+    when handlers emit the same event again while it's being delivered.
+
+    Events are written by a background thread, which sends every event
+    queued while it was busy as a single batch of up to `max_batch_bytes`,
+    so that a burst of emits only costs a few writes. Another background
+    thread reads batches into a reused buffer and emits each event straight
+    out of it. It calls `emitter.emit` itself unless `deliver` is given, in
+    which case it calls `deliver(f, *args)` to have `f(*args)` called
+    instead. For an `AsyncIOEventEmitter`, for instance, pass the loop's
+    `call_soon_threadsafe`. Exceptions raised while delivering an event are
+    emitted on `emitter`'s `error` event.
+
+    The bridge takes ownership of `conn`, and closes it when the bridge is
+    closed, either explicitly, by exiting it as a context manager, or when
+    the other side closes. Events which were already emitted are sent
+    before it closes.
+    """
+
+    def __init__(
+        self: Self,
+        emitter: EventEmitter,
+        conn: Connection,
+        events: Iterable[str] = (),
+        *,
+        deliver: Optional[Callable[..., Any]] = None,
+        max_batch_bytes: int = 1 << 20,
+    ) -> None:
+        self._emitter: EventEmitter = emitter
+        self._conn: Connection = conn
+        self._deliver: Optional[Callable[..., Any]] = deliver
+        self._max_batch_bytes: int = max_batch_bytes
+
+        self._outbox: Deque[bytes] = deque()
+        self._cond: Condition = Condition()
+        self._closed: bool = False
+        # The event being delivered by each thread, which isn't sent back
+        self._delivering: local = local()
+        # Written to when closing, to wake the reader up
+        self._wake_reader, self._waker = Pipe(duplex=False)
+
+        self._forwarders: Dict[str, Callable[..., None]] = dict()
+        for event in events:
+            self._forwarders[event] = self._forwarder(event)
+            emitter.add_listener(event, self._forwarders[event])
+
+        self._writer: Thread = Thread(
+            target=self._write, name="pyee-bridge-writer", daemon=True
+        )
+        self._reader: Thread = Thread(
+            target=self._read, name="pyee-bridge-reader", daemon=True
+        )
+        self._writer.start()
+        self._reader.start()
+
+    def _forwarder(self: Self, event: str) -> Callable[..., None]:
+        name = event.encode("utf-8")
+
+        def forward(*args: Any, **kwargs: Any) -> None:
+            if getattr(self._delivering, "event", None) == event:
+                return
+            payload = pickle.dumps(
+                (args, kwargs or None), protocol=pickle.HIGHEST_PROTOCOL
+            )
+            frame = b"".join((_HEADER.pack(len(name), len(payload)), name, payload))
+            with self._cond:
+                if self._closed:
+                    return
+                self._outbox.append(frame)
+                if len(self._outbox) == 1:
+                    self._cond.notify()
+
+        return forward
+
+    def _write(self: Self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while not self._outbox and not self._closed:
+                        self._cond.wait()
+                    if not self._outbox:
+                        return
+                    frames: List[bytes] = []
+                    size = 0
+                    while self._outbox and (
+                        not frames
+                        or size + len(self._outbox[0]) <= self._max_batch_bytes
+                    ):
+                        frame = self._outbox.popleft()
+                        frames.append(frame)
+                        size += len(frame)
+                self._conn.send_bytes(b"".join(frames))
+        except OSError:
+            # The other side has gone away
+            self.close()
+
+    def _read(self: Self) -> None:
+        buffer = bytearray(1 << 16)
+        try:
+            while True:
+                ready = wait([self._conn, self._wake_reader])
+                if self._wake_reader in ready:
+                    return
+                try:
+                    n = self._conn.recv_bytes_into(buffer)
+                except BufferTooShort as exc:
+                    # The whole batch comes with the exception, and the buffer
+                    # grows to fit batches that size from now on
+                    batch = exc.args[0]
+                    buffer = bytearray(len(batch))
+                    self._receive(batch, len(batch))
+                else:
+                    self._receive(buffer, n)
+        except (EOFError, OSError):
+            pass
+        finally:
+            self.close()
+
+    def _receive(self: Self, batch: Any, n: int) -> None:
+        with memoryview(batch) as view:
+            offset = 0
+            while offset < n:
+                name_size, payload_size = _HEADER.unpack_from(view, offset)
+                offset += _HEADER.size
+                event = str(view[offset : offset + name_size], "utf-8")
+                offset += name_size
+                args, kwargs = pickle.loads(view[offset : offset + payload_size])
+                offset += payload_size
+                if self._deliver is None:
+                    self._emit(event, args, kwargs)
+                else:
+                    self._deliver(self._emit, event, args, kwargs)
+
+    def _emit(
+        self: Self, event: str, args: Tuple[Any, ...], kwargs: Optional[Dict[str, Any]]
+    ) -> None:
+        self._delivering.event = event
+        try:
+            self._emitter.emit(event, *args, **(kwargs or {}))
+        except Exception as exc:
+            self._emitter.emit("error", exc)
+        finally:
+            self._delivering.event = None
+
+    @property
+    def closed(self: Self) -> bool:
+        return self._closed
+
+    def close(self: Self) -> None:
+        """Stops sending and receiving events, once the events which were
+        already emitted have been sent, and closes the connection.
+        """
+        with self._cond:
+            closing = not self._closed
+            self._closed = True
+            self._cond.notify()
+
+        this = current_thread()
+        threads = (self._writer, self._reader)
+        if not closing:
+            # Wait for whichever thread is closing the bridge to finish,
+            # unless it's waiting for this one
+            if this not in threads:
+                for thread in threads:
+                    thread.join()
+            return
+
+        for event, forward in self._forwarders.items():
+            self._emitter.remove_listener(event, forward)
+
+        self._waker.send_bytes(b"")
+        for thread in threads:
+            if thread is not this:
+                thread.join()
+        self._conn.close()
+        self._waker.close()
+        self._wake_reader.close()
+
+    def __enter__(self: Self) -> "Bridge":
+        return self
+
+    def __exit__(
+        self: Self,
+        type: Optional[Type[BaseException]],
+        value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> Optional[bool]:
+        self.close()
+        return None
+
+
+# A shared ring's segment starts with the number of records written and the
+# number read, on cache lines of their own so that the writer and the reader
+# don't contend for them, and then the ring's shape. Records start after it.
+# Overwriting rings also count the records which have started being written,
+# and the reader marks the ring once it stops reading.
+_COUNT = Struct("=Q")
+_HEAD = 0
+_WRITING = 8
+_TAIL = 64
+_READER_CLOSED = 72
+_MAX_FORMAT = 55
+_SHAPE = Struct(f"=IIB{_MAX_FORMAT}s")
+_SHAPE_OFFSET = 128
+_RECORDS = 192
+
+
+class SharedRing:
+    """A ring of fixed-size records in shared memory, for a high rate of
+    events from a single writing process to a single reading process on
+    the same host.
+
+    Each record is packed with the `struct` format `record`, so events are
+    emitted with fixed-size arguments such as numbers, which are written
+    straight into shared memory rather than being pickled and sent over a
+    pipe:
+
+    ```py
+    # In the writing process
+    ring = SharedRing(create=True, record='dq', capacity=1 << 16)
+    ring.forward(ee, 'tick')
+    ee.emit('tick', 1.5, 1000)
+
+    # In the reading process, with the writer's ring.name
+    ring = SharedRing(name)
+    ring.deliver(ee, 'tick')
+    ```
+
+    A ring is created with `create=True`, and attached to from another
+    process by its `name`, the name of its `SharedMemory` segment. The
+    creating process should `unlink` it once it's no longer needed.
+
+    By default, a ring is lossless, and writing to a full ring waits for
+    the reader to catch up. If the reader has closed the ring, a `PyeeError`
+    is raised instead, and if `timeout` is given and the reader hasn't made
+    room within that many seconds, a `TimeoutError`. With `overwrite=True`,
+    the writer never waits, and instead overwrites the oldest records, which
+    the reader then skips and counts in `dropped`.
+
+    `forward` writes the emits of an event to the ring, and `deliver` starts
+    a thread which reads them and emits them on another emitter, a batch of
+    up to `max_batch` records at a time with `emit_many`. Exceptions raised
+    while emitting them are emitted on the emitter's `error` event. Records
+    can also be written and read directly with `write`, `write_many` and
+    `read`. A ring must have a single writer and a single reader.
+    """
+
+    def __init__(
+        self: Self,
+        name: Optional[str] = None,
+        create: bool = False,
+        record: str = "",
+        capacity: int = 1 << 16,
+        overwrite: bool = False,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if create:
+            if not record:
+                raise PyeeError("A record format is needed to create a ring")
+            if len(record.encode("ascii")) > _MAX_FORMAT:
+                raise ValueError(
+                    f"Record formats may be at most {_MAX_FORMAT} characters long"
+                )
+            layout = Struct(record)
+            self._shm: SharedMemory = SharedMemory(
+                name, create=True, size=_RECORDS + capacity * layout.size
+            )
+            _SHAPE.pack_into(
+                cast(memoryview, self._shm.buf),
+                _SHAPE_OFFSET,
+                capacity,
+                layout.size,
+                overwrite,
+                record.encode("ascii"),
+            )
+        else:
+            if name is None:
+                raise PyeeError("A name is needed to attach to a ring")
+            self._shm = _attach(name)
+            capacity, _, overwrite, fmt = _SHAPE.unpack_from(
+                cast(memoryview, self._shm.buf), _SHAPE_OFFSET
+            )
+            layout = Struct(fmt.rstrip(b"\0").decode("ascii"))
+
+        self._record: Struct = layout
+        self._capacity: int = capacity
+        self._overwrite: bool = bool(overwrite)
+        self._timeout: Optional[float] = timeout
+        self._buf: memoryview = cast(memoryview, self._shm.buf)
+        # The writer's and reader's own copies of the counts, so they only
+        # read the other's from shared memory when they need to
+        self._head: int = _COUNT.unpack_from(self._buf, _HEAD)[0]
+        self._tail: int = _COUNT.unpack_from(self._buf, _TAIL)[0]
+        self.dropped: int = 0
+        # Whether this is the reading side
+        self._reading: bool = False
+
+        self._forwarded: Optional[Tuple[EventEmitter, str]] = None
+        self._reader: Optional[Thread] = None
+        self._closed: bool = False
+
+    @property
+    def name(self: Self) -> str:
+        return self._shm.name
+
+    def _reserve(self: Self, n: int) -> int:
+        """Waits until there's room for up to `n` records, and returns how
+        many there's room for.
+        """
+        if self._overwrite:
+            return min(n, self._capacity)
+        free = self._capacity - (self._head - self._tail)
+        deadline = None if self._timeout is None else monotonic() + self._timeout
+        while free <= 0:
+            self._tail = _COUNT.unpack_from(self._buf, _TAIL)[0]
+            free = self._capacity - (self._head - self._tail)
+            if free > 0:
+                break
+            if self._closed or _COUNT.unpack_from(self._buf, _READER_CLOSED)[0]:
+                raise PyeeError("The ring is full and closed")
+            if deadline is not None and monotonic() > deadline:
+                raise TimeoutError(
+                    f"The ring's reader made no room within {self._timeout}s"
+                )
+            sleep(0.0001)
+        return min(n, free)
+
+    def write(self: Self, *fields: Any) -> None:
+        """Writes a record, waiting for room if the ring is lossless and
+        full.
+        """
+        head = self._head
+        if self._overwrite:
+            _COUNT.pack_into(self._buf, _WRITING, head + 1)
+        elif head - self._tail >= self._capacity:
+            self._reserve(1)
+        self._record.pack_into(
+            self._buf,
+            _RECORDS + (head % self._capacity) * self._record.size,
+            *fields,
+        )
+        self._head = head + 1
+        _COUNT.pack_into(self._buf, _HEAD, head + 1)
+
+    def write_many(self: Self, records: Iterable[Tuple[Any, ...]]) -> None:
+        """Writes a record for every tuple of fields in `records`, making
+        them visible to the reader a batch at a time.
+        """
+        pack_into = self._record.pack_into
+        size = self._record.size
+        capacity = self._capacity
+        buf = self._buf
+        it = iter(records)
+        while True:
+            batch = list(islice(it, capacity))
+            if not batch:
+                return
+            i = 0
+            while i < len(batch):
+                head = self._head
+                n = self._reserve(len(batch) - i)
+                if self._overwrite:
+                    _COUNT.pack_into(buf, _WRITING, head + n)
+                for j in range(n):
+                    pack_into(
+                        buf, _RECORDS + ((head + j) % capacity) * size, *batch[i + j]
+                    )
+                i += n
+                self._head = head + n
+                _COUNT.pack_into(buf, _HEAD, head + n)
+
+    def read(self: Self, max_records: int = 4096) -> List[Tuple[Any, ...]]:
+        """Returns up to `max_records` of the records which haven't been read
+        yet, oldest first, or an empty list if there aren't any.
+        """
+        self._reading = True
+        head = _COUNT.unpack_from(self._buf, _HEAD)[0]
+        tail = self._tail
+        if head == tail:
+            return []
+
+        capacity = self._capacity
+        if head - tail > capacity:
+            # Only possible when overwriting
+            self.dropped += head - capacity - tail
+            tail = head - capacity
+
+        n = min(head - tail, max_records)
+        size = self._record.size
+        start = tail % capacity
+        first = min(n, capacity - start)
+        buf = self._buf
+        records = list(
+            self._record.iter_unpack(
+                buf[_RECORDS + start * size : _RECORDS + (start + first) * size]
+            )
+        )
+        if first < n:
+            records.extend(
+                self._record.iter_unpack(buf[_RECORDS : _RECORDS + (n - first) * size])
+            )
+
+        if self._overwrite:
+            # Records a whole ring behind any the writer has started on may
+            # have been overwritten while they were being read
+            writing = _COUNT.unpack_from(buf, _WRITING)[0]
+            overwritten = min(writing - capacity - tail, n)
+            if overwritten > 0:
+                del records[:overwritten]
+                self.dropped += overwritten
+
+        self._tail = tail + n
+        _COUNT.pack_into(buf, _TAIL, tail + n)
+        return records
+
+    def forward(self: Self, emitter: EventEmitter, event: str) -> None:
+        """Writes every emit of `event` on `emitter` to the ring, as a
+        record of the arguments it was emitted with, until the ring is
+        closed.
+        """
+        emitter.add_listener(event, self.write)
+        self._forwarded = (emitter, event)
+
+    def deliver(
+        self: Self,
+        emitter: EventEmitter,
+        event: str,
+        max_batch: int = 4096,
+        poll_interval: float = 0.001,
+    ) -> None:
+        """Starts a thread which reads records from the ring until it's
+        closed, and emits each of them as `event` on `emitter` with the
+        record's fields as arguments. When the ring is empty, the thread
+        checks it every `poll_interval` seconds.
+        """
+
+        def run() -> None:
+            while not self._closed:
+                records = self.read(max_batch)
+                if not records:
+                    sleep(poll_interval)
+                    continue
+                try:
+                    emitter.emit_many(event, records)
+                except Exception as exc:
+                    emitter.emit("error", exc)
+
+        self._reading = True
+
+        self._reader = Thread(target=run, name="pyee-ring-reader", daemon=True)
+        self._reader.start()
+
+    def close(self: Self) -> None:
+        """Stops forwarding and delivering events, and detaches from the
+        shared memory segment.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._forwarded is not None:
+            emitter, event = self._forwarded
+            emitter.remove_listener(event, self.write)
+        if self._reader is not None and self._reader is not current_thread():
+            self._reader.join()
+        if self._reading:
+            # So that a writer waiting for room gives up
+            _COUNT.pack_into(self._buf, _READER_CLOSED, 1)
+        del self._buf
+        self._shm.close()
+
+    def unlink(self: Self) -> None:
+        """Destroys the shared memory segment, once every process has closed
+        the ring. Only the creating process should call this.
+        """
+        self._shm.unlink()
+
+    def __enter__(self: Self) -> "SharedRing":
+        return self
+
+    def __exit__(
+        self: Self,
+        type: Optional[Type[BaseException]],
+        value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> Optional[bool]:
+        self.close()
+        return None
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from functools import wraps
-from typing import Any, Callable, Iterator, List, Type, TypeVar
+from types import MethodType
+from typing import Any, Callable, Iterator, List, Optional, overload, Type, TypeVar
 
 from pyee import EventEmitter
 
@@ -52,7 +53,15 @@ def _bind(self: Any, method: Any) -> Any:
 Cls = TypeVar("Cls", bound=Type)
 
 
-def evented(cls: Cls) -> Cls:
+@overload
+def evented(cls: Cls) -> Cls: ...
+
+
+@overload
+def evented(*, weak: bool = False) -> Callable[[Cls], Cls]: ...
+
+
+def evented(cls: Optional[Cls] = None, *, weak: bool = False) -> Any:
     """
     Configure an evented class.
 
@@ -96,7 +105,18 @@ def evented(cls: Cls) -> Cls:
         async def event_handler(self, *args, **kwargs):
             await self.some_async_action(*args, **kwargs)
     ```
+
+    With `@evented(weak=True)`, handlers are attached with `weak=True`, so
+    an event emitter which outlives the object, such as one shared between
+    objects, doesn't keep it alive, and its handlers are removed once it's
+    garbage collected. Otherwise, the event emitter keeps the object alive.
     """
+    if cls is None:
+        return lambda cls: _evented(cls, weak)
+    return _evented(cls, weak)
+
+
+def _evented(cls: Cls, weak: bool) -> Cls:
     handlers: List[Handler] = list(_handlers)
     _handlers.reset()
 
@@ -109,7 +129,10 @@ def evented(cls: Cls) -> Cls:
             self.event_emitter = EventEmitter()
 
         for h in handlers:
-            self.event_emitter.on(h.event, _bind(self, h.method))
+            if weak:
+                self.event_emitter.on(h.event, MethodType(h.method, self), weak=True)
+            else:
+                self.event_emitter.on(h.event, _bind(self, h.method))
 
     cls.__init__ = init
 
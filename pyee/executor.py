@@ -1,14 +1,63 @@
 # -*- coding: utf-8 -*-
 
-from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextvars import copy_context
+from itertools import count
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import pickle
+from threading import Lock, Timer
+from time import monotonic
 from types import TracebackType
-from typing import Any, Callable, Dict, Optional, Tuple, Type
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+from uuid import uuid4
+from weakref import WeakKeyDictionary
 
-from pyee.base import EventEmitter
+from pyee.base import _chunks, _Paced, EventEmitter, PyeeError
 
 Self = Any
 
-__all__ = ["ExecutorEventEmitter"]
+__all__ = ["ExecutorEventEmitter", "ProcessPoolEventEmitter"]
+
+
+def _run_many(
+    funcs: Tuple[Callable, ...], chunk: List[Tuple[Any, ...]]
+) -> List[Exception]:
+    errors: List[Exception] = []
+    for a in chunk:
+        for f in funcs:
+            try:
+                f(*a)
+            except Exception as exc:
+                errors.append(exc)
+    return errors
+
+
+def _run_all(
+    funcs: Tuple[Callable, ...], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> List[Exception]:
+    errors: List[Exception] = []
+    for f in funcs:
+        try:
+            f(*args, **kwargs)
+        except Exception as exc:
+            errors.append(exc)
+    return errors
 
 
 class ExecutorEventEmitter(EventEmitter):
@@ -17,7 +66,8 @@ class ExecutorEventEmitter(EventEmitter):
 
     By default, this class creates a default `ThreadPoolExecutor`, but
     a custom executor may also be passed in explicitly to, for instance,
-    use a `ProcessPoolExecutor` instead.
+    use a `ProcessPoolExecutor` instead. Any other keyword arguments, such as
+    `compiled`, are passed along to `EventEmitter`.
 
     This class runs all emitted events on the configured executor. Errors
     captured by the resulting Future are automatically emitted on the
@@ -40,18 +90,114 @@ class ExecutorEventEmitter(EventEmitter):
     # Underlying executor closed
     ```
 
+    By default, every function attached to an event is submitted to the
+    executor as a job of its own. When `batch` is true, `emit` instead
+    submits a single job which calls each of the event's functions in turn,
+    or, if `batch_size` is given, one job for every `batch_size` functions.
+    This cuts down on traffic through the executor's queue, at the cost of
+    functions in the same job running one after another rather than in
+    parallel. Exceptions raised by the functions are emitted on the `error`
+    event once the job completes:
+
+    ```py
+    ee = ExecutorEventEmitter(batch=True, batch_size=10)
+    ```
+
     Since the function call is scheduled on an executor, emit is always
-    non-blocking.
+    non-blocking. As with asyncio tasks, jobs run in a copy of the
+    `contextvars` context which `emit` was called in, unless the executor is
+    a `ProcessPoolExecutor`.
+
+    Handlers added with `debounce`, `throttle` or `coalesce` keep track of
+    emits on the emitting thread, even with `batch` or `emit_many`, and only
+    their paced calls are submitted to the executor, so a `coalesce` handler
+    with a `max_batch` costs one job per batch rather than one per emit.
+    Their timers fire on a timer thread. `shutdown` makes any calls they
+    have waiting before shutting the executor down.
 
     No effort is made to ensure thread safety, beyond using an executor.
     """
 
-    def __init__(self: Self, executor: Optional[Executor] = None) -> None:
-        super(ExecutorEventEmitter, self).__init__()
+    _can_pace: bool = True
+
+    def __init__(
+        self: Self,
+        executor: Optional[Executor] = None,
+        batch: bool = False,
+        batch_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        super(ExecutorEventEmitter, self).__init__(**kwargs)
         if executor:
             self._executor: Executor = executor
         else:
             self._executor = ThreadPoolExecutor()
+        self._batch: bool = batch
+        self._batch_size: Optional[int] = batch_size
+        # Contexts can't be sent to other processes
+        self._copy_context: bool = not isinstance(self._executor, ProcessPoolExecutor)
+
+    def _submit_job(self: Self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Submit a job to the executor, which runs in a copy of the
+        current context when the executor runs jobs in this process.
+        """
+        if self._copy_context:
+            return self._executor.submit(copy_context().run, fn, *args, **kwargs)
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def _call_handlers(
+        self: Self,
+        event: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> bool:
+        if not self._batch:
+            return super()._call_handlers(event, args, kwargs)
+
+        return self._dispatch(event, self._handlers(event), args, kwargs)
+
+    def _dispatch(
+        self: Self,
+        event: str,
+        funcs: Tuple[Callable, ...],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> bool:
+        if not self._batch:
+            return super()._dispatch(event, funcs, args, kwargs)
+
+        if not funcs:
+            return False
+
+        funcs = self._run_paced(funcs, (args,), kwargs)
+        if not funcs:
+            return True
+
+        size = self._batch_size or len(funcs)
+        for i in range(0, len(funcs), size):
+            future: Future = self._submit_job(
+                _run_all, funcs[i : i + size], args, kwargs
+            )
+            future.add_done_callback(self._job_done)
+
+        return True
+
+    def _run_paced(
+        self: Self,
+        funcs: Tuple[Callable, ...],
+        args: Iterable[Tuple[Any, ...]],
+        kwargs: Dict[str, Any],
+    ) -> Tuple[Callable, ...]:
+        """Calls any paced handlers among `funcs` for each of `args` here,
+        as `_emit_run` does, rather than in a job, and returns the rest.
+        """
+        paced = [f for f in funcs if isinstance(f, _Paced)]
+        if not paced:
+            return funcs
+        for a in args:
+            for f in paced:
+                f(*a, **kwargs)
+        return tuple(f for f in funcs if not isinstance(f, _Paced))
 
     def _emit_run(
         self: Self,
@@ -59,7 +205,12 @@ class ExecutorEventEmitter(EventEmitter):
         args: Tuple[Any, ...],
         kwargs: Dict[str, Any],
     ) -> None:
-        future: Future = self._executor.submit(f, *args, **kwargs)
+        if isinstance(f, _Paced):
+            # Cheap enough to call here, and submits its own calls
+            f(*args, **kwargs)
+            return
+
+        future: Future = self._submit_job(f, *args, **kwargs)
 
         @future.add_done_callback
         def _callback(f: Future) -> None:
@@ -69,9 +220,75 @@ class ExecutorEventEmitter(EventEmitter):
             elif exc is not None:
                 raise exc
 
+    def emit_many(
+        self: Self,
+        event: str,
+        args: Iterable[Tuple[Any, ...]],
+        chunksize: int = 1000,
+    ) -> bool:
+        """Emit `event` once for every tuple of positional arguments in
+        `args`. Returns `True` if any functions are attached to `event`;
+        otherwise returns `False`.
+
+        Rather than submitting a job to the executor for every function and
+        every item, `args` is split into chunks of up to `chunksize` items
+        and a single job is submitted for every chunk. That job calls the
+        attached functions for each item in turn. Exceptions raised by the
+        functions are emitted on the `error` event once the job completes.
+        Paced handlers are passed each item here instead, as with `emit`.
+        """
+        funcs = self._handlers(event)
+
+        if not funcs:
+            return super().emit_many(event, args)
+
+        if self._instrumented:
+            args = list(args)
+            funcs = self._instrument(event, funcs, len(args))
+
+        if any(isinstance(f, _Paced) for f in funcs):
+            args = list(args)
+            funcs = self._run_paced(funcs, args, dict())
+            if not funcs:
+                return True
+
+        for chunk in _chunks(args, chunksize):
+            future: Future = self._submit_job(_run_many, funcs, chunk)
+            future.add_done_callback(self._job_done)
+
+        return True
+
+    def _job_done(self: Self, f: Future) -> None:
+        # Jobs which call several functions return their exceptions
+        exc: Optional[BaseException] = f.exception()
+        if isinstance(exc, Exception):
+            self.emit("error", exc)
+        elif exc is not None:
+            raise exc
+        else:
+            for error in f.result():
+                self.emit("error", error)
+
+    def _timer_hooks(
+        self: Self,
+    ) -> Tuple[
+        Callable[[], float],
+        Callable[[float, Callable[[], None]], Callable[[], None]],
+    ]:
+        def call_at(when: float, f: Callable[[], None]) -> Callable[[], None]:
+            timer = Timer(max(0.0, when - monotonic()), f)
+            timer.daemon = True
+            timer.start()
+            return timer.cancel
+
+        return monotonic, call_at
+
     def shutdown(self: Self, wait: bool = True) -> None:
-        """Call `shutdown` on the internal executor."""
+        """Call `shutdown` on the internal executor, after submitting any
+        calls which paced handlers have waiting.
+        """
 
+        self._flush_paced()
         self._executor.shutdown(wait=wait)
 
     def __enter__(self: Self) -> "ExecutorEventEmitter":
@@ -82,3 +299,438 @@ class ExecutorEventEmitter(EventEmitter):
     ) -> Optional[bool]:
         self.shutdown()
         return None
+
+
+# A reference to a handler which a worker process can call: a stable ID, and
+# the handler pickled when it was attached
+HandlerRef = Tuple[str, bytes]
+
+# A batch of handler calls sent to worker processes: the IDs of the handlers
+# to call, and the arguments to call them with
+Calls = List[Tuple[Tuple[str, ...], Tuple[Any, ...], Dict[str, Any]]]
+
+# The most handlers a worker process keeps unpickled at once
+_MAX_WORKER_HANDLERS = 1024
+
+# Handlers unpickled by this (worker) process, by ID
+_worker_handlers: Dict[str, Callable] = dict()
+
+
+def _load_handler(ref: HandlerRef) -> Callable:
+    id, data = ref
+    f = _worker_handlers.get(id)
+    if f is None:
+        if len(_worker_handlers) >= _MAX_WORKER_HANDLERS:
+            del _worker_handlers[next(iter(_worker_handlers))]
+        f = _worker_handlers[id] = pickle.loads(data)
+    return f
+
+
+def _attach(name: str) -> SharedMemory:
+    try:
+        return SharedMemory(name, track=False)  # type: ignore
+    except TypeError:
+        # Before Python 3.13, attaching always registers the segment with
+        # the resource tracker. Worker processes share the emitting
+        # process's tracker, where it's already registered.
+        return SharedMemory(name)
+
+
+def _run_remote(
+    refs: Tuple[HandlerRef, ...],
+    data: bytes,
+    name: Optional[str],
+    sizes: List[int],
+) -> List[Exception]:
+    funcs = {ref[0]: _load_handler(ref) for ref in refs}
+    shm = _attach(name) if name is not None else None
+    errors: List[Exception] = []
+
+    try:
+        buffers: List[memoryview] = []
+        if shm is not None:
+            buf = cast(memoryview, shm.buf)
+            offset = 0
+            for size in sizes:
+                buffers.append(buf[offset : offset + size])
+                offset += size
+
+        calls: Calls = pickle.loads(data, buffers=buffers)
+        for ids, args, kwargs in calls:
+            for id in ids:
+                f = funcs.get(id)
+                if f is None:
+                    continue
+                try:
+                    f(*args, **kwargs)
+                except Exception as exc:
+                    # The traceback would keep views of shared memory alive,
+                    # and isn't sent back to the emitter anyway
+                    errors.append(exc.with_traceback(None))
+    finally:
+        if shm is not None:
+            buffers = calls = args = kwargs = buf = None  # type: ignore
+            try:
+                shm.close()
+            except BufferError:
+                # A handler kept hold of an argument backed by shared
+                # memory, so leave it mapped until that's collected
+                pass
+
+    return errors
+
+
+class _Remote:
+    """How a handler attached to a `ProcessPoolEventEmitter` is called in
+    worker processes. `once` holds the event and function for handlers added
+    with `once`, which are removed in the emitting process before they're
+    sent to a worker.
+    """
+
+    __slots__ = ("ref", "once")
+
+    def __init__(self, ref: HandlerRef, once: Optional[Tuple[str, Callable]]) -> None:
+        self.ref: HandlerRef = ref
+        self.once: Optional[Tuple[str, Callable]] = once
+
+
+class _Shared:
+    """Wraps a bytes-like argument so that it's pickled out-of-band, and
+    may be passed to worker processes through shared memory.
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj: Any = obj
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        buf = pickle.PickleBuffer(self.obj)
+        if isinstance(self.obj, memoryview):
+            return (_view, (buf, self.obj.format, self.obj.shape))
+        return (type(self.obj), (buf,))
+
+
+def _view(buf: memoryview, format: str, shape: Tuple[int, ...]) -> memoryview:
+    return memoryview(buf).cast("B").cast(cast(Any, format), shape)
+
+
+class _Segment:
+    """A shared memory segment holding the large arguments for an emit,
+    which is unlinked once every job reading from it is done.
+    """
+
+    __slots__ = ("shm", "jobs", "lock")
+
+    def __init__(self, shm: SharedMemory, jobs: int) -> None:
+        self.shm: SharedMemory = shm
+        self.jobs: int = jobs
+        self.lock: Lock = Lock()
+
+    def done(self, f: Optional[Future] = None) -> None:
+        with self.lock:
+            self.jobs -= 1
+            if self.jobs:
+                return
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ProcessPoolEventEmitter(ExecutorEventEmitter):
+    """An event emitter class which runs handlers in worker processes, using
+    a `concurrent.futures.ProcessPoolExecutor`, so that CPU-bound handlers
+    may run in parallel across cores. For example:
+
+    ```py
+    # Handlers need to be importable by worker processes
+    def resize(image, width):
+        ...
+
+    with ProcessPoolEventEmitter() as ee:
+        ee.on('upload', resize)
+        ee.emit('upload', image_bytes, width=640)
+    ```
+
+    By default, this class creates a default `ProcessPoolExecutor`, but a
+    configured executor may also be passed in explicitly.
+
+    Handlers are pickled once, when they're attached, and a handler which
+    can't be pickled - such as a local function - fails to attach. Each
+    worker process unpickles a handler the first time it runs it and then
+    keeps it by its ID, so emitting only has to pickle the arguments. Note
+    that this means a bound method is called on a copy of its object, as it
+    was when the method was attached.
+
+    Arguments at least `shared_memory_threshold` bytes in size are passed to
+    worker processes through `multiprocessing.shared_memory` rather than
+    being pickled. This applies to `bytes` and contiguous `memoryview`
+    arguments, and to any objects which support out-of-band pickling, such
+    as `bytearray`s and NumPy arrays. Worker processes get `bytes` as a copy
+    and `memoryview`s and NumPy arrays backed by shared memory, which
+    handlers shouldn't keep hold of after they return. Set
+    `shared_memory_threshold` to `None` to pickle all arguments.
+
+    Since workers call copies of handlers, handlers can't be attached with
+    `weak=True`. Handlers added with `once` are removed in the emitting
+    process, before they're sent to a worker. Handlers for special events,
+    such as `error` and `new_listener`, aren't sent to workers, and are
+    instead called directly by the thread emitting them, so they don't need
+    to be pickled. As with `ExecutorEventEmitter`, `batch` and `batch_size` control how
+    many handlers are called by each job, and exceptions raised by handlers
+    are emitted on the `error` event. Any other keyword arguments are passed
+    along to `EventEmitter`.
+
+    Collectors attached with `add_collector` are only told about emits, as
+    handlers run in other processes aren't timed.
+    """
+
+    _can_pace: bool = False
+
+    def __init__(
+        self: Self,
+        executor: Optional[ProcessPoolExecutor] = None,
+        shared_memory_threshold: Optional[int] = 1 << 20,
+        **kwargs: Any,
+    ) -> None:
+        # Start the resource tracker before any worker processes, so that they
+        # share it rather than each starting their own, which would warn
+        # about leaked shared memory when they exit
+        if shared_memory_threshold is not None:
+            resource_tracker.ensure_running()
+        super(ProcessPoolEventEmitter, self).__init__(
+            executor or ProcessPoolExecutor(), **kwargs
+        )
+        self._shared_memory_threshold: Optional[int] = shared_memory_threshold
+        self._token: str = uuid4().hex
+        self._ids = count()
+        # How to call each attached handler in a worker, kept for as long as
+        # the handler is attached
+        self._remotes: "WeakKeyDictionary[Callable, _Remote]" = WeakKeyDictionary()
+
+    def _add_event_handler(
+        self: Self,
+        event: str,
+        k: Callable,
+        v: Callable,
+        priority: int = 0,
+        prepend: bool = False,
+        weak: bool = False,
+    ):
+        if weak:
+            raise PyeeError(
+                "Handlers sent to worker processes are copies, so they can't "
+                "be held weakly"
+            )
+        if event not in self._special_events:
+            remote = self._remote(k, (event, k) if v is not k else None)
+            try:
+                self._remotes[v] = remote
+            except TypeError:
+                # Can't be weakly referenced, such as a builtin function, so
+                # it's pickled again whenever it's emitted
+                pass
+        super(ProcessPoolEventEmitter, self)._add_event_handler(
+            event, k, v, priority, prepend
+        )
+
+    def _timer_hooks(
+        self: Self,
+    ) -> Tuple[
+        Callable[[], float],
+        Callable[[float, Callable[[], None]], Callable[[], None]],
+    ]:
+        raise PyeeError(
+            "Handlers run in worker processes are called for every emit, so "
+            "they can't be paced"
+        )
+
+    def _remote(
+        self: Self, f: Callable, once: Optional[Tuple[str, Callable]] = None
+    ) -> _Remote:
+        id = f"{self._token}:{next(self._ids)}"
+        return _Remote((id, pickle.dumps(f, protocol=5)), once)
+
+    def _instrument(
+        self: Self, event: str, funcs: Tuple[Callable, ...], n: int = 1
+    ) -> Tuple[Callable, ...]:
+        # Handlers run in other processes, where collectors can't follow
+        # them, so only emits are recorded
+        for collector in self._collectors:
+            collector.record_emit(self, event, n)
+        return funcs
+
+    def _claim(self: Self, funcs: Tuple[Callable, ...]) -> List[_Remote]:
+        """Returns how to call `funcs` in worker processes, removing any
+        `once` handlers first. `once` handlers which have already been
+        removed are skipped.
+        """
+        remotes: List[_Remote] = []
+        for f in funcs:
+            try:
+                remote = self._remotes.get(f)
+            except TypeError:
+                remote = None
+            if remote is None:
+                remote = self._remote(f)
+            elif remote.once is not None:
+                event, k = remote.once
+                with self._lock:
+                    if event in self._events and k in self._events[event]:
+                        self._remove_listener(event, k)
+                    else:
+                        continue
+                if self._heard("remove_listener"):
+                    self.emit("remove_listener", event, k)
+            remotes.append(remote)
+        return remotes
+
+    def _call_handlers(
+        self: Self,
+        event: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> bool:
+        return self._dispatch(event, self._handlers(event), args, kwargs)
+
+    def _dispatch(
+        self: Self,
+        event: str,
+        funcs: Tuple[Callable, ...],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> bool:
+        if not funcs:
+            return False
+
+        if event in self._special_events:
+            for f in funcs:
+                f(*args, **kwargs)
+            return True
+
+        refs = [remote.ref for remote in self._claim(funcs)]
+        if refs:
+            ids = tuple(id for id, _ in refs)
+            self._submit(refs, [(ids, args, kwargs)])
+        return True
+
+    def _submit(self: Self, refs: List[HandlerRef], calls: Calls) -> None:
+        """Submit jobs calling the handlers in `refs` according to `calls`,
+        with as many handlers in each job as the emitter batches.
+        """
+        data, segment, sizes = self._dump(calls)
+        size = (self._batch_size or len(refs)) if self._batch else 1
+        jobs = range(0, len(refs), size)
+        if segment is not None:
+            segment.jobs = len(jobs)
+        name = segment.shm.name if segment is not None else None
+
+        for n, i in enumerate(jobs):
+            try:
+                future: Future = self._executor.submit(
+                    _run_remote, tuple(refs[i : i + size]), data, name, sizes
+                )
+            except BaseException:
+                if segment is not None:
+                    for _ in range(n, len(jobs)):
+                        segment.done()
+                raise
+            if segment is not None:
+                future.add_done_callback(segment.done)
+            future.add_done_callback(self._job_done)
+
+    def _dump(self: Self, calls: Calls) -> Tuple[bytes, Optional[_Segment], List[int]]:
+        """Pickle `calls`, copying any large buffers into a shared memory
+        segment.
+        """
+        threshold = self._shared_memory_threshold
+        if threshold is None:
+            return pickle.dumps(calls, protocol=5), None, []
+
+        def shared(arg: Any) -> Any:
+            if isinstance(arg, bytes):
+                size = len(arg)
+            elif isinstance(arg, memoryview) and arg.contiguous:
+                size = arg.nbytes
+            else:
+                return arg
+            return _Shared(arg) if size >= threshold else arg
+
+        calls = [
+            (
+                ids,
+                tuple(shared(arg) for arg in args),
+                {key: shared(arg) for key, arg in kwargs.items()},
+            )
+            for ids, args, kwargs in calls
+        ]
+
+        buffers: List[memoryview] = []
+
+        def buffer_callback(buf: pickle.PickleBuffer) -> bool:
+            raw = buf.raw()
+            if raw.nbytes < threshold:
+                return True
+            buffers.append(raw)
+            return False
+
+        data = pickle.dumps(calls, protocol=5, buffer_callback=buffer_callback)
+        if not buffers:
+            return data, None, []
+
+        sizes = [raw.nbytes for raw in buffers]
+        shm = SharedMemory(create=True, size=sum(sizes))
+        buf = cast(memoryview, shm.buf)
+        offset = 0
+        for raw in buffers:
+            buf[offset : offset + raw.nbytes] = raw
+            offset += raw.nbytes
+        return data, _Segment(shm, 1), sizes
+
+    def emit_many(
+        self: Self,
+        event: str,
+        args: Iterable[Tuple[Any, ...]],
+        chunksize: int = 1000,
+    ) -> bool:
+        """Emit `event` once for every tuple of positional arguments in
+        `args`. Returns `True` if any functions are attached to `event`;
+        otherwise returns `False`.
+
+        As with `ExecutorEventEmitter#emit_many`, `args` is split into chunks
+        of up to `chunksize` items, and the calls for each chunk are sent to
+        worker processes together.
+        """
+        funcs = self._handlers(event)
+
+        if not funcs:
+            return super(ProcessPoolEventEmitter, self).emit_many(event, args)
+
+        if event in self._special_events:
+            for a in args:
+                self.emit(event, *a)
+            return True
+
+        if self._instrumented:
+            args = list(args)
+            self._instrument(event, (), len(args))
+
+        remotes = self._claim(funcs)
+        refs = [remote.ref for remote in remotes]
+        ids = tuple(id for id, _ in refs)
+
+        # `once` handlers are only called for the first item
+        rest = [remote.ref for remote in remotes if remote.once is None]
+        rest_ids = tuple(id for id, _ in rest)
+
+        for chunk in _chunks(args, chunksize):
+            if refs:
+                calls: Calls = [(ids, chunk[0], {})]
+                calls.extend((rest_ids, a, {}) for a in chunk[1:])
+                self._submit(refs, calls)
+                refs, ids = rest, rest_ids
+            elif rest:
+                self._submit(rest, [(rest_ids, a, {}) for a in chunk])
+            else:
+                break
+
+        return True
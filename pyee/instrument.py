@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+"""
+Collectors for instrumenting event emitters. A collector is attached to an
+emitter with `EventEmitter#add_collector`, and is then told about every
+emit, how long each handler took to run and how long handlers waited to
+start:
+
+```py
+from pyee import EventEmitter
+from pyee.instrument import Stats
+
+stats = Stats()
+ee = EventEmitter()
+ee.add_collector(stats)
+
+ee.emit('data', '00101001')
+
+print(stats.emits['data'])
+for run in stats.slowest():
+    print(run.event, run.handler, run.seconds)
+```
+
+Emitters may also be traced with an OpenTelemetry tracer, or anything
+with a compatible `start_as_current_span` method, set with
+`EventEmitter#set_tracer`.
+
+Emitters with no collectors attached and no tracer don't pay for
+instrumentation beyond checking whether there are any.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from heapq import heappush, heappushpop
+from itertools import count
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from pyee.base import EventEmitter
+
+__all__ = ["Collector", "Histogram", "SlowRun", "Stats", "Tracer"]
+
+
+def handler_name(handler: Callable) -> str:
+    """A readable name for a handler, such as `app.views.on_data`."""
+    module = getattr(handler, "__module__", None)
+    name = getattr(handler, "__qualname__", None)
+    if name is None:
+        return repr(handler)
+    return f"{module}.{name}" if module else name
+
+
+class Tracer(Protocol):
+    """The part of OpenTelemetry's `Tracer` API which emitters use to trace
+    emits and handlers, as set with `EventEmitter#set_tracer`. pyee doesn't
+    depend on OpenTelemetry, so any object with a compatible
+    `start_as_current_span` method may be used instead.
+    """
+
+    def start_as_current_span(
+        self, name: str, *, attributes: Optional[Mapping[str, Any]] = None
+    ) -> ContextManager[Any]:
+        """Returns a context manager which starts a span as a child of the
+        current one, makes it current until it exits, and then ends it.
+        """
+        ...
+
+
+class Collector:
+    """The base class for collectors. Every method does nothing by default,
+    so collectors only need to override the ones they're interested in.
+
+    Collectors are called by whichever thread emits, runs or completes a
+    handler, so they need to be thread safe, and should be quick.
+    """
+
+    def record_emit(self, emitter: "EventEmitter", event: str, n: int) -> None:
+        """Called when `event` is emitted `n` times. `n` is only ever more
+        than 1 for `emit_many`.
+        """
+
+    def record_wait(
+        self, emitter: "EventEmitter", event: str, handler: Callable, seconds: float
+    ) -> None:
+        """Called when a handler which was scheduled rather than called
+        straight away, such as on an executor or an event loop, starts
+        running, with how long it waited.
+        """
+
+    def record_handler(
+        self,
+        emitter: "EventEmitter",
+        event: str,
+        handler: Callable,
+        seconds: float,
+        error: Optional[BaseException],
+    ) -> None:
+        """Called when a handler completes, with how long it took to run
+        (for coroutines, futures and deferreds, until they completed) and
+        the exception it raised, if any.
+        """
+
+    def record_batch(
+        self, emitter: "EventEmitter", event: str, handler: Callable, n: int
+    ) -> None:
+        """Called when a handler added with `coalesce` is passed a batch of
+        `n` buffered emits.
+        """
+
+
+class Histogram:
+    """A histogram of durations, in buckets which double in size from one
+    microsecond up to about a minute.
+    """
+
+    # Upper bounds of each bucket, in seconds. Anything longer goes in a
+    # final, unbounded bucket.
+    bounds: Tuple[float, ...] = tuple(1e-6 * 2**i for i in range(27))
+
+    __slots__ = ("counts", "n", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.n: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        i = 0
+        # Doubling buckets, so this is at most a couple of dozen comparisons
+        while i < len(self.bounds) and seconds > self.bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.n += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+    def percentile(self, q: float) -> float:
+        """An upper bound on the `q`th percentile (0-100), from the bucket
+        it falls in.
+        """
+        target = q / 100 * self.n
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return 0.0
+
+
+@dataclass(frozen=True)
+class SlowRun:
+    """A single slow run of a handler."""
+
+    seconds: float
+    event: str
+    handler: str
+    error: Optional[BaseException] = None
+
+
+class Stats(Collector):
+    """A collector which counts emits per event, keeps histograms of how
+    long each handler took and of how long handlers waited to start per
+    event, and keeps the `top` slowest handler runs. For handlers added
+    with `coalesce`, it also counts the batches they were passed and the
+    emits in them.
+    """
+
+    def __init__(self, top: int = 10) -> None:
+        self.top: int = top
+        self.emits: "Counter[str]" = Counter()
+        # Keyed by event and handler name, so that handlers aren't kept
+        # alive by the stats
+        self.handlers: Dict[Tuple[str, str], Histogram] = dict()
+        self.waits: Dict[str, Histogram] = dict()
+        self.errors: "Counter[Tuple[str, str]]" = Counter()
+        self.batches: "Counter[Tuple[str, str]]" = Counter()
+        self.batched: "Counter[Tuple[str, str]]" = Counter()
+        self._slowest: List[Tuple[float, int, SlowRun]] = []
+        self._seq = count()
+        self._lock: Lock = Lock()
+
+    def record_emit(self, emitter: "EventEmitter", event: str, n: int) -> None:
+        with self._lock:
+            self.emits[event] += n
+
+    def record_wait(
+        self, emitter: "EventEmitter", event: str, handler: Callable, seconds: float
+    ) -> None:
+        with self._lock:
+            histogram = self.waits.get(event)
+            if histogram is None:
+                histogram = self.waits[event] = Histogram()
+            histogram.add(seconds)
+
+    def record_handler(
+        self,
+        emitter: "EventEmitter",
+        event: str,
+        handler: Callable,
+        seconds: float,
+        error: Optional[BaseException],
+    ) -> None:
+        key = (event, handler_name(handler))
+        with self._lock:
+            histogram = self.handlers.get(key)
+            if histogram is None:
+                histogram = self.handlers[key] = Histogram()
+            histogram.add(seconds)
+            if error is not None:
+                self.errors[key] += 1
+
+            if not self.top:
+                return
+            # A min-heap of the slowest runs, so the fastest of them is the
+            # one to go when a slower run comes along
+            if len(self._slowest) < self.top or seconds > self._slowest[0][0]:
+                entry = (seconds, next(self._seq), SlowRun(seconds, *key, error))
+                if len(self._slowest) < self.top:
+                    heappush(self._slowest, entry)
+                else:
+                    heappushpop(self._slowest, entry)
+
+    def record_batch(
+        self, emitter: "EventEmitter", event: str, handler: Callable, n: int
+    ) -> None:
+        key = (event, handler_name(handler))
+        with self._lock:
+            self.batches[key] += 1
+            self.batched[key] += n
+
+    def slowest(self) -> List[SlowRun]:
+        """Returns the slowest handler runs recorded, slowest first."""
+        with self._lock:
+            return [run for _, _, run in sorted(self._slowest, reverse=True)]
+
+    def report(self) -> str:
+        """Returns a plain text report of the slowest handler runs and of the
+        handlers which have taken the most time overall.
+        """
+        with self._lock:
+            totals = sorted(
+                self.handlers.items(), key=lambda item: item[1].total, reverse=True
+            )[: self.top]
+        lines = ["Slowest handler runs:"]
+        for run in self.slowest():
+            failed = " (failed)" if run.error is not None else ""
+            lines.append(
+                f"  {run.seconds * 1e3:10.3f}ms  {run.event}  {run.handler}{failed}"
+            )
+        lines.append("Most time spent in handlers:")
+        for (event, handler), histogram in totals:
+            lines.append(
+                f"  {histogram.total * 1e3:10.3f}ms  {event}  {handler}  "
+                f"({histogram.n} runs, p99 <= {histogram.percentile(99) * 1e3:.3f}ms)"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.emits.clear()
+            self.handlers.clear()
+            self.waits.clear()
+            self.errors.clear()
+            self.batches.clear()
+            self.batched.clear()
+            self._slowest.clear()
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from inspect import isawaitable
+from math import inf
 from types import TracebackType
 from typing import (
     Any,
@@ -9,6 +11,7 @@ from typing import (
     Callable,
     cast,
     Dict,
+    List,
     Optional,
     Tuple,
     Type,
@@ -16,16 +19,25 @@ from typing import (
 
 import trio
 
-from pyee.base import EventEmitter, PyeeError
+from pyee.base import _event_value, _EventStream, EventEmitter, Overflow, PyeeError
 
 Self = Any
 
-__all__ = ["TrioEventEmitter"]
+__all__ = ["TrioEventEmitter", "TrioEventStream"]
 
 
 Nursery = trio.Nursery
 
 
+class _Rejected:
+    """An exception raised by a `wait_for` predicate, so that it can be told
+    apart from an event's value.
+    """
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc: BaseException = exc
+
+
 class TrioEventEmitter(EventEmitter):
     """An event emitter class which can run trio tasks in a trio nursery.
 
@@ -33,7 +45,8 @@ class TrioEventEmitter(EventEmitter):
     object returned from `trio.open_nursery()` and a nursery (the object
     yielded by using the nursery manager as an async context manager). It is
     also possible to supply an existing nursery manager via the `manager`
-    argument, or an existing nursery via the `nursery` argument.
+    argument, or an existing nursery via the `nursery` argument. Any other
+    keyword arguments, such as `compiled`, are passed along to `EventEmitter`.
 
     Instances of TrioEventEmitter are themselves async context managers, so
     that they may manage the lifecycle of the underlying trio nursery. For
@@ -56,17 +69,21 @@ class TrioEventEmitter(EventEmitter):
     important for trio coroutines specifically but is also handled for
     synchronous functions for consistency.
 
-    For trio coroutine event handlers, calling emit is non-blocking. In other
-    words, you should not attempt to await emit; the coroutine is scheduled
-    in a fire-and-forget fashion.
+    Synchronous functions are called by `emit`. For trio coroutine event
+    handlers, calling emit is non-blocking. In other words, you should not
+    attempt to await emit; the coroutine is scheduled in a fire-and-forget
+    fashion.
     """
 
+    _can_pace: bool = True
+
     def __init__(
         self: Self,
         nursery: Optional[Nursery] = None,
         manager: Optional["AbstractAsyncContextManager[trio.Nursery]"] = None,
+        **kwargs: Any,
     ):
-        super(TrioEventEmitter, self).__init__()
+        super(TrioEventEmitter, self).__init__(**kwargs)
         self._nursery: Optional[Nursery] = None
         self._manager: Optional["AbstractAsyncContextManager[trio.Nursery]"] = None
         if nursery:
@@ -82,13 +99,11 @@ class TrioEventEmitter(EventEmitter):
 
     def _async_runner(
         self: Self,
-        f: Callable,
-        args: Tuple[Any, ...],
-        kwargs: Dict[str, Any],
+        awaitable: Awaitable[Any],
     ) -> Callable[[], Awaitable[None]]:
         async def runner() -> None:
             try:
-                await f(*args, **kwargs)
+                await awaitable
             except Exception as exc:
                 self.emit("error", exc)
 
@@ -102,7 +117,91 @@ class TrioEventEmitter(EventEmitter):
     ) -> None:
         if not self._nursery:
             raise PyeeError("Uninitialized trio nursery")
-        self._nursery.start_soon(self._async_runner(f, args, kwargs))
+        try:
+            result: Any = f(*args, **kwargs)
+        except Exception as exc:
+            self.emit("error", exc)
+        else:
+            if isawaitable(result):
+                self._nursery.start_soon(self._async_runner(result))
+
+    def _timer_hooks(
+        self: Self,
+    ) -> Tuple[
+        Callable[[], float],
+        Callable[[float, Callable[[], None]], Callable[[], None]],
+    ]:
+        def call_at(when: float, f: Callable[[], None]) -> Callable[[], None]:
+            if not self._nursery:
+                raise PyeeError("Uninitialized trio nursery")
+            scope = trio.CancelScope(deadline=when)
+            canceled = False
+
+            async def timer() -> None:
+                with scope:
+                    await trio.sleep_forever()
+                if not canceled:
+                    f()
+
+            def cancel() -> None:
+                nonlocal canceled
+                canceled = True
+                scope.cancel()
+
+            self._nursery.start_soon(timer)
+            return cancel
+
+        return trio.current_time, call_at
+
+    def events(
+        self: Self, event: str, *, maxsize: int = 1000, overflow: Overflow = "raise"
+    ) -> "TrioEventStream":
+        """Returns a `TrioEventStream`, an async iterator over the emits of
+        `event` from now on, backed by a trio memory channel:
+
+        ```py
+        async with ee.events('data') as stream:
+            async for data in stream:
+                print(data)
+        ```
+
+        Items, buffering and overflow work the same as for
+        `AsyncIOEventEmitter#events`.
+        """
+        return TrioEventStream(self, event, maxsize, overflow)
+
+    async def wait_for(
+        self: Self,
+        event: str,
+        timeout: Optional[float] = None,
+        predicate: Optional[Callable[..., bool]] = None,
+    ) -> Any:
+        """Waits for the next emit of `event` and returns its value, as for
+        `AsyncIOEventEmitter#wait_for`. If `timeout` seconds pass first,
+        `trio.TooSlowError` is raised.
+        """
+        done = trio.Event()
+        outcome: List[Any] = []
+
+        def settle(value: Any) -> None:
+            if not done.is_set():
+                outcome.append(value)
+                done.set()
+
+        def reject(exc: BaseException) -> None:
+            settle(_Rejected(exc))
+
+        cancel = self._add_waiter(event, settle, reject, predicate)
+        try:
+            with trio.fail_after(inf if timeout is None else timeout):
+                await done.wait()
+        finally:
+            cancel()
+
+        value = outcome[0]
+        if isinstance(value, _Rejected):
+            raise value.exc
+        return value
 
     @asynccontextmanager
     async def context(
@@ -141,3 +240,69 @@ class TrioEventEmitter(EventEmitter):
         self._nursery = None
         self._manager = None
         return rv
+
+
+class TrioEventStream(_EventStream):
+    """An async iterator over the emits of an event, as returned by
+    `TrioEventEmitter#events`, which buffers events in a trio memory channel.
+    As with `AsyncIOEventStream`, events may also be read in batches with
+    `get_batch` and `batches`.
+    """
+
+    def __init__(
+        self: Self,
+        emitter: EventEmitter,
+        event: str,
+        maxsize: int = 1000,
+        overflow: Overflow = "raise",
+    ) -> None:
+        super(TrioEventStream, self).__init__(emitter, event, maxsize, overflow)
+        size = maxsize if maxsize and overflow != "queue" else inf
+        channels = trio.open_memory_channel[Any](size)
+        self._send: trio.MemorySendChannel[Any] = channels[0]
+        self._receive: trio.MemoryReceiveChannel[Any] = channels[1]
+        self._attach()
+
+    def _put(self: Self, *args: Any) -> None:
+        item = _event_value(args)
+        try:
+            self._send.send_nowait(item)
+        except trio.WouldBlock:
+            if self._overflow == "drop_oldest":
+                self._receive.receive_nowait()
+                self._send.send_nowait(item)
+            elif self._overflow == "raise":
+                self._full(self._maxsize)
+        except (trio.ClosedResourceError, trio.BrokenResourceError):
+            pass
+
+    def _detach(self: Self) -> None:
+        super(TrioEventStream, self)._detach()
+        # Readers get the events which were already sent, and then the end of
+        # the channel
+        self._send.close()
+
+    async def get(self: Self) -> Any:
+        try:
+            return await self._receive.receive()
+        except trio.EndOfChannel:
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration()
+        except trio.ClosedResourceError:
+            raise StopAsyncIteration()
+
+    async def get_batch(self: Self, max_items: int) -> List[Any]:
+        batch = [await self.get()]
+        while len(batch) < max_items:
+            try:
+                batch.append(self._receive.receive_nowait())
+            except (trio.WouldBlock, trio.EndOfChannel, trio.ClosedResourceError):
+                break
+        return batch
+
+    def close(self: Self) -> None:
+        self._error = None
+        if not self._closed:
+            self._detach()
+        self._receive.close()
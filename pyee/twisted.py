@@ -4,6 +4,7 @@ from asyncio import iscoroutine
 from typing import Any, Callable, cast, Dict, Optional, Tuple
 
 from twisted.internet.defer import Deferred, ensureDeferred
+from twisted.internet.interfaces import IReactorTime
 from twisted.python.failure import Failure
 
 from pyee.base import EventEmitter, PyeeError
@@ -48,10 +49,41 @@ class TwistedEventEmitter(EventEmitter):
     coroutine is scheduled in a fire-and-forget fashion.
 
     Similar behavior occurs for "sync" functions which return Deferreds.
+
+    Timers, such as for `wait_for` timeouts and paced handlers, are set on
+    `reactor`, which defaults to the global reactor. Other keyword
+    arguments, such as `compiled`, are passed along to `EventEmitter`.
     """
 
-    def __init__(self: Self) -> None:
-        super(TwistedEventEmitter, self).__init__()
+    _can_pace: bool = True
+
+    _special_events = EventEmitter._special_events | {"failure"}
+
+    def __init__(
+        self: Self, reactor: Optional[IReactorTime] = None, **kwargs: Any
+    ) -> None:
+        super(TwistedEventEmitter, self).__init__(**kwargs)
+        self._reactor: Optional[IReactorTime] = reactor
+
+    def _get_reactor(self: Self) -> IReactorTime:
+        if self._reactor is None:
+            from twisted.internet import reactor
+
+            return cast(IReactorTime, reactor)
+        return self._reactor
+
+    def _timer_hooks(
+        self: Self,
+    ) -> Tuple[
+        Callable[[], float],
+        Callable[[float, Callable[[], None]], Callable[[], None]],
+    ]:
+        reactor = self._get_reactor()
+
+        def call_at(when: float, f: Callable[[], None]) -> Callable[[], None]:
+            return reactor.callLater(max(0, when - reactor.seconds()), f).cancel
+
+        return reactor.seconds, call_at
 
     def _emit_run(
         self: Self,
@@ -78,6 +110,35 @@ class TwistedEventEmitter(EventEmitter):
 
             d.addErrback(errback)
 
+    def wait_for(
+        self: Self,
+        event: str,
+        timeout: Optional[float] = None,
+        predicate: Optional[Callable[..., bool]] = None,
+        reactor: Optional[IReactorTime] = None,
+    ) -> "Deferred[Any]":
+        """Returns a Deferred which fires with the value of the next emit of
+        `event`, as for `AsyncIOEventEmitter#wait_for`. If `timeout` seconds
+        pass first, as measured by `reactor` (the emitter's by default), it
+        fails with `twisted.internet.defer.TimeoutError`. Cancelling the
+        Deferred stops waiting.
+        """
+        cancel: Callable[[], None] = lambda: None
+        d: Deferred[Any] = Deferred(lambda _: cancel())
+
+        def resolve(value: Any) -> None:
+            if not d.called:
+                d.callback(value)
+
+        def reject(exc: BaseException) -> None:
+            if not d.called:
+                d.errback(Failure(exc))
+
+        cancel = self._add_waiter(event, resolve, reject, predicate)
+        if timeout is not None:
+            d.addTimeout(timeout, reactor or self._get_reactor())
+        return d
+
     def _emit_handle_potential_error(self: Self, event: str, error: Any) -> None:
         if event == "failure":
             if isinstance(error, Failure):
@@ -64,11 +64,14 @@ def _wrap(
         else:
             del EMIT_WRAPPERS[left]
             del left.unwrap  # type: ignore
+            left._uplifted = False
         cast(Any, left).emit = left_emit
 
         unwrap(right)
 
     cast(Any, left).emit = wrapped_emit
+    # The other side may be listening for special events this side isn't
+    left._uplifted = True
 
     EMIT_WRAPPERS[left] = unwrap_hook
     left.unwrap = _unwrap  # type: ignore
@@ -2,7 +2,9 @@
 
 import asyncio
 from asyncio import Future, get_running_loop, sleep, wait_for
-from typing import NoReturn
+from gc import collect
+from typing import List, NoReturn
+from warnings import catch_warnings, simplefilter
 
 import pytest
 import pytest_asyncio.plugin  # noqa
@@ -12,7 +14,8 @@ try:
 except ImportError:
     from concurrent.futures import TimeoutError  # type: ignore
 
-from pyee.asyncio import AsyncIOEventEmitter
+from pyee import PyeeError
+from pyee.asyncio import AsyncIOEventEmitter, QueueFullError
 
 
 class PyeeTestError(Exception):
@@ -43,6 +46,115 @@ async def test_emit() -> None:
     assert ee.complete
 
 
+@pytest.mark.asyncio
+async def test_emit_compiled() -> None:
+    """Test that AsyncIOEventEmitter can schedule coroutines with compiled
+    dispatch
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop(), compiled=True)
+
+    should_call: Future[bool] = Future(loop=get_running_loop())
+
+    @ee.on("event")
+    async def event_handler() -> None:
+        should_call.set_result(True)
+
+    ee.emit("event")
+
+    result = await wait_for(should_call, 0.1)
+
+    assert result is True
+
+
+@pytest.mark.asyncio
+async def test_emit_eager() -> None:
+    """Test that an eager AsyncIOEventEmitter runs coroutines inside emit
+    until they first suspend, and only waits on the ones which suspend
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop(), eager=True)
+
+    calls = []
+
+    @ee.on("event")
+    async def event_handler(data):
+        calls.append(data)
+        if data == "suspend":
+            await sleep(0)
+            calls.append("resumed")
+
+    ee.emit("event", "complete")
+
+    assert calls == ["complete"]
+    assert ee.complete
+
+    ee.emit("event", "suspend")
+
+    assert calls == ["complete", "suspend"]
+    assert not ee.complete
+
+    await wait_for(ee.wait_for_complete(), 0.1)
+
+    assert calls == ["complete", "suspend", "resumed"]
+
+
+@pytest.mark.asyncio
+async def test_eager_queued() -> None:
+    """Test that an eager AsyncIOEventEmitter with a concurrency limit waits
+    for coroutines queued behind one which completed without suspending
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop(), eager=True, max_concurrency=1)
+
+    calls = []
+
+    @ee.on("event")
+    async def first_handler():
+        calls.append("first")
+
+    @ee.on("event")
+    async def second_handler():
+        calls.append("second")
+
+    ee.emit("event")
+
+    assert calls == ["first"]
+    assert ee.queue_depth() == 1
+    assert not ee.complete
+
+    await wait_for(ee.wait_for_complete(), 0.1)
+
+    assert calls == ["first", "second"]
+    assert ee.queue_depth() == 0
+    assert ee.complete
+
+
+@pytest.mark.asyncio
+async def test_error_eager() -> None:
+    """Test that an eager AsyncIOEventEmitter emits errors from coroutines
+    which fail without suspending from inside emit
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop(), eager=True)
+
+    errors = []
+
+    @ee.on("event")
+    async def event_handler() -> NoReturn:
+        raise PyeeTestError()
+
+    @ee.on("error")
+    def handle_error(exc):
+        errors.append(exc)
+
+    ee.emit("event")
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], PyeeTestError)
+    assert ee.complete
+
+
 @pytest.mark.asyncio
 async def test_once_emit() -> None:
     """Test that AsyncIOEventEmitter also wrap coroutines when
@@ -190,3 +302,650 @@ async def test_sync_error() -> None:
     result = await wait_for(should_call, 0.1)
 
     assert isinstance(result, PyeeTestError)
+
+
+@pytest.mark.asyncio
+async def test_emit_many() -> None:
+    """Test that emit_many schedules one task per chunk, which runs and awaits
+    every handler for every item in the chunk
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+
+    calls = []
+
+    @ee.on("event")
+    async def event_handler(data):
+        await sleep(0)
+        calls.append(data)
+
+    @ee.on("event")
+    def sync_handler(data):
+        if data == 3:
+            raise PyeeTestError()
+
+    @ee.on("error")
+    def handle_error(exc):
+        calls.append(exc)
+
+    assert ee.emit_many("event", ((i,) for i in range(5)), chunksize=2)
+
+    assert len(ee._waiting) == 3
+
+    await ee.wait_for_complete()
+
+    errors = [c for c in calls if isinstance(c, PyeeTestError)]
+    assert len(errors) == 1
+    assert sorted(c for c in calls if c not in errors) == [0, 1, 2, 3, 4]
+    assert ee.complete
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency() -> None:
+    """Test that AsyncIOEventEmitter limits how many coroutine handlers run
+    at once, queueing the rest
+    """
+
+    ee = AsyncIOEventEmitter(
+        loop=get_running_loop(),
+        max_concurrency=3,
+        max_concurrency_per_event=dict(slow=1),
+    )
+
+    running = dict(fast=0, slow=0)
+    most_running = dict(fast=0, slow=0, total=0)
+
+    async def handler(event):
+        running[event] += 1
+        most_running[event] = max(most_running[event], running[event])
+        most_running["total"] = max(most_running["total"], sum(running.values()))
+        await sleep(0.01)
+        running[event] -= 1
+
+    ee.on("fast", handler)
+    ee.on("slow", handler)
+
+    for _ in range(5):
+        ee.emit("slow", "slow")
+
+    assert ee.queue_depth("slow") == 4
+    assert len(ee._waiting) == 1
+
+    for _ in range(5):
+        ee.emit("fast", "fast")
+
+    assert ee.queue_depth() == 4 + 3
+
+    await ee.wait_for_complete()
+
+    assert most_running == dict(fast=3, slow=1, total=3)
+    assert ee.queue_depth() == 0
+    assert ee.complete
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_emit_many() -> None:
+    """Test that emit_many's chunks are run within concurrency limits, and
+    dropped as a whole past max_pending
+    """
+
+    ee = AsyncIOEventEmitter(
+        loop=get_running_loop(),
+        max_concurrency=2,
+        overflow="drop_newest",
+        max_pending=1,
+    )
+
+    calls = []
+    running = 0
+    most_running = 0
+
+    @ee.on("event")
+    async def event_handler(i):
+        nonlocal running, most_running
+        running += 1
+        most_running = max(most_running, running)
+        await sleep(0.01)
+        running -= 1
+        calls.append(i)
+
+    assert ee.emit_many("event", ((i,) for i in range(8)), chunksize=2)
+
+    assert len(ee._waiting) == 2
+    assert ee.queue_depth() == 1
+
+    await ee.wait_for_complete()
+
+    assert most_running == 2
+    assert sorted(calls) == [0, 1, 2, 3, 4, 5]
+    assert ee.queue_depth() == 0
+    assert ee.complete
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overflow,expected", [("drop_oldest", [0, 3]), ("drop_newest", [0, 1])]
+)
+async def test_max_concurrency_drop(overflow, expected) -> None:
+    """Test that AsyncIOEventEmitter drops coroutines past max_pending"""
+
+    ee = AsyncIOEventEmitter(
+        loop=get_running_loop(), max_concurrency=1, overflow=overflow, max_pending=1
+    )
+
+    calls = []
+
+    @ee.on("event")
+    async def event_handler(i):
+        calls.append(i)
+
+    for i in range(4):
+        ee.emit("event", i)
+
+    assert ee.queue_depth() == 1
+
+    await ee.wait_for_complete()
+
+    assert calls == expected
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_raise() -> None:
+    """Test that AsyncIOEventEmitter can raise when coroutines can't be
+    queued, and that cancel drops queued coroutines
+    """
+
+    ee = AsyncIOEventEmitter(
+        loop=get_running_loop(), max_concurrency=1, overflow="raise", max_pending=1
+    )
+
+    @ee.on("event")
+    async def event_handler():
+        await sleep(1)
+
+    ee.emit("event")
+    ee.emit("event")
+
+    with pytest.raises(QueueFullError):
+        ee.emit("event")
+
+    ee.cancel()
+
+    assert ee.queue_depth() == 0
+
+    await sleep(0.01)
+
+    assert ee._limiter and ee._limiter.running == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("eager", [False, True])
+async def test_emit_async(eager) -> None:
+    """Test that emit_async waits for and returns the results of only the
+    handlers it called
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop(), eager=eager)
+
+    assert await ee.emit_async("event") == []
+
+    @ee.on("other")
+    async def other_handler():
+        await sleep(1)
+
+    @ee.on("event")
+    async def async_handler(data):
+        await sleep(0)
+        return data * 2
+
+    @ee.on("event")
+    def sync_handler(data):
+        return data * 3
+
+    @ee.on("event")
+    async def failing_handler(data):
+        raise PyeeTestError()
+
+    ee.emit("other")
+
+    results = await wait_for(ee.emit_async("event", 2), 0.1)
+
+    assert results[:2] == [4, 6]
+    assert isinstance(results[2], PyeeTestError)
+
+    # The other handler is still running
+    assert not ee.complete
+    ee.cancel()
+
+
+@pytest.mark.asyncio
+async def test_emit_async_timeout() -> None:
+    """Test that emit_async stops waiting after a timeout without canceling
+    slow handlers
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+
+    @ee.on("event")
+    async def slow_handler():
+        await sleep(0.05)
+        return "slow"
+
+    @ee.on("event")
+    async def fast_handler():
+        return "fast"
+
+    results = await ee.emit_async("event", timeout=0.01)
+
+    assert isinstance(results[0], TimeoutError)
+    assert results[1] == "fast"
+
+    assert not ee.complete
+    await ee.wait_for_complete()
+
+
+@pytest.mark.asyncio
+async def test_emit_async_timeout_error() -> None:
+    """Test that handlers which fail after emit_async times out have their
+    exceptions emitted on the error event
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+    errors: List[Exception] = []
+
+    @ee.on("event")
+    async def slow_handler():
+        await sleep(0.05)
+        raise PyeeTestError()
+
+    ee.on("error", errors.append)
+
+    results = await ee.emit_async("event", timeout=0.01)
+
+    assert isinstance(results[0], TimeoutError)
+    assert errors == []
+
+    await ee.wait_for_complete()
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], PyeeTestError)
+
+
+@pytest.mark.asyncio
+async def test_events() -> None:
+    """Test that AsyncIOEventEmitter streams events, and stops listening once
+    the stream is closed
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+
+    async with ee.events("event") as stream:
+        assert ee.listener_count("event") == 1
+
+        async def emit():
+            for i in range(3):
+                await sleep(0)
+                ee.emit("event", i)
+            ee.emit("event", "a", "b")
+
+        task = asyncio.ensure_future(emit())
+
+        assert await stream.get() == 0
+        assert [item async for item in stream_until(stream, ("a", "b"))] == [
+            1,
+            2,
+            ("a", "b"),
+        ]
+        await task
+
+    assert ee.listener_count("event") == 0
+    with pytest.raises(StopAsyncIteration):
+        await stream.get()
+
+    stream = ee.events("event")
+    assert ee.listener_count("event") == 1
+    del stream
+    collect()
+    ee.emit("event", 3)
+    assert ee.listener_count("event") == 0
+
+
+@pytest.mark.asyncio
+async def test_events_removed() -> None:
+    """Test that AsyncIOEventEmitter streams fail once their listeners are
+    removed, rather than leaving readers waiting forever, and may still be
+    closed
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+
+    for event in ("event", None):
+        stream = ee.events("event")
+        reader = asyncio.ensure_future(stream.get())
+        await sleep(0)
+        ee.remove_all_listeners(event)
+
+        with pytest.raises(PyeeError):
+            await wait_for(reader, 1)
+
+        ee.on("event", lambda _: None)
+        stream.close()
+
+        assert ee.listener_count("event") == 1
+        ee.remove_all_listeners()
+
+    # Events which were already buffered are read first
+    stream = ee.events("event")
+    ee.emit("event", 1)
+    ee.remove_all_listeners()
+
+    assert await stream.get() == 1
+    with pytest.raises(PyeeError):
+        await stream.get()
+
+
+async def stream_until(stream, last):
+    async for item in stream:
+        yield item
+        if item == last:
+            return
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overflow,expected",
+    [("drop_oldest", [2, 3]), ("drop_newest", [0, 1]), ("queue", [0, 1, 2, 3])],
+)
+async def test_events_overflow(overflow, expected) -> None:
+    """Test that AsyncIOEventEmitter streams drop events past maxsize"""
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+    stream = ee.events("event", maxsize=2, overflow=overflow)
+
+    for i in range(4):
+        ee.emit("event", i)
+
+    assert await stream.get_batch(10) == expected
+    stream.close()
+
+
+@pytest.mark.asyncio
+async def test_events_raise() -> None:
+    """Test that AsyncIOEventEmitter streams stop listening when they overflow,
+    and raise once the buffered events have been read
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+    stream = ee.events("event", maxsize=2)
+
+    for i in range(4):
+        ee.emit("event", i)
+
+    assert ee.listener_count("event") == 0
+
+    batches = []
+    with pytest.raises(QueueFullError):
+        async for batch in stream.batches(1):
+            batches.append(batch)
+
+    assert batches == [[0], [1]]
+
+
+@pytest.mark.asyncio
+async def test_wait_for() -> None:
+    """Test that AsyncIOEventEmitter can wait for the next matching emit of
+    an event, with a single listener for any number of waiters
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+
+    waiters = [asyncio.ensure_future(ee.wait_for("event")) for _ in range(1000)]
+    even = asyncio.ensure_future(ee.wait_for("event", predicate=lambda n: n % 2 == 0))
+    await sleep(0)
+
+    assert len(ee._events["event"]) == 1
+    assert ee.listeners("event") == []
+    assert ee.listener_count("event") == 0
+
+    ee.emit("event", 1)
+
+    assert await asyncio.gather(*waiters) == [1] * 1000
+    assert not even.done()
+
+    ee.emit("event", 2)
+
+    assert await even == 2
+    assert ee.event_names() == set()
+
+    with pytest.raises(TimeoutError):
+        await ee.wait_for("event", timeout=0.01)
+
+    assert ee.event_names() == set()
+
+    def predicate(n):
+        raise PyeeTestError()
+
+    failing = asyncio.ensure_future(ee.wait_for("event", predicate=predicate))
+    canceled = asyncio.ensure_future(ee.wait_for("event"))
+    await sleep(0)
+    canceled.cancel()
+    await sleep(0)
+    ee.emit("event", 3)
+
+    with pytest.raises(PyeeTestError):
+        await failing
+    assert canceled.cancelled()
+    assert ee.event_names() == set()
+
+    # Removing the event's listeners fails its waiters rather than leaving
+    # them waiting forever
+    for event in ("event", None):
+        orphaned = asyncio.ensure_future(ee.wait_for("event"))
+        await sleep(0)
+        ee.remove_all_listeners(event)
+
+        with pytest.raises(PyeeError):
+            await wait_for(orphaned, 1)
+
+
+@pytest.mark.asyncio
+async def test_correlate() -> None:
+    """Test that AsyncIOEventEmitter correlators resolve requests by the ID
+    of their reply, and time them out, with a single listener
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+    replies = ee.correlate("reply")
+
+    @ee.on("request")
+    async def request_handler(id, n):
+        if n is not None:
+            ee.emit("reply", id, n * 2)
+
+    futures = [replies.expect(i, timeout=5) for i in range(1000)]
+    for i in range(1000):
+        ee.emit("request", i, i)
+
+    assert await asyncio.gather(*futures) == [i * 2 for i in range(1000)]
+    assert len(replies) == 0
+    assert ee.listener_count("reply") == 1
+
+    # Timeouts are removed once their requests are resolved
+    await sleep(0)
+    assert ee._timer_wheel().buckets == dict()
+
+    slow = replies.expect("slow", timeout=0.05)
+    fast = replies.expect("fast", timeout=0.01)
+    ee.emit("request", "slow", None)
+    ee.emit("request", "fast", None)
+
+    with pytest.raises(TimeoutError):
+        await fast
+    assert not slow.done()
+    with pytest.raises(TimeoutError):
+        await slow
+    assert len(replies) == 0
+
+    # Requests canceled by the caller are forgotten
+    abandoned = replies.expect("abandoned")
+    abandoned.cancel()
+    await sleep(0)
+    assert len(replies) == 0
+
+    with pytest.raises(PyeeError):
+        replies.expect("again")
+        replies.expect("again")
+
+    replies.close()
+
+    assert ee.listener_count("reply") == 0
+
+
+@pytest.mark.asyncio
+async def test_correlate_key() -> None:
+    """Test that correlators can get the ID of a reply from its payload"""
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+    replies = ee.correlate("reply", key=lambda reply: reply["id"])
+
+    future = replies.expect(1)
+    ee.emit("reply", dict(id=2))
+    ee.emit("reply", dict(id=1, data="data"))
+
+    assert await future == dict(id=1, data="data")
+
+
+@pytest.mark.asyncio
+async def test_paced_handlers() -> None:
+    """Test that AsyncIOEventEmitter handlers can be debounced, throttled and
+    coalesced, so that bursts of emits collapse into single calls
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+    calls = []
+
+    @ee.on("event", debounce=0.05)
+    async def debounced(n):
+        calls.append(("debounced", n))
+
+    @ee.on("event", throttle=0.05)
+    def throttled(n):
+        calls.append(("throttled", n))
+
+    @ee.on("event", coalesce=0.05)
+    def coalesced(ns):
+        calls.append(("coalesced", ns))
+
+    for n in range(100):
+        ee.emit("event", n)
+
+    assert calls == [("throttled", 0)]
+
+    # Long enough for the throttled handler's trailing call, and the period
+    # that starts
+    await sleep(0.2)
+
+    assert sorted(calls) == [
+        ("coalesced", list(range(100))),
+        ("debounced", 99),
+        ("throttled", 0),
+        ("throttled", 99),
+    ]
+
+    # Removed handlers aren't called once their timers fire
+    calls.clear()
+    ee.emit("event", 100)
+    ee.remove_all_listeners("event")
+    await sleep(0.1)
+
+    assert calls == [("throttled", 100)]
+
+    with pytest.raises(PyeeError):
+        ee.on("event", debounced, debounce=1, throttle=1)
+
+
+def test_paced_handlers_no_loop() -> None:
+    """Test that paced handlers are added to AsyncIOEventEmitter without an
+    event loop, which is looked up once they're emitted
+    """
+
+    ee = AsyncIOEventEmitter()
+    calls = []
+
+    with catch_warnings():
+        simplefilter("error")
+
+        @ee.on("event", debounce=0.01)
+        def debounced(n):
+            calls.append(n)
+
+    assert ee._timers is None
+
+    async def main():
+        ee.emit("event", 1)
+        await ee.wait_for_complete()
+
+    asyncio.run(main())
+
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_max_batch() -> None:
+    """Test that coalesced handlers are passed full batches straight away,
+    and the rest by wait_for_complete
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+    batches = []
+
+    @ee.on("row", coalesce=60, max_batch=500)
+    async def store_rows(rows):
+        await sleep(0)
+        batches.append(rows)
+
+    for n in range(1200):
+        ee.emit("row", n)
+
+    assert ee.buffered("row") == 200
+
+    await ee.wait_for_complete()
+
+    assert batches == [
+        list(range(500)),
+        list(range(500, 1000)),
+        list(range(1000, 1200)),
+    ]
+    assert ee.buffered() == 0
+    assert ee.complete
+
+
+@pytest.mark.asyncio
+async def test_wait_for_complete_correlate() -> None:
+    """Test that wait_for_complete flushes paced handlers without timing out
+    the requests of correlators, which share their timers
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop())
+    replies = ee.correlate("reply")
+    batches = []
+
+    @ee.on("row", coalesce=30)
+    def store_rows(rows):
+        batches.append(rows)
+
+    future = replies.expect("request", timeout=30)
+    ee.emit("row", 1)
+    ee.emit("row", 2)
+
+    await ee.wait_for_complete()
+
+    assert batches == [[1, 2]]
+    assert not future.done()
+    assert len(replies) == 1
+
+    ee.emit("reply", "request", "data")
+
+    assert await future == "data"
+    await sleep(0)
+    assert ee._timer_wheel().buckets == dict()
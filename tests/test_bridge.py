@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+from asyncio import Future, get_running_loop, wait_for
+from multiprocessing import get_context, Pipe
+from multiprocessing.connection import Client, Listener
+from threading import Event
+
+import pytest
+import pytest_asyncio.plugin  # noqa
+
+from pyee import EventEmitter, PyeeError
+from pyee.asyncio import AsyncIOEventEmitter
+from pyee.bridge import Bridge, SharedRing
+
+
+def test_bridge():
+    """Test that bridged emitters emit each other's events, in order and
+    without sending them back
+    """
+
+    left, right = EventEmitter(), EventEmitter()
+    left_conn, right_conn = Pipe()
+
+    received = []
+    done = Event()
+
+    @right.on("event")
+    def right_handler(n, big=None):
+        received.append((n, len(big) if big else None))
+        if n == 999:
+            # Not sent back, since it's being delivered
+            right.emit("event", -1)
+            done.set()
+
+    echoed = []
+    left.on("event", lambda n, big=None: echoed.append(n))
+
+    with Bridge(left, left_conn, ["event"]), Bridge(right, right_conn, ["event"]):
+        for n in range(999):
+            left.emit("event", n)
+        # Bigger than the reader's buffer
+        left.emit("event", 999, big=b"x" * 100_000)
+
+        assert done.wait(5)
+
+    assert received == [(n, None) for n in range(999)] + [(999, 100_000), (-1, None)]
+    assert echoed == list(range(1000))
+    assert left.listener_count("event") == 1
+    assert left_conn.closed
+
+
+def test_bridge_closed_by_other_side():
+    """Test that a bridge closes when the other side does, after receiving
+    the events which were sent before it closed
+    """
+
+    ee = EventEmitter()
+    ours, theirs = Pipe()
+
+    received = []
+    ee.on("event", received.append)
+
+    bridge = Bridge(ee, ours)
+
+    sender = EventEmitter()
+    with Bridge(sender, theirs, ["event"]):
+        sender.emit("event", 1)
+
+    bridge._reader.join(5)
+
+    assert received == [1]
+    assert bridge.closed
+    assert ours.closed
+
+
+@pytest.mark.asyncio
+async def test_bridge_deliver():
+    """Test that bridges can deliver events to an emitter on another
+    thread
+    """
+
+    loop = get_running_loop()
+    ee = AsyncIOEventEmitter(loop=loop)
+    ours, theirs = Pipe()
+
+    received: Future = loop.create_future()
+
+    @ee.on("event")
+    async def event_handler(data):
+        received.set_result(data)
+
+    sender = EventEmitter()
+    with (
+        Bridge(ee, ours, deliver=loop.call_soon_threadsafe),
+        Bridge(sender, theirs, ["event"]),
+    ):
+        sender.emit("event", "data")
+        assert await wait_for(received, 5) == "data"
+
+
+def pong(address):
+    ee = EventEmitter()
+    ee.on("ping", lambda n: ee.emit("pong", n + 1))
+    bridge = Bridge(ee, Client(address, family="AF_UNIX"), ["pong"])
+    # Wait for the other side to hang up
+    bridge._reader.join()
+
+
+def test_bridge_processes(tmp_path):
+    """Test that events cross between processes over a Unix domain socket"""
+
+    address = str(tmp_path / "bridge.sock")
+    ee = EventEmitter()
+    pongs = []
+    done = Event()
+
+    @ee.on("pong")
+    def pong_handler(n):
+        pongs.append(n)
+        if len(pongs) == 3:
+            done.set()
+
+    with Listener(address, family="AF_UNIX") as listener:
+        process = get_context("spawn").Process(target=pong, args=(address,))
+        process.start()
+        with Bridge(ee, listener.accept(), ["ping"]):
+            for n in range(3):
+                ee.emit("ping", n)
+            assert done.wait(10)
+
+    process.join(10)
+
+    assert pongs == [1, 2, 3]
+    assert process.exitcode == 0
+
+
+def test_shared_ring():
+    """Test that shared rings pass records in order, across the end of the
+    ring, and that lossless rings wait for the reader when full
+    """
+
+    with SharedRing(create=True, record="qd", capacity=4) as ring:
+        try:
+            with SharedRing(ring.name) as reader:
+                ring.write(0, 0.5)
+                ring.write_many((n, n / 2) for n in range(1, 4))
+
+                assert reader.read(2) == [(0, 0.5), (1, 0.5)]
+
+                ring.write_many((n, n / 2) for n in range(4, 6))
+
+                assert reader.read() == [(2, 1.0), (3, 1.5), (4, 2.0), (5, 2.5)]
+                assert reader.read() == []
+
+                ee, local = EventEmitter(), EventEmitter()
+                received = []
+                done = Event()
+
+                @local.on("sample")
+                def sample_handler(n, value):
+                    received.append(n)
+                    if n == 99:
+                        done.set()
+
+                ring.forward(ee, "sample")
+                reader.deliver(local, "sample", max_batch=3)
+                # Far more than fit in the ring at once
+                for n in range(100):
+                    ee.emit("sample", n, 0.0)
+
+                assert done.wait(5)
+                assert received == list(range(100))
+                assert reader.dropped == 0
+        finally:
+            ring.unlink()
+
+    assert ee.listener_count("sample") == 0
+
+
+def test_shared_ring_overwrite():
+    """Test that overwriting rings drop the oldest records when they're
+    full
+    """
+
+    with SharedRing(create=True, record="i", capacity=4, overwrite=True) as ring:
+        try:
+            with SharedRing(ring.name) as reader:
+                ring.write_many((n,) for n in range(10))
+
+                assert reader.read() == [(6,), (7,), (8,), (9,)]
+                assert reader.dropped == 6
+        finally:
+            ring.unlink()
+
+
+def test_shared_ring_errors():
+    """Test that lossless rings stop waiting for room when the reader has
+    closed the ring or takes too long, and that errors raised while
+    delivering records are emitted
+    """
+
+    with pytest.raises(ValueError):
+        SharedRing(create=True, record="i" * 56)
+
+    with SharedRing(create=True, record="i", capacity=2, timeout=0.01) as ring:
+        try:
+            with SharedRing(ring.name) as reader:
+                ring.write_many((n,) for n in range(2))
+                with pytest.raises(TimeoutError):
+                    ring.write(2)
+
+                ee = EventEmitter()
+                errors = []
+                done = Event()
+
+                @ee.on("record")
+                def record_handler(n):
+                    raise ValueError(n)
+
+                @ee.on("error")
+                def error_handler(error):
+                    errors.append(error)
+                    done.set()
+
+                reader.deliver(ee, "record")
+                assert done.wait(5)
+                assert isinstance(errors[0], ValueError)
+
+            ring.write_many((n,) for n in range(2))
+            with pytest.raises(PyeeError):
+                ring.write(2)
+        finally:
+            ring.unlink()
+
+
+def produce(name, n):
+    with SharedRing(name) as ring:
+        ring.write_many((i, i * 0.5) for i in range(n))
+
+
+def test_shared_ring_processes():
+    """Test that records cross between processes through a shared ring"""
+
+    n = 100_000
+    with SharedRing(create=True, record="qd", capacity=1024) as ring:
+        try:
+            process = get_context("spawn").Process(target=produce, args=(ring.name, n))
+            process.start()
+
+            received = []
+            while len(received) < n:
+                received.extend(ring.read())
+
+            process.join(10)
+        finally:
+            ring.unlink()
+
+    assert received == [(i, i * 0.5) for i in range(n)]
+    assert process.exitcode == 0
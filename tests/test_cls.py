@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from gc import collect
 from unittest.mock import Mock
 
 import pytest
@@ -46,3 +47,44 @@ def test_evented_decorator(cls):
     inst.call_me.assert_called_once_with(inst, "emitter is emitted!")
 
     _custom_event_emitter.remove_all_listeners()
+
+
+@evented(weak=True)
+class WeakFixture:
+    def __init__(self):
+        self.call_me = Mock()
+        self.event_emitter = _custom_event_emitter
+
+    @on("event")
+    def event_handler(self, *args, **kwargs):
+        self.call_me(self, *args, **kwargs)
+
+
+@evented(weak=False)
+class StrongFixture:
+    def __init__(self):
+        self.call_me = Mock()
+        self.event_emitter = _custom_event_emitter
+
+    @on("event")
+    def event_handler(self, *args, **kwargs):
+        self.call_me(self, *args, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "cls,listeners",
+    [(WeakFixture, 0), (StrongFixture, 1), (CustomEmitterFixture, 1)],
+)
+def test_evented_weak(cls, listeners):
+    """Test that evented classes keep strong references to their handlers,
+    unless they're configured to keep weak ones.
+    """
+    inst = cls()
+    assert len(_custom_event_emitter.listeners("event")) == 1
+
+    del inst
+    collect()
+
+    assert len(_custom_event_emitter.listeners("event")) == listeners
+
+    _custom_event_emitter.remove_all_listeners()
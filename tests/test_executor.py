@@ -1,15 +1,39 @@
 # -*- coding: utf-8 -*-
 
+from pickle import PicklingError
+from threading import Event, get_ident
 from time import sleep
 from unittest.mock import Mock
 
-from pyee.executor import ExecutorEventEmitter
+import pytest
+
+from pyee import PyeeError
+from pyee.executor import ExecutorEventEmitter, ProcessPoolEventEmitter
+from pyee.instrument import handler_name, Stats
 
 
 class PyeeTestError(Exception):
     pass
 
 
+# Handlers for ProcessPoolEventEmitter need to be importable by workers
+def write_data(path, data, suffix=b""):
+    with open(path, "ab") as f:
+        f.write(bytes(data) + suffix + b"\n")
+
+
+def write_once(path, data):
+    write_data(path, data, b" once")
+
+
+def fail(path, data, suffix=b""):
+    raise PyeeTestError(len(data))
+
+
+def read_lines(path):
+    return sorted(path.read_bytes().splitlines())
+
+
 def test_executor_emit():
     """Test that ExecutorEventEmitters can emit events."""
     with ExecutorEventEmitter() as ee:
@@ -58,3 +82,193 @@ def test_executor_error():
         sleep(0.1)
 
         should_call.assert_called_once()
+
+
+def test_executor_emit_many():
+    """Test that ExecutorEventEmitters run batches of events in chunks and
+    handle their errors.
+    """
+    with ExecutorEventEmitter() as ee:
+        should_call = Mock()
+        handle_error = Mock()
+
+        @ee.on("event")
+        def event_handler(data):
+            if data == 2:
+                raise PyeeTestError()
+            should_call(data)
+
+        ee.on("error", handle_error)
+
+        ee.emit_many("event", ((i,) for i in range(5)), chunksize=2)
+        sleep(0.1)
+
+        assert should_call.call_count == 4
+        handle_error.assert_called_once()
+        assert isinstance(handle_error.call_args[0][0], PyeeTestError)
+
+
+@pytest.mark.parametrize("batch_size,jobs", [(None, 1), (2, 2)])
+def test_executor_batch(batch_size, jobs):
+    """Test that batched ExecutorEventEmitters run an event's handlers in a
+    job per batch and emit each handler's errors.
+    """
+    threads = []
+    errors = []
+
+    with ExecutorEventEmitter(batch=True, batch_size=batch_size) as ee:
+
+        @ee.on("event")
+        def first_handler(data):
+            threads.append(get_ident())
+
+        @ee.on("event")
+        def failing_handler(data):
+            threads.append(get_ident())
+            raise PyeeTestError(data)
+
+        @ee.on("event")
+        def last_handler(data):
+            threads.append(get_ident())
+            # Keep this job busy, so that another job runs on another thread
+            sleep(0.1)
+
+        @ee.on("error")
+        def handle_error(e):
+            errors.append(e)
+
+        assert ee.emit("event", "data")
+
+        sleep(0.2)
+
+    assert len(threads) == 3
+    if jobs == 1:
+        assert len(set(threads)) == 1
+    else:
+        assert threads[0] == threads[1]
+    assert len(errors) == 1
+    assert isinstance(errors[0], PyeeTestError)
+
+
+@pytest.mark.parametrize("batch,many", [(False, False), (True, False), (False, True)])
+def test_executor_coalesce(batch, many):
+    """Test that ExecutorEventEmitters pass coalesced handlers full batches
+    straight away, and the rest of a batch on shutdown, in order, keeping
+    track of emits on the emitting thread even when handlers are batched.
+    """
+    stats = Stats()
+    batches = []
+
+    with ExecutorEventEmitter(batch=batch) as ee:
+        ee.add_collector(stats)
+
+        @ee.on("row", coalesce=10, max_batch=3)
+        def store_rows(rows):
+            batches.append(rows)
+
+        if many:
+            ee.emit_many("row", ((n,) for n in range(7)), chunksize=2)
+        else:
+            for n in range(7):
+                ee.emit("row", n)
+
+        assert ee.buffered() == ee.buffered("row") == 1
+        assert ee.buffered("other") == 0
+
+    # Run on whichever threads are free
+    assert sorted(batches) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert ee.buffered() == 0
+    key = ("row", handler_name(store_rows))
+    assert stats.batches[key] == 3
+    assert stats.batched[key] == 7
+    assert stats.handlers[key].n == 3
+
+    with pytest.raises(PyeeError):
+        ee.on("row", store_rows, max_batch=3)
+
+
+@pytest.mark.parametrize("pace", ["debounce", "throttle"])
+def test_executor_paced_timers(pace):
+    """Test that ExecutorEventEmitters fire paced handlers' timers on a
+    timer thread.
+    """
+    called = Event()
+    calls = []
+
+    with ExecutorEventEmitter() as ee:
+
+        @ee.on("event", **{pace: 0.05})
+        def handler(n):
+            calls.append(n)
+            if n == 9:
+                called.set()
+
+        for n in range(10):
+            ee.emit("event", n)
+
+        assert called.wait(5)
+
+    assert calls == ([9] if pace == "debounce" else [0, 9])
+
+
+def test_process_pool_emit(tmp_path):
+    """Test that ProcessPoolEventEmitters run handlers in worker processes,
+    passing large arguments through shared memory.
+    """
+    on_path = tmp_path / "on"
+    once_path = tmp_path / "once"
+    errors = []
+
+    with ProcessPoolEventEmitter(shared_memory_threshold=16) as ee:
+        ee.on("data", write_data)
+        ee.once("once", write_data)
+        ee.on("data", fail)
+
+        # Special events are handled in this process
+        @ee.on("error")
+        def handle_error(e):
+            errors.append(e)
+
+        large = b"x" * 1024
+        ee.emit("data", str(on_path), large, suffix=b"!")
+        ee.emit("data", str(on_path), memoryview(b"y" * 32))
+        ee.emit("once", str(once_path), b"small")
+        ee.emit("once", str(once_path), b"again")
+
+        assert ee.listeners("once") == []
+
+        sleep(0.5)
+
+    assert read_lines(on_path) == [b"x" * 1024 + b"!", b"y" * 32]
+    assert read_lines(once_path) == [b"small"]
+    assert sorted(e.args[0] for e in errors) == [32, 1024]
+
+
+def test_process_pool_emit_many(tmp_path):
+    """Test that ProcessPoolEventEmitters can emit a batch of events, calling
+    once handlers for the first one only.
+    """
+    path = tmp_path / "data"
+
+    with ProcessPoolEventEmitter(batch=True) as ee:
+        ee.on("data", write_data)
+        ee.once("data", write_once)
+
+        ee.emit_many("data", [(str(path), b"a"), (str(path), b"b")], 1)
+        ee.emit_many("data", [(str(path), b"c")])
+
+    assert read_lines(path) == [b"a", b"a once", b"b", b"c"]
+
+
+def test_process_pool_unpicklable():
+    """Test that ProcessPoolEventEmitters refuse handlers which can't be sent
+    to worker processes.
+    """
+    with ProcessPoolEventEmitter() as ee:
+        with pytest.raises((AttributeError, PicklingError)):
+
+            @ee.on("event")
+            def local_handler():
+                pass
+
+        assert ee.listeners("event") == []
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+
+from asyncio import get_running_loop
+from asyncio import sleep as async_sleep
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from time import sleep
+from typing import Optional
+
+import pytest
+
+from pyee import EventEmitter
+from pyee.asyncio import AsyncIOEventEmitter
+from pyee.executor import ExecutorEventEmitter
+from pyee.instrument import Collector, Histogram, Stats
+
+
+class PyeeTestError(Exception):
+    pass
+
+
+def handler_key(event, f):
+    return (event, f"{f.__module__}.{f.__qualname__}")
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_stats(compiled):
+    """Test that Stats counts emits and times handlers, including handlers
+    which fail and handlers added with once
+    """
+
+    ee = EventEmitter(compiled=compiled)
+    stats = Stats(top=2)
+    ee.add_collector(stats)
+
+    def fast_handler(data):
+        pass
+
+    def slow_handler(data):
+        sleep(0.01)
+
+    def failing_handler(data):
+        raise PyeeTestError()
+
+    ee.on("event", fast_handler)
+    ee.on("event", slow_handler)
+    ee.once("once", fast_handler)
+    ee.on("fail", failing_handler)
+
+    ee.emit("event", 1)
+    ee.emit("event", 2)
+    ee.emit("once", 3)
+    ee.emit("once", 4)
+    ee.emit_many("event", [(5,), (6,)])
+
+    with pytest.raises(PyeeTestError):
+        ee.emit("fail", 7)
+
+    assert stats.emits == {
+        "new_listener": 4,
+        "remove_listener": 1,
+        "event": 4,
+        "once": 2,
+        "fail": 1,
+    }
+
+    slow = stats.handlers[handler_key("event", slow_handler)]
+    assert slow.n == 4
+    assert slow.total >= 0.04
+    assert slow.percentile(50) >= 0.01
+    assert stats.handlers[handler_key("once", fast_handler)].n == 1
+    assert stats.errors == {handler_key("fail", failing_handler): 1}
+
+    slowest = stats.slowest()
+    assert len(slowest) == 2
+    assert slowest[0].seconds >= slowest[1].seconds >= 0.01
+    assert {run.handler for run in slowest} == {handler_key("event", slow_handler)[1]}
+    assert "slow_handler" in stats.report()
+
+    # Nothing is waited on when handlers are called straight away
+    assert not stats.waits
+
+    ee.remove_collector(stats)
+    ee.emit("event", 8)
+
+    assert stats.emits["event"] == 4
+
+    stats.reset()
+    assert not stats.handlers and not stats.slowest()
+
+
+def test_histogram():
+    """Test that histograms bucket durations and estimate percentiles"""
+
+    histogram = Histogram()
+
+    assert histogram.percentile(99) == 0.0
+
+    for _ in range(99):
+        histogram.add(1e-6)
+    histogram.add(1.0)
+
+    assert histogram.n == 100
+    assert histogram.max == 1.0
+    assert histogram.percentile(50) == 1e-6
+    assert 1.0 <= histogram.percentile(100) < 2.0
+    assert histogram.mean == pytest.approx((99e-6 + 1.0) / 100)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency", [None, 1])
+async def test_stats_asyncio(max_concurrency):
+    """Test that collectors follow coroutines until they complete, and are
+    told how long they waited to start
+    """
+
+    ee = AsyncIOEventEmitter(loop=get_running_loop(), max_concurrency=max_concurrency)
+    stats = Stats()
+    ee.add_collector(stats)
+
+    @ee.on("event")
+    async def event_handler():
+        await async_sleep(0.01)
+
+    ee.emit("event")
+    ee.emit("event")
+    await ee.wait_for_complete()
+
+    histogram = stats.handlers[handler_key("event", event_handler)]
+    assert histogram.n == 2
+    assert histogram.total >= 0.02
+    assert stats.waits["event"].n == 2
+    if max_concurrency:
+        # The second handler waited for the first
+        assert stats.waits["event"].max >= 0.01
+
+    assert await ee.emit_async("event") == [None]
+    assert stats.emits["event"] == 3
+
+
+def test_stats_executor():
+    """Test that collectors are told how long handlers waited for an
+    executor, and how long they ran for
+    """
+
+    collected = []
+
+    class Recorder(Collector):
+        def record_wait(self, emitter, event, handler, seconds):
+            collected.append(("wait", handler))
+
+        def record_handler(self, emitter, event, handler, seconds, error):
+            collected.append(("handler", handler, seconds, error))
+
+    def event_handler():
+        sleep(0.01)
+
+    def failing_handler():
+        raise PyeeTestError()
+
+    with ExecutorEventEmitter(batch=True) as ee:
+        ee.add_collector(Recorder())
+        ee.on("event", event_handler)
+        ee.on("event", failing_handler)
+        ee.on("error", lambda exc: None)
+
+        ee.emit("event")
+
+    assert collected[0] == ("wait", event_handler)
+    _, handler, seconds, error = collected[1]
+    assert handler is event_handler and seconds >= 0.01 and error is None
+    assert collected[2] == ("wait", failing_handler)
+    assert isinstance(collected[3][3], PyeeTestError)
+
+
+current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+request_id: ContextVar[Optional[int]] = ContextVar("request_id", default=None)
+
+
+class RecordingTracer:
+    """A tracer which records the names, parents and attributes of the spans
+    it starts, tracking the current span with a context variable in the same
+    way as OpenTelemetry
+    """
+
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, *, attributes=None):
+        self.spans.append((name, current_span.get(), attributes))
+        token = current_span.set(name)
+        try:
+            yield name
+        finally:
+            current_span.reset(token)
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_tracing(compiled):
+    """Test that emits are traced with a span, and handlers with a child
+    span
+    """
+
+    tracer = RecordingTracer()
+    ee = EventEmitter(compiled=compiled)
+
+    current = []
+
+    def event_handler(data):
+        current.append(current_span.get())
+
+    ee.on("event", event_handler)
+    ee.set_tracer(tracer)
+    ee.emit("event", 1)
+
+    assert tracer.spans == [
+        (
+            "publish event",
+            None,
+            {
+                "messaging.system": "pyee",
+                "messaging.operation.type": "publish",
+                "messaging.destination.name": "event",
+            },
+        ),
+        (
+            "process event",
+            "publish event",
+            {
+                "messaging.system": "pyee",
+                "messaging.operation.type": "process",
+                "messaging.destination.name": "event",
+                "code.function": handler_key("event", event_handler)[1],
+            },
+        ),
+    ]
+
+    ee.set_tracer(None)
+    ee.emit("event", 2)
+
+    assert len(tracer.spans) == 2
+    assert current == ["process event", None]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency", [None, 1])
+async def test_tracing_asyncio(max_concurrency):
+    """Test that coroutine handlers are traced until they complete, and run
+    in the context they were emitted in, even when they're queued
+    """
+
+    tracer = RecordingTracer()
+    ee = AsyncIOEventEmitter(loop=get_running_loop(), max_concurrency=max_concurrency)
+
+    requests = []
+
+    @ee.on("event")
+    async def event_handler():
+        await async_sleep(0.01)
+        assert current_span.get() == "process event"
+        requests.append(request_id.get())
+
+    ee.set_tracer(tracer)
+
+    def emit(i):
+        request_id.set(i)
+        ee.emit("event")
+
+    # Each emit gets a context of its own
+    copy_context().run(emit, 1)
+    copy_context().run(emit, 2)
+    await ee.wait_for_complete()
+
+    assert requests == [1, 2]
+    assert [(name, parent) for name, parent, _ in tracer.spans] == [
+        ("publish event", None),
+        ("publish event", None),
+        ("process event", "publish event"),
+        ("process event", "publish event"),
+    ]
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_tracing_executor(batch):
+    """Test that executor jobs run in the context they were emitted in, so
+    that handler spans are children of the emit's span
+    """
+
+    tracer = RecordingTracer()
+    requests = []
+
+    def event_handler():
+        requests.append(request_id.get())
+
+    with ExecutorEventEmitter(batch=batch, tracer=tracer) as ee:
+        ee.on("event", event_handler)
+
+        token = request_id.set(1)
+        ee.emit("event")
+        request_id.reset(token)
+
+        ee.emit_many("event", [()])
+
+    assert requests == [1, None]
+    assert [(name, parent) for name, parent, _ in tracer.spans] == [
+        ("publish new_listener", None),
+        ("publish event", None),
+        ("process event", "publish event"),
+        ("process event", None),
+    ]
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 from collections import OrderedDict
+from gc import collect
 from pickle import dumps, loads
-from unittest.mock import Mock
+from threading import Thread
+from unittest.mock import call, Mock
+from warnings import catch_warnings, simplefilter
 
-from pytest import raises
+from pytest import mark, raises, warns
 
-from pyee import EventEmitter
+from pyee import EventEmitter, MaxListenersExceededWarning, PyeeError
 
 
 class PyeeTestException(Exception):
@@ -73,6 +76,152 @@ def test_emit_return():
     assert ee.emit("data")
 
 
+def test_emit_many():
+    """`emit_many()` calls handlers once for every tuple of arguments."""
+
+    call_me = Mock()
+    once_me = Mock()
+    ee = EventEmitter()
+
+    assert ee.emit_many("data", [(1,), (2,)]) is False
+
+    ee.on("data", call_me)
+    ee.once("data", once_me)
+
+    assert ee.emit_many("data", ((i, i * 2) for i in range(3))) is True
+
+    assert call_me.call_count == 3
+    call_me.assert_called_with(2, 4)
+    once_me.assert_called_once_with(0, 0)
+
+    with raises(PyeeTestException):
+        ee.emit_many("error", [(PyeeTestException(),)])
+
+
+def test_compiled_dispatch():
+    """Compiled dispatch functions are cached per event and rebuilt when the
+    event's listeners change.
+    """
+
+    first = Mock()
+    second = Mock()
+    ee = EventEmitter(compiled=True)
+
+    assert ee.emit("event", 1) is False
+    assert "event" not in ee._dispatchers
+
+    ee.on("event", first)
+
+    assert ee.emit("event", 1, a=2) is True
+    first.assert_called_once_with(1, a=2)
+    dispatch = ee._dispatchers["event"]
+
+    ee.emit("event", 1, a=2)
+    assert ee._dispatchers["event"] is dispatch
+
+    ee.on("event", second)
+    assert "event" not in ee._dispatchers
+
+    ee.emit("event", 3)
+    first.assert_called_with(3)
+    second.assert_called_once_with(3)
+
+    ee.remove_listener("event", first)
+    ee.emit("event", 4)
+    assert first.call_count == 3
+    second.assert_called_with(4)
+
+    ee.remove_all_listeners()
+    assert ee.emit("event", 5) is False
+    assert second.call_count == 2
+
+    with raises(PyeeTestException):
+        ee.emit("error", PyeeTestException())
+
+
+def test_compiled_dispatch_emit_run():
+    """Compiled dispatch functions go through `_emit_run` when a subclass
+    overrides it.
+    """
+
+    call_me = Mock()
+
+    class RunEventEmitter(EventEmitter):
+        def _emit_run(self, f, args, kwargs):
+            call_me(f, args, kwargs)
+
+    ee = RunEventEmitter(compiled=True)
+
+    def handler():
+        pass
+
+    ee.on("event", handler)
+    ee.emit("event", 1)
+
+    call_me.assert_called_once_with(handler, (1,), {})
+
+
+def test_wildcard():
+    """Wildcard patterns match event names segment by segment."""
+
+    calls = []
+    ee = EventEmitter(wildcard=True)
+
+    ee.on("order.**", lambda: calls.append("order.**"))
+    ee.on("order.*.created", lambda: calls.append("order.*.created"))
+    ee.on("order.eu.created", lambda: calls.append("order.eu.created"))
+    ee.on("*", lambda: calls.append("*"))
+
+    assert ee.emit("order.eu.created") is True
+    assert calls == ["order.eu.created", "order.**", "order.*.created"]
+
+    calls.clear()
+    ee.emit("order.us.created")
+    assert calls == ["order.**", "order.*.created"]
+
+    calls.clear()
+    ee.emit("order")
+    assert calls == ["order.**", "*"]
+
+    calls.clear()
+    assert ee.emit("invoice.eu.created") is False
+    assert calls == []
+    # Cached, so emitting it again doesn't match it against the patterns
+    assert ee._snapshots["invoice.eu.created"] == ()
+
+    # Removing a pattern's listeners updates cached events
+    ee.remove_all_listeners("order.**")
+    calls.clear()
+    ee.emit("order.eu.created")
+    assert calls == ["order.eu.created", "order.*.created"]
+
+    @ee.once("invoice.*.*")
+    def once_handler():
+        calls.append("invoice.*.*")
+
+    calls.clear()
+    ee.emit_many("invoice.eu.created", [(), ()])
+    assert calls == ["invoice.*.*"]
+    assert "invoice.*.*" not in ee.event_names()
+
+
+def test_wildcard_compiled():
+    """Wildcard patterns work with compiled dispatch."""
+
+    call_me = Mock()
+    ee = EventEmitter(wildcard=True, compiled=True, delimiter="/")
+
+    assert ee.emit("order/eu") is False
+
+    ee.on("order/*", call_me)
+    ee.emit("order/eu", 1)
+    call_me.assert_called_once_with(1)
+
+    ee.remove_listener("order/*", call_me)
+    assert ee.emit("order/eu", 2) is False
+    call_me.assert_called_once_with(1)
+
+
 def test_new_listener_event():
     """The 'new_listener' event fires whenever a new listener is added."""
 
@@ -91,6 +240,83 @@ def test_new_listener_event():
     call_me.assert_called_once_with("event", event_handler)
 
 
+def test_remove_listener_event():
+    """The 'remove_listener' event fires whenever a listener is removed,
+    including `once` listeners as they fire
+    """
+
+    call_me = Mock()
+    ee = EventEmitter()
+
+    ee.on("remove_listener", call_me)
+
+    def event_handler():
+        pass
+
+    def once_handler():
+        pass
+
+    ee.on("event", event_handler)
+    ee.remove_listener("event", event_handler)
+
+    call_me.assert_called_once_with("event", event_handler)
+
+    ee.once("event", once_handler)
+    ee.on("other", event_handler)
+    ee.emit("event")
+    ee.remove_all_listeners("other")
+
+    assert call_me.call_args_list[1:] == [
+        call("event", once_handler),
+        call("other", event_handler),
+    ]
+
+    # Nothing is emitted when nothing is removed
+    call_me.reset_mock()
+    ee.remove_listener("unknown", event_handler)
+    ee.on("event", once_handler)
+    ee.remove_listener("event", event_handler)
+
+    call_me.assert_not_called()
+
+    # Listeners are passed as they were attached, and callers waiting on an
+    # event aren't listeners
+    listener = WeakListener([])
+    ee.on("event", listener.handle, weak=True)
+    ee._add_waiter("event", Mock(), Mock())
+    ee.remove_all_listeners("event")
+
+    assert call_me.call_args_list == [
+        call("event", once_handler),
+        call("event", listener.handle),
+    ]
+
+    # Removing every listener emits for each one, except the remove_listener
+    # listeners themselves
+    call_me.reset_mock()
+    ee.on("event", event_handler)
+    ee.once("other", once_handler)
+    ee.remove_all_listeners()
+
+    assert call_me.call_count == 2
+    call_me.assert_any_call("event", event_handler)
+    call_me.assert_any_call("other", once_handler)
+    assert ee.event_names() == set()
+
+
+def test_special_events_unheard():
+    """Special events aren't emitted when nothing could hear them"""
+
+    ee = EventEmitter()
+    emitted = []
+    ee.emit = lambda event, *args: emitted.append(event)
+
+    ee.on("event", Mock())
+    ee.remove_all_listeners("event")
+
+    assert emitted == []
+
+
 def test_listener_removal():
     """Removing listeners removes the correct listener from an event."""
 
@@ -192,6 +418,28 @@ def test_listener_removal_on_emit():
     call_me.assert_called_once()
 
 
+def test_listener_added_on_emit():
+    """Test that a listener added during an emit is not called inside the
+    current emit cycle, but is called on the next one.
+    """
+
+    call_me = Mock()
+    ee = EventEmitter()
+
+    @ee.on("add")
+    def should_add():
+        if not ee.listeners("add")[1:]:
+            ee.on("add", call_me)
+
+    ee.emit("add")
+
+    call_me.assert_not_called()
+
+    ee.emit("add")
+
+    call_me.assert_called_once()
+
+
 def test_once():
     """Test that `once()` method works propers."""
 
@@ -219,6 +467,37 @@ def test_once():
     assert "event" not in ee._events
 
 
+def test_once_threaded():
+    """`once()` handlers fire exactly once when emitted from many threads
+    while other listeners are being added and removed.
+    """
+
+    call_me = Mock()
+    ee = EventEmitter()
+
+    ee.once("event", call_me)
+
+    def noop():
+        pass
+
+    def churn():
+        for _ in range(100):
+            ee.on("event", noop)
+            ee.remove_listener("event", noop)
+
+    def emit():
+        for _ in range(100):
+            ee.emit("event")
+
+    threads = [Thread(target=churn)] + [Thread(target=emit) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    call_me.assert_called_once()
+
+
 def test_once_removal():
     """Removal of once functions works"""
 
@@ -238,6 +517,34 @@ def test_once_removal():
     assert ee.event_names() == set()
 
 
+def test_once_reattached():
+    """A `once` handler which is attached again with `on` while an emit is
+    running isn't removed by that emit
+    """
+
+    ee = EventEmitter()
+    calls = []
+
+    def once_handler():
+        calls.append("once_handler")
+
+    @ee.on("event")
+    def reattach():
+        ee.remove_listener("event", once_handler)
+        ee.on("event", once_handler)
+
+    ee.once("event", once_handler)
+    ee.emit("event")
+
+    assert calls == []
+    assert ee.listeners("event") == [reattach, once_handler]
+
+    ee.emit("event")
+
+    assert calls == ["once_handler"]
+    assert ee.listeners("event") == [reattach, once_handler]
+
+
 def test_listeners():
     """`listeners()` returns a copied list of listeners."""
 
@@ -265,6 +572,185 @@ def test_listeners():
     call_me.assert_not_called()
 
 
+@mark.parametrize("compiled", [False, True])
+def test_priority(compiled):
+    """Test that handlers are called in order of priority, and then in the
+    order they were added.
+    """
+
+    ee = EventEmitter(compiled=compiled)
+    calls = []
+
+    ee.on("event", lambda: calls.append("default"))
+
+    @ee.on("event", priority=10)
+    def auth():
+        calls.append("auth")
+
+    ee.add_listener("event", lambda: calls.append("last"), priority=-1)
+    ee.once("event", lambda: calls.append("once"), priority=10)
+
+    @ee.listens_to("event", priority=5)
+    def metrics():
+        calls.append("metrics")
+
+    ee.emit("event")
+    assert calls == ["auth", "once", "metrics", "default", "last"]
+
+    # Handlers can be moved by adding them with a different priority
+    ee.on("event", metrics, priority=20)
+    ee.remove_listener("event", auth)
+    calls.clear()
+
+    ee.emit("event")
+    assert calls == ["metrics", "default", "last"]
+    assert ee.listeners("event")[0] == metrics
+
+
+def test_prepend_listener():
+    """Test that prepended handlers are called ahead of the handlers with
+    the same priority.
+    """
+
+    ee = EventEmitter()
+    calls = []
+
+    ee.on("event", lambda: calls.append("first"))
+    ee.prepend_listener("event", lambda: calls.append("prepended"))
+
+    ee.emit("event")
+    assert calls == ["prepended", "first"]
+
+    ee.on("event", lambda: calls.append("urgent"), priority=1)
+    ee.prepend_listener("event", lambda: calls.append("prepended again"))
+    calls.clear()
+
+    ee.emit("event")
+    assert calls == ["urgent", "prepended again", "prepended", "first"]
+
+
+class WeakListener:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def handle(self, data):
+        self.calls.append(data)
+
+
+def test_weak_listener():
+    """Test that weakly held handlers are removed once they're collected."""
+
+    ee = EventEmitter()
+    calls = []
+    listener = WeakListener(calls)
+
+    ee.on("event", listener.handle, weak=True)
+
+    assert ee.listeners("event") == [listener.handle]
+    assert ee.emit("event", 1)
+
+    del listener
+    collect()
+
+    assert ee.listeners("event") == []
+    assert "event" not in ee.event_names()
+    assert not ee.emit("event", 2)
+    assert calls == [1]
+
+    # Weak handlers are removed like any other
+    listener = WeakListener(calls)
+    ee.add_listener("event", listener.handle, weak=True)
+    ee.remove_listener("event", listener.handle)
+
+    assert ee.listeners("event") == []
+
+
+def test_weak_listener_collected_under_lock():
+    """Test that a weakly held handler which is collected while the lock is
+    held is removed on the next emit, or when its event's listeners are
+    counted.
+    """
+
+    ee = EventEmitter()
+    calls = []
+    listener = WeakListener(calls)
+
+    ee.on("event", listener.handle, weak=True)
+
+    with ee._lock:
+        del listener
+        collect()
+
+    assert ee.listeners("event") == []
+    assert "event" in ee.event_names()
+
+    ee.emit("event", 1)
+
+    assert "event" not in ee.event_names()
+    assert calls == []
+
+    listener = WeakListener(calls)
+    ee.on("event", listener.handle, weak=True)
+
+    with ee._lock:
+        del listener
+        collect()
+
+    assert ee.listener_count("event") == 0
+    assert "event" not in ee.event_names()
+
+
+def test_listener_count():
+    """Test that listener_count counts the listeners on an event."""
+
+    ee = EventEmitter()
+
+    assert ee.listener_count("event") == 0
+
+    ee.on("event", lambda: None)
+    ee.once("event", lambda: None)
+
+    assert ee.listener_count("event") == 2
+
+    ee.remove_all_listeners("event")
+
+    assert ee.listener_count("event") == 0
+
+
+@mark.parametrize("diagnostic", [False, True])
+def test_max_listeners(diagnostic):
+    """Test that adding more listeners to an event than the limit warns once,
+    with where the listener was added in diagnostic mode.
+    """
+
+    ee = EventEmitter(diagnostic=diagnostic)
+
+    assert ee.get_max_listeners() == 0
+
+    ee.set_max_listeners(2)
+    assert ee.get_max_listeners() == 2
+
+    with warns(MaxListenersExceededWarning) as record:
+        for _ in range(4):
+            ee.on("event", lambda: None)
+
+    assert len(record) == 1
+    assert record[0].filename == __file__
+
+    warning = record[0].message
+    assert warning.event == "event"
+    assert warning.count == 3
+    if diagnostic:
+        assert warning.stack[-1].filename == __file__
+    else:
+        assert warning.stack is None
+
+    # The limit is per event
+    with catch_warnings():
+        simplefilter("error")
+        ee.on("other", lambda: None)
+
+
 def test_listeners_does_work_with_unknown_listeners():
     """`listeners()` should not throw."""
     ee = EventEmitter()
@@ -311,3 +797,46 @@ def test_if_serializable():
     ee_copy = loads(dumps(ee))
     assert ee._lock
     assert ee_copy._lock
+
+    # Compiled dispatch functions are dropped, but compiled dispatch isn't
+    ee = EventEmitter(compiled=True)
+    ee.on("event", ee_copy.listeners)
+    ee.emit("event", "event")
+    ee_copy = loads(dumps(ee))
+    assert ee_copy._dispatchers == dict()
+
+
+def test_serializable_weak():
+    """Weakly held handlers are left out of pickled copies."""
+
+    class Listener:
+        def on_event(self, data):
+            pass
+
+    listener = Listener()
+
+    for ee in (EventEmitter(), EventEmitter(wildcard=True)):
+        ee.on("event", print, priority=1)
+        ee.on("event", listener.on_event, weak=True)
+        ee.on("weak.*", listener.on_event, weak=True)
+
+        ee_copy = loads(dumps(ee))
+
+        assert ee.listeners("event") == [print, listener.on_event]
+        assert ee_copy.listeners("event") == [print]
+        assert ee_copy.event_names() == {"event"}
+        assert ee_copy.emit("weak.event", "data") is False
+
+        # Priorities are kept
+        ee_copy.on("event", len, priority=2)
+        ee_copy.on("event", repr)
+        assert ee_copy.listeners("event") == [len, print, repr]
+
+
+def test_paced_handler_needs_loop():
+    """Paced handlers need an emitter with an event loop to set timers on"""
+
+    ee = EventEmitter()
+
+    with raises(PyeeError):
+        ee.on("event", Mock(), debounce=1)
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
+from functools import partial
 from typing import NoReturn
 
 import pytest
 import pytest_trio.plugin  # type: ignore # noqa
 import trio
+import trio.testing
 
+from pyee.base import PyeeError, QueueFullError
 from pyee.trio import TrioEventEmitter
 
 
@@ -111,3 +114,160 @@ async def test_sync_error() -> None:
                 result = await rcv.__anext__()
 
         assert isinstance(result, PyeeTestError)
+
+
+@pytest.mark.trio
+async def test_sync_emit() -> None:
+    """Test that regular functions are called by emit"""
+
+    async with TrioEventEmitter() as ee:
+        calls = []
+
+        @ee.on("event")
+        def sync_handler(data) -> None:
+            calls.append(data)
+
+        ee.emit("event", 1)
+
+        assert calls == [1]
+
+
+@pytest.mark.trio
+async def test_trio_events() -> None:
+    """Test that trio event emitters stream events in order, in batches, and
+    stop listening once the stream is closed
+    """
+
+    async with TrioEventEmitter() as ee:
+        async with ee.events("event") as stream:
+            for i in range(5):
+                ee.emit("event", i)
+            ee.emit("event", "a", "b")
+
+            assert await stream.get() == 0
+            assert await stream.get_batch(3) == [1, 2, 3]
+            assert await stream.get_batch(3) == [4, ("a", "b")]
+
+            async def emit_later():
+                await trio.sleep(0.01)
+                ee.emit("event", 5)
+                stream.close()
+
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(emit_later)
+
+                assert [item async for item in stream] == [5]
+
+        assert ee.listener_count("event") == 0
+
+
+@pytest.mark.trio
+@pytest.mark.parametrize(
+    "overflow,expected",
+    [("drop_oldest", [2, 3]), ("drop_newest", [0, 1]), ("raise", [0, 1])],
+)
+async def test_trio_events_overflow(overflow, expected) -> None:
+    """Test that trio event emitter streams handle events past maxsize"""
+
+    async with TrioEventEmitter() as ee:
+        stream = ee.events("event", maxsize=2, overflow=overflow)
+
+        for i in range(4):
+            ee.emit("event", i)
+
+        assert await stream.get_batch(10) == expected
+
+        if overflow == "raise":
+            assert ee.listener_count("event") == 0
+            with pytest.raises(QueueFullError):
+                await stream.get()
+        stream.close()
+
+
+@pytest.mark.trio
+async def test_trio_events_removed() -> None:
+    """Test that trio event streams fail once their listeners are removed,
+    rather than leaving readers waiting forever
+    """
+
+    async with TrioEventEmitter() as ee:
+        stream = ee.events("event")
+        ee.emit("event", 1)
+
+        async def remove_later():
+            await trio.testing.wait_all_tasks_blocked()
+            ee.remove_all_listeners("event")
+
+        with trio.fail_after(1):
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(remove_later)
+
+                assert await stream.get() == 1
+                with pytest.raises(PyeeError):
+                    await stream.get()
+
+        ee.on("event", lambda _: None)
+        stream.close()
+
+        assert ee.listener_count("event") == 1
+
+
+@pytest.mark.trio
+async def test_trio_wait_for() -> None:
+    """Test that the trio event emitter can wait for the next matching emit
+    of an event
+    """
+
+    async with TrioEventEmitter() as ee:
+        results = []
+
+        async def wait(**kwargs):
+            results.append(await ee.wait_for("event", **kwargs))
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(wait)
+            nursery.start_soon(partial(wait, predicate=lambda n: n > 1))
+            await trio.testing.wait_all_tasks_blocked()
+
+            assert len(ee._events["event"]) == 1
+            assert ee.listeners("event") == []
+            assert ee.listener_count("event") == 0
+
+            ee.emit("event", 1)
+            ee.emit("event", 2)
+
+        assert sorted(results) == [1, 2]
+        assert ee.event_names() == set()
+
+        with pytest.raises(trio.TooSlowError):
+            await ee.wait_for("event", timeout=0.01)
+
+        assert ee.event_names() == set()
+
+
+@pytest.mark.trio
+async def test_trio_paced_handlers(autojump_clock) -> None:
+    """Test that trio event emitter handlers can be debounced and
+    coalesced
+    """
+
+    async with TrioEventEmitter() as ee:
+        calls = []
+
+        @ee.on("event", debounce=1)
+        async def debounced(n):
+            calls.append(("debounced", n))
+
+        @ee.on("event", coalesce=1)
+        def coalesced(ns):
+            calls.append(("coalesced", ns))
+
+        for n in range(3):
+            ee.emit("event", n)
+            await trio.sleep(0.4)
+
+        assert calls == [("coalesced", [0, 1, 2])]
+
+        await trio.sleep(1)
+
+        assert calls == [("coalesced", [0, 1, 2]), ("debounced", 2)]
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from typing import Any, Generator
+from typing import Any, cast, Generator, List
 from unittest.mock import Mock
 
-from twisted.internet.defer import Deferred, inlineCallbacks, succeed
+from twisted.internet.defer import Deferred, inlineCallbacks, succeed, TimeoutError
+from twisted.internet.interfaces import IReactorTime
+from twisted.internet.task import Clock
 from twisted.python.failure import Failure
 
+from pyee import PyeeError
 from pyee.twisted import TwistedEventEmitter
 
 
@@ -139,3 +142,91 @@ def test_propagates_exception():
     ee.emit("event")
 
     should_call.assert_called_once()
+
+
+def test_wait_for() -> None:
+    """Test that TwistedEventEmitter can wait for the next matching emit of
+    an event with a Deferred
+    """
+    ee = TwistedEventEmitter()
+    clock = Clock()
+
+    d = ee.wait_for("event", predicate=lambda n: n > 1)
+    results: List[Any] = []
+    d.addCallback(results.append)
+
+    ee.emit("event", 1)
+    ee.emit("event", 2)
+
+    assert results == [2]
+    assert ee.event_names() == set()
+
+    timed_out = ee.wait_for("event", timeout=1, reactor=cast(IReactorTime, clock))
+    failures: List[Failure] = []
+    timed_out.addErrback(failures.append)
+    clock.advance(2)
+
+    assert failures[0].check(TimeoutError)
+    assert ee.event_names() == set()
+
+    canceled = ee.wait_for("event")
+    canceled.addErrback(lambda failure: None)
+    canceled.cancel()
+
+    assert ee.event_names() == set()
+
+    orphaned = ee.wait_for("event")
+    orphaned.addErrback(failures.append)
+    ee.remove_all_listeners("event")
+
+    assert failures[1].check(PyeeError)
+
+
+def test_paced_handlers() -> None:
+    """Test that TwistedEventEmitter handlers can be debounced and
+    throttled, with timers on the emitter's reactor
+    """
+    clock = Clock()
+    ee = TwistedEventEmitter(reactor=cast(IReactorTime, clock))
+    calls = []
+
+    @ee.on("event", debounce=1)
+    def debounced(n):
+        calls.append(("debounced", n))
+
+    @ee.on("event", throttle=1)
+    def throttled(n):
+        calls.append(("throttled", n))
+
+    for n in range(3):
+        ee.emit("event", n)
+        clock.advance(0.5)
+
+    assert calls == [("throttled", 0), ("throttled", 1)]
+
+    clock.advance(2)
+
+    assert sorted(calls[2:]) == [("debounced", 2), ("throttled", 2)]
+
+
+def test_coalesce_max_batch() -> None:
+    """Test that after a full batch is passed on, the next batch waits from
+    its own first emit
+    """
+    clock = Clock()
+    ee = TwistedEventEmitter(reactor=cast(IReactorTime, clock))
+    batches = []
+
+    @ee.on("event", coalesce=1, max_batch=3)
+    def coalesced(ns):
+        batches.append(ns)
+
+    for n in range(8):
+        ee.emit("event", n)
+        clock.advance(0.3)
+
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+
+    clock.advance(1)
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6, 7]]